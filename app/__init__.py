@@ -37,6 +37,66 @@ def register_ml_blueprint():
 # Register ML blueprint after all other initialization
 register_ml_blueprint()
 
+# Hot-swap new model versions from the model directory when enabled
+def start_model_watch():
+    """Start the model registry's directory watch if MODEL_WATCH_INTERVAL is set"""
+    from app.config import Config
+    if Config.MODEL_WATCH_INTERVAL <= 0:
+        return
+    try:
+        from app.model_registry import model_registry
+        model_registry.watch(Config.MODEL_DIR, interval=Config.MODEL_WATCH_INTERVAL)
+        print(f"✅ Watching {Config.MODEL_DIR} for new model versions")
+    except Exception as e:
+        print(f"❌ Failed to start model watch: {e}")
+
+start_model_watch()
+
+# Keep models fresh between full retrains when enabled
+def start_online_learning():
+    """Start scheduled online model updates if ML_ONLINE_LEARNING is set"""
+    from app.config import Config
+    if not Config.ML_ONLINE_LEARNING:
+        return
+    try:
+        from app.online_learning import online_learner
+        online_learner.start(interval=Config.ML_ONLINE_UPDATE_INTERVAL,
+                             trigger_rows=Config.ML_ONLINE_TRIGGER_ROWS or None)
+        print("✅ Online learning enabled")
+    except Exception as e:
+        print(f"❌ Failed to start online learning: {e}")
+
+start_online_learning()
+
+# Answer repeated near-identical telemetry from the prediction cache when enabled
+def enable_prediction_cache():
+    """Put the prediction cache in front of the shared engine if ML_PREDICTION_CACHE is set"""
+    from app.config import Config
+    if not Config.ML_PREDICTION_CACHE:
+        return
+    from app.ml_engine import ml_engine
+    ml_engine.enable_prediction_cache(max_entries=Config.ML_PREDICTION_CACHE_SIZE,
+                                      ttl_seconds=Config.ML_PREDICTION_CACHE_TTL or None,
+                                      significant_digits=Config.ML_PREDICTION_CACHE_DIGITS or None)
+    print("✅ Prediction cache enabled")
+
+enable_prediction_cache()
+
+# Take Supabase/Elasticsearch writes off the telemetry request path when enabled
+def start_persistence_queue():
+    """Start the write-behind persistence workers if PERSISTENCE_WRITE_BEHIND is set"""
+    from app.config import Config
+    if not Config.PERSISTENCE_WRITE_BEHIND:
+        return
+    try:
+        from app.persistence_queue import persistence_queue
+        persistence_queue.start()
+        print("✅ Write-behind persistence enabled")
+    except Exception as e:
+        print(f"❌ Failed to start write-behind persistence: {e}")
+
+start_persistence_queue()
+
 # Initialize database (if using one)
 # Example: db.init_app(app)
 
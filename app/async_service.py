@@ -0,0 +1,325 @@
+"""
+Asyncio Ingestion Service
+aiohttp server exposing the /telemetry, /trust_score and /api/ml/predict contracts
+of the Flask app on one event loop, for many concurrent VM agent connections
+"""
+
+import json
+import time
+import asyncio
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import httpx
+from aiohttp import web
+
+from app.config import Config
+from app.auth import detect_user_type
+from app.telemetry_ingest import build_telemetry_rows, persistence_items
+
+logger = logging.getLogger(__name__)
+
+# aiohttp application keys
+SERVICE_KEY = web.AppKey('service', object)
+
+
+class AsyncIngestionService:
+    """
+    Ingestion endpoints served from one asyncio event loop
+
+    Waiting on Okta, Supabase and Elasticsearch costs no thread: all three are
+    reached through async HTTP clients sharing a bounded connection pool. The
+    scoring code shared with the Flask app (STRIDE mapping, heuristic trust
+    score, ML engine) is CPU-bound and runs on a small thread pool so the loop
+    keeps accepting connections while a request is being scored.
+
+    Agents authenticate with their Okta access token (Authorization: Bearer)
+    instead of a Flask session; userinfo lookups are cached for auth_cache_ttl
+    seconds.
+    """
+
+    def __init__(self, engine=None, scoring_workers: int = 4, max_connections: int = 100,
+                 auth_cache_ttl: float = 300.0, http_client: Optional[httpx.AsyncClient] = None,
+                 supabase_client=None, es_client=None):
+        if engine is None:
+            from app.ml_engine import ml_engine as engine
+        self.engine = engine
+        self.scoring_workers = scoring_workers
+        self.max_connections = max_connections
+        self.auth_cache_ttl = auth_cache_ttl
+
+        self.http = http_client
+        self.supabase = supabase_client
+        self.es = es_client
+        self._owns_http = http_client is None
+        self._owns_es = es_client is None
+        self.executor = None
+
+        self._auth_cache = {}
+        self.stats = {
+            'requests': 0,
+            'in_flight': 0,
+            'max_in_flight': 0,
+            'auth_lookups': 0,
+            'auth_cache_hits': 0,
+            'es_failures': 0
+        }
+
+    async def startup(self, app: web.Application = None):
+        """Create the scoring pool and the async Okta, Supabase and Elasticsearch clients"""
+        self.executor = ThreadPoolExecutor(max_workers=self.scoring_workers, thread_name_prefix='async-scoring')
+        if self.http is None:
+            self.http = httpx.AsyncClient(
+                http2=Config.SUPABASE_HTTP2,
+                timeout=httpx.Timeout(Config.SUPABASE_TIMEOUT),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        if self.supabase is None:
+            from supabase import AsyncClientOptions, acreate_client
+            self.supabase = await acreate_client(
+                Config.SUPABASE_URL, Config.SUPABASE_API_KEY,
+                options=AsyncClientOptions(httpx_client=self.http)
+            )
+        if self.es is None:
+            from elasticsearch import AsyncElasticsearch
+            self.es = AsyncElasticsearch(
+                Config.ELASTICSEARCH_URL,
+                basic_auth=(Config.ELASTICSEARCH_USERNAME, Config.ELASTICSEARCH_PASSWORD),
+                verify_certs=Config.ELASTICSEARCH_SSL_VERIFY,
+                request_timeout=30,
+                connections_per_node=self.max_connections
+            )
+        logger.info(f"⚡ Async ingestion service ready: {self.scoring_workers} scoring workers, "
+                    f"{self.max_connections} outbound connections")
+
+    async def cleanup(self, app: web.Application = None):
+        """Close the clients this service created and the scoring pool"""
+        if self._owns_es and self.es is not None:
+            await self.es.close()
+        if self._owns_http and self.http is not None:
+            await self.http.aclose()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    async def _score(self, fn, *args):
+        """Run CPU-bound scoring on the scoring pool"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def authenticate(self, request: web.Request) -> Optional[Dict[str, Any]]:
+        """Okta userinfo for the request's Bearer token (with user_type), or None"""
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer '):
+            return None
+        token = header[len('Bearer '):].strip()
+
+        now = time.monotonic()
+        cached = self._auth_cache.get(token)
+        if cached and cached[0] > now:
+            self.stats['auth_cache_hits'] += 1
+            return cached[1]
+
+        self.stats['auth_lookups'] += 1
+        try:
+            response = await self.http.get(f"{Config.OKTA_ISSUER}/v1/userinfo",
+                                           headers={'Authorization': f'Bearer {token}'})
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Okta userinfo lookup failed: {str(e)}")
+            return None
+        if response.status_code != 200:
+            return None
+
+        user_info = response.json()
+        user_info['user_type'] = detect_user_type(user_info.get('email'), user_info.get('groups', []))
+        if len(self._auth_cache) >= 10000:
+            self._auth_cache = {t: entry for t, entry in self._auth_cache.items() if entry[0] > now}
+        self._auth_cache[token] = (now + self.auth_cache_ttl, user_info)
+        return user_info
+
+    async def _require_user(self, request: web.Request, vm_agent: bool = False):
+        """The authenticated user, or the same 401/403 response as the Flask decorators"""
+        user = await self.authenticate(request)
+        if user is None:
+            return None, web.json_response({'error': 'Authentication required'}, status=401)
+        if vm_agent and user['user_type'] != 'vm_agent':
+            return None, web.json_response({'error': 'VM agent access required'}, status=403)
+        return user, None
+
+    async def _es_index(self, index_prefix: str, document: Dict):
+        """Index one document into today's index; failures are logged, not raised"""
+        if self.es is None:
+            return
+        document = dict(document)
+        document['@timestamp'] = document.get('timestamp', datetime.utcnow().isoformat())
+        index_name = f"{index_prefix}-{datetime.utcnow().strftime('%Y-%m-%d')}"
+        try:
+            await self.es.index(index=index_name, document=document)
+        except Exception as e:
+            self.stats['es_failures'] += 1
+            logger.error(f"[Elasticsearch] {index_prefix} indexing failed: {str(e)}")
+
+    async def _persist(self, telemetry_row: Dict, trust_row: Dict):
+        """Write both rows to Supabase and Elasticsearch concurrently"""
+        await asyncio.gather(
+            self.supabase.table('TelemetryData').insert(telemetry_row).execute(),
+            self.supabase.table('TrustScore').insert(trust_row).execute(),
+            self._es_index('telemetrydata', telemetry_row),
+            self._es_index('trustscore', trust_row)
+        )
+
+    @web.middleware
+    async def track_requests(self, request: web.Request, handler):
+        self.stats['requests'] += 1
+        self.stats['in_flight'] += 1
+        self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+        try:
+            return await handler(request)
+        finally:
+            self.stats['in_flight'] -= 1
+
+    async def ingest_telemetry(self, request: web.Request) -> web.Response:
+        """Ingest telemetry data from VM agents (same contract as Flask POST /telemetry)"""
+        user, error = await self._require_user(request, vm_agent=True)
+        if error:
+            return error
+        try:
+            telemetry_data = await request.json()
+        except ValueError:
+            return web.json_response({'status': 'error', 'message': 'Body must be a JSON object'}, status=400)
+        if not isinstance(telemetry_data, dict):
+            return web.json_response({'status': 'error', 'message': 'Body must be a JSON object'}, status=400)
+
+        telemetry_data['vm_agent_id'] = user.get('email')
+        telemetry_data['ingestion_timestamp'] = datetime.utcnow().isoformat()
+
+        rows = await self._score(build_telemetry_rows, telemetry_data)
+        data, trust_data, stride_mapping = rows['telemetry'], rows['trust'], rows['stride']
+
+        if Config.PERSISTENCE_WRITE_BEHIND:
+            from app.persistence_queue import persistence_queue, QueueFullError
+            try:
+                # submit_many may wait up to the enqueue timeout for room
+                await self._score(persistence_queue.submit_many, persistence_items([data], [trust_data]))
+            except QueueFullError as e:
+                return web.json_response({'status': 'error', 'message': str(e)},
+                                         status=503, headers={'Retry-After': '1'})
+        else:
+            try:
+                await self._persist(data, trust_data)
+            except Exception as e:
+                logger.error(f"❌ Telemetry persistence failed: {str(e)}")
+                return web.json_response({'status': 'error', 'message': str(e)}, status=500)
+
+        # Labelled telemetry keeps the online models fresh between full retrains
+        if Config.ML_ONLINE_LEARNING and 'Label' in data['features']:
+            from app.online_learning import online_learner
+            online_learner.add_samples([data['features']])
+
+        return web.json_response({
+            'status': 'success',
+            'session_id': telemetry_data.get('session_id'),
+            'stride_category': stride_mapping['stride_category'],
+            'risk_level': stride_mapping['risk_level'],
+            'trust_score': trust_data['trust_score'],
+            'mfa_required': trust_data['mfa_required']
+        })
+
+    async def get_trust_score(self, request: web.Request) -> web.Response:
+        """Latest trust score for a session (same contract as Flask GET /trust_score)"""
+        _, error = await self._require_user(request)
+        if error:
+            return error
+        session_id = request.query.get('session_id')
+        result = await (self.supabase.table('TrustScore').select('*').eq('session_id', session_id)
+                        .order('timestamp', desc=True).limit(1).execute())
+        latest = result.data[0] if result.data else {}
+        return web.json_response({
+            'trust_score': latest.get('trust_score'),
+            'mfa_required': latest.get('mfa_required'),
+            'vm_id': latest.get('vm_id'),
+            'session_id': session_id
+        })
+
+    async def predict(self, request: web.Request) -> web.Response:
+        """ML trust score prediction (same contract as POST /api/ml/predict)"""
+        try:
+            try:
+                data = await request.json()
+            except ValueError:
+                data = None
+            if not data or 'features' not in data:
+                return web.json_response({"error": "Missing features in request"}, status=400)
+
+            features = data['features']
+            classifier_name = data.get('classifier', 'RandomForest')
+            if not self.engine.is_servable(classifier_name):
+                return web.json_response({
+                    "error": f"Classifier '{classifier_name}' not trained",
+                    "available_classifiers": list(self.engine.trained_models.keys())
+                }, status=400)
+
+            # With micro-batching, concurrent requests share one vectorized call
+            if Config.ML_MICRO_BATCHING:
+                from app.micro_batcher import micro_batcher
+                prediction_result = await asyncio.wrap_future(micro_batcher.submit(features, classifier_name))
+            else:
+                prediction_result = await self._score(self.engine.predict_trust_score, features, classifier_name)
+
+            prediction_result.update({
+                "timestamp": datetime.utcnow().isoformat(),
+                "classifier_used": classifier_name,
+                "request_id": data.get("request_id", "unknown")
+            })
+            return web.json_response({"status": "success", "prediction": prediction_result}, dumps=_dumps)
+
+        except Exception as e:
+            logger.error(f"Prediction failed: {str(e)}")
+            return web.json_response({"error": f"Prediction failed: {str(e)}"}, status=500)
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            'status': 'healthy',
+            'service': 'async-ingestion',
+            'timestamp': datetime.utcnow().isoformat(),
+            'stats': dict(self.stats)
+        })
+
+    def build_app(self) -> web.Application:
+        """aiohttp application with the ingestion routes and client lifecycle hooks"""
+        app = web.Application(middlewares=[self.track_requests])
+        app[SERVICE_KEY] = self
+        app.router.add_post('/telemetry', self.ingest_telemetry)
+        app.router.add_get('/trust_score', self.get_trust_score)
+        app.router.add_post('/api/ml/predict', self.predict)
+        app.router.add_get('/health', self.health)
+        app.on_startup.append(self.startup)
+        app.on_cleanup.append(self.cleanup)
+        return app
+
+
+def _dumps(obj) -> str:
+    """json.dumps that also handles NumPy scalars in prediction results"""
+    return json.dumps(obj, default=lambda value: value.item() if hasattr(value, 'item') else str(value))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Asyncio ingestion service for VM agent telemetry')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=Config.ASYNC_SERVICE_PORT)
+    parser.add_argument('--scoring-workers', type=int, default=Config.ASYNC_SCORING_WORKERS)
+    parser.add_argument('--max-connections', type=int, default=Config.ASYNC_MAX_CONNECTIONS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    service = AsyncIngestionService(scoring_workers=args.scoring_workers,
+                                    max_connections=args.max_connections,
+                                    auth_cache_ttl=Config.ASYNC_AUTH_CACHE_TTL)
+    print(f"⚡ Starting async ingestion service on http://{args.host}:{args.port}")
+    web.run_app(service.build_app(), host=args.host, port=args.port, backlog=4096)
+
+
+if __name__ == '__main__':
+    main()
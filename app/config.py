@@ -9,6 +9,15 @@ class Config:
     SUPABASE_URL = os.getenv('SUPABASE_URL', 'https://project-id.supabase.co')
     SUPABASE_API_KEY = os.getenv('SUPABASE_API_KEY', 'supabase-anon-key')
 
+    # Supabase connection pool: one keep-alive HTTP client per process with at most
+    # SUPABASE_POOL_MAX_CONNECTIONS connections, SUPABASE_POOL_MAX_KEEPALIVE of them
+    # kept idle for up to SUPABASE_POOL_KEEPALIVE_EXPIRY seconds
+    SUPABASE_POOL_MAX_CONNECTIONS = int(os.getenv('SUPABASE_POOL_MAX_CONNECTIONS', '20'))
+    SUPABASE_POOL_MAX_KEEPALIVE = int(os.getenv('SUPABASE_POOL_MAX_KEEPALIVE', '10'))
+    SUPABASE_POOL_KEEPALIVE_EXPIRY = float(os.getenv('SUPABASE_POOL_KEEPALIVE_EXPIRY', '30'))
+    SUPABASE_TIMEOUT = float(os.getenv('SUPABASE_TIMEOUT', '30'))
+    SUPABASE_HTTP2 = os.getenv('SUPABASE_HTTP2', 'true').lower() == 'true'
+
     # Okta Configuration
     # Replace 'your-domain' with your actual Okta domain (e.g., dev-123456, yourcompany)
     OKTA_ISSUER = os.getenv('OKTA_ISSUER', 'https://your-domain.okta.com/oauth2/default')
@@ -32,6 +41,64 @@ class Config:
     WAZUH_API_PASSWORD = os.getenv('WAZUH_API_PASSWORD', 'MyS3cr37P450r.*-')
     WAZUH_SSL_VERIFY = os.getenv('WAZUH_SSL_VERIFY', 'false').lower() == 'true'
 
+    # ML Training Configuration
+    # Cores shared by classifiers trained concurrently (0 = all cores)
+    ML_TRAINING_CORE_BUDGET = int(os.getenv('ML_TRAINING_CORE_BUDGET', '0'))
+    # Rows kept (reservoir sampled) when streaming training files without max_rows
+    ML_TRAINING_MAX_ROWS = int(os.getenv('ML_TRAINING_MAX_ROWS', '1000000'))
+
+    # Model directory served by the model registry; polled for new versions
+    # every MODEL_WATCH_INTERVAL seconds (0 disables the watch)
+    MODEL_DIR = os.getenv('MODEL_DIR', 'models')
+    MODEL_WATCH_INTERVAL = float(os.getenv('MODEL_WATCH_INTERVAL', '0'))
+
+    # Online learning: apply labelled telemetry to NaiveBayes, MLP and KNN every
+    # ML_ONLINE_UPDATE_INTERVAL seconds, or once ML_ONLINE_TRIGGER_ROWS rows are
+    # pending (0 = schedule only)
+    ML_ONLINE_LEARNING = os.getenv('ML_ONLINE_LEARNING', 'false').lower() == 'true'
+    ML_ONLINE_UPDATE_INTERVAL = float(os.getenv('ML_ONLINE_UPDATE_INTERVAL', '300'))
+    ML_ONLINE_TRIGGER_ROWS = int(os.getenv('ML_ONLINE_TRIGGER_ROWS', '1000'))
+
+    # Prediction cache for single-row predictions: LRU size, entry TTL in seconds
+    # and significant digits feature values are compared to
+    ML_PREDICTION_CACHE = os.getenv('ML_PREDICTION_CACHE', 'false').lower() == 'true'
+    ML_PREDICTION_CACHE_SIZE = int(os.getenv('ML_PREDICTION_CACHE_SIZE', '10000'))
+    ML_PREDICTION_CACHE_TTL = float(os.getenv('ML_PREDICTION_CACHE_TTL', '300'))
+    ML_PREDICTION_CACHE_DIGITS = int(os.getenv('ML_PREDICTION_CACHE_DIGITS', '3'))
+
+    # Micro-batching of concurrent /api/ml/predict requests: a batch closes after
+    # ML_BATCH_MAX_WAIT_MS milliseconds or ML_BATCH_MAX_SIZE rows
+    ML_MICRO_BATCHING = os.getenv('ML_MICRO_BATCHING', 'false').lower() == 'true'
+    ML_BATCH_MAX_WAIT_MS = float(os.getenv('ML_BATCH_MAX_WAIT_MS', '2'))
+    ML_BATCH_MAX_SIZE = int(os.getenv('ML_BATCH_MAX_SIZE', '64'))
+
+    # Largest record count accepted by /telemetry/batch in one request
+    TELEMETRY_BATCH_MAX_RECORDS = int(os.getenv('TELEMETRY_BATCH_MAX_RECORDS', '10000'))
+
+    # Write-behind persistence for telemetry ingestion: Supabase/Elasticsearch
+    # writes are queued (at most PERSISTENCE_QUEUE_SIZE documents, waiting up to
+    # PERSISTENCE_ENQUEUE_TIMEOUT_MS for room before answering 503), written in
+    # batches by PERSISTENCE_WORKERS threads and retried PERSISTENCE_MAX_RETRIES
+    # times before going to the dead-letter file
+    PERSISTENCE_WRITE_BEHIND = os.getenv('PERSISTENCE_WRITE_BEHIND', 'false').lower() == 'true'
+    PERSISTENCE_QUEUE_SIZE = int(os.getenv('PERSISTENCE_QUEUE_SIZE', '50000'))
+    PERSISTENCE_BATCH_SIZE = int(os.getenv('PERSISTENCE_BATCH_SIZE', '500'))
+    PERSISTENCE_WORKERS = int(os.getenv('PERSISTENCE_WORKERS', '2'))
+    PERSISTENCE_MAX_RETRIES = int(os.getenv('PERSISTENCE_MAX_RETRIES', '5'))
+    PERSISTENCE_ENQUEUE_TIMEOUT_MS = float(os.getenv('PERSISTENCE_ENQUEUE_TIMEOUT_MS', '50'))
+    PERSISTENCE_DEAD_LETTER_PATH = os.getenv('PERSISTENCE_DEAD_LETTER_PATH', 'data/persistence_dead_letter.jsonl')
+    # Elasticsearch is optional: while it is unconfigured or unreachable its documents
+    # are skipped, and it is tried again after PERSISTENCE_ES_RETRY_INTERVAL seconds
+    PERSISTENCE_ES_RETRY_INTERVAL = float(os.getenv('PERSISTENCE_ES_RETRY_INTERVAL', '30'))
+
+    # Asyncio ingestion service (python -m app.async_service): listen port,
+    # threads running CPU-bound scoring, outbound connections shared by the
+    # Okta/Supabase/Elasticsearch clients, and seconds an agent token stays cached
+    ASYNC_SERVICE_PORT = int(os.getenv('ASYNC_SERVICE_PORT', '5002'))
+    ASYNC_SCORING_WORKERS = int(os.getenv('ASYNC_SCORING_WORKERS', '4'))
+    ASYNC_MAX_CONNECTIONS = int(os.getenv('ASYNC_MAX_CONNECTIONS', '100'))
+    ASYNC_AUTH_CACHE_TTL = float(os.getenv('ASYNC_AUTH_CACHE_TTL', '300'))
+
     # Flask HTTPS Configuration
     FLASK_SSL_CERT = os.getenv('FLASK_SSL_CERT', 'docker/ssl/certs/trust-engine-cert.pem')
     FLASK_SSL_KEY = os.getenv('FLASK_SSL_KEY', 'docker/ssl/private/trust-engine-key.pem')
@@ -0,0 +1,240 @@
+"""
+Streaming Training Data Loader for CICIDS2017
+Reads CSV, JSON-lines and Parquet files in chunks with float32 feature dtypes,
+dropping non-feature fields at parse time so peak memory stays bounded
+"""
+
+import os
+import glob
+import logging
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Telemetry metadata and CICIDS2017 flow identifiers that are not model features
+NON_FEATURE_FIELDS = (
+    'session_id', 'vm_id', 'event_type', 'timestamp',
+    'Flow ID', 'Source IP', 'Source Port', 'Destination IP', 'Timestamp'
+)
+
+LABEL_COLUMN = 'Label'
+
+# Placeholder strings for unparseable values in the CICIDS2017 CSV exports
+MISSING_VALUES = ['Infinity', '-Infinity', 'inf', '-inf', 'NaN', 'nan', '']
+
+SUPPORTED_EXTENSIONS = ('.csv', '.jsonl', '.ndjson', '.parquet')
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Training rows kept (reservoir sampled) when no cap is given, so memory stays bounded
+DEFAULT_MAX_ROWS = 1_000_000
+
+
+def _keep_column(name: str, feature_columns: Optional[Sequence[str]]) -> bool:
+    name = name.strip()
+    if name == LABEL_COLUMN:
+        return True
+    if name in NON_FEATURE_FIELDS:
+        return False
+    return feature_columns is None or name in feature_columns
+
+
+def _finalize_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Normalize a parsed chunk: stripped names, float32 features, no infinities"""
+    chunk.columns = [str(column).strip() for column in chunk.columns]
+    for column in chunk.columns:
+        if column == LABEL_COLUMN:
+            chunk[column] = chunk[column].astype(str).str.strip()
+        elif chunk[column].dtype != np.float32:
+            chunk[column] = pd.to_numeric(chunk[column], errors='coerce').astype(np.float32)
+    # Flow rates divide by zero-length flows in the raw exports
+    features = chunk.columns != LABEL_COLUMN
+    values = chunk.loc[:, features]
+    chunk.loc[:, features] = values.where(np.isfinite(values), np.nan)
+    return chunk
+
+
+def _iter_csv(path: str, chunk_size: int, feature_columns: Optional[Sequence[str]]) -> Iterator[pd.DataFrame]:
+    # Read only the header first so feature dtypes can be declared up front
+    header = pd.read_csv(path, nrows=0).columns
+    columns = [column for column in header if _keep_column(column, feature_columns)]
+    dtypes = {column: (str if column.strip() == LABEL_COLUMN else np.float32) for column in columns}
+
+    reader = pd.read_csv(
+        path, usecols=columns, dtype=dtypes, na_values=MISSING_VALUES,
+        chunksize=chunk_size, low_memory=True
+    )
+    for chunk in reader:
+        yield chunk
+
+
+def _iter_jsonl(path: str, chunk_size: int, feature_columns: Optional[Sequence[str]]) -> Iterator[pd.DataFrame]:
+    for chunk in pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False):
+        yield chunk[[column for column in chunk.columns if _keep_column(str(column), feature_columns)]]
+
+
+def _iter_parquet(path: str, chunk_size: int, feature_columns: Optional[Sequence[str]]) -> Iterator[pd.DataFrame]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow is required to stream Parquet files (pip install pyarrow)")
+
+    parquet_file = pq.ParquetFile(path)
+    columns = [name for name in parquet_file.schema_arrow.names if _keep_column(name, feature_columns)]
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()
+
+
+_READERS = {
+    '.csv': _iter_csv,
+    '.jsonl': _iter_jsonl,
+    '.ndjson': _iter_jsonl,
+    '.parquet': _iter_parquet
+}
+
+
+def resolve_data_files(paths: Union[str, Iterable[str]]) -> List[str]:
+    """Expand files, directories and glob patterns into supported data files"""
+    if isinstance(paths, str):
+        paths = [paths]
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = sorted(glob.glob(os.path.join(path, '*')))
+        else:
+            candidates = sorted(glob.glob(path)) or [path]
+        files.extend(candidate for candidate in candidates
+                     if os.path.splitext(candidate)[1].lower() in SUPPORTED_EXTENSIONS)
+    return files
+
+
+def iter_data_chunks(paths: Union[str, Iterable[str]], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     feature_columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream DataFrame chunks from CSV, JSON-lines and Parquet files
+
+    Args:
+        paths: Files, directories or glob patterns
+        chunk_size: Rows per chunk
+        feature_columns: Optional feature names to keep (default: every non-metadata column)
+
+    Yields:
+        DataFrames with float32 feature columns and a string Label column when present
+    """
+    files = resolve_data_files(paths)
+    if not files:
+        raise ValueError(f"No CSV, JSON-lines or Parquet files found in {paths}")
+
+    for path in files:
+        logger.info(f"📄 Streaming {os.path.basename(path)} in chunks of {chunk_size} rows")
+        reader = _READERS[os.path.splitext(path)[1].lower()]
+        for chunk in reader(path, chunk_size, feature_columns):
+            yield _finalize_chunk(chunk)
+
+
+class ReservoirSample:
+    """
+    Uniform fixed-size sample of rows from a stream (Algorithm R, vectorized per chunk)
+    Memory is at most max_rows x n_features regardless of how many rows are seen;
+    the buffers grow with the stream up to that size
+    """
+
+    def __init__(self, max_rows: int, n_features: int, dtype=np.float32, seed: int = 42):
+        self.max_rows = max_rows
+        self.X = np.empty((0, n_features), dtype=dtype)
+        self.y = np.empty(0, dtype=np.int64)
+        self.rows_seen = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _reserve(self, n_rows: int):
+        """Grow the buffers geometrically (capped at max_rows) to hold n_rows"""
+        capacity = len(self.X)
+        if n_rows <= capacity:
+            return
+        capacity = min(self.max_rows, max(n_rows, 2 * capacity))
+        filled = min(self.rows_seen, self.max_rows)
+        X = np.empty((capacity, self.X.shape[1]), dtype=self.X.dtype)
+        y = np.empty(capacity, dtype=self.y.dtype)
+        X[:filled] = self.X[:filled]
+        y[:filled] = self.y[:filled]
+        self.X, self.y = X, y
+
+    def add(self, X: np.ndarray, y: np.ndarray):
+        """Offer a chunk of rows to the sample"""
+        n_rows = X.shape[0]
+        self._reserve(min(self.rows_seen + n_rows, self.max_rows))
+        positions = np.arange(self.rows_seen, self.rows_seen + n_rows)
+
+        # Fill the reservoir first
+        filling = positions < self.max_rows
+        self.X[positions[filling]] = X[filling]
+        self.y[positions[filling]] = y[filling]
+
+        # Then row i replaces a random slot with probability max_rows / (i + 1)
+        replacing = ~filling
+        if replacing.any():
+            slots = self._rng.integers(0, positions[replacing] + 1)
+            keep = slots < self.max_rows
+            self.X[slots[keep]] = X[replacing][keep]
+            self.y[slots[keep]] = y[replacing][keep]
+
+        self.rows_seen += n_rows
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray]:
+        n_rows = min(self.rows_seen, self.max_rows)
+        return self.X[:n_rows], self.y[:n_rows]
+
+
+def load_training_matrix(paths: Union[str, Iterable[str]],
+                         prepare_features: Callable[[pd.DataFrame, List[str]], Tuple[np.ndarray, np.ndarray]],
+                         chunk_size: int = DEFAULT_CHUNK_SIZE, max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+                         feature_columns: Optional[Sequence[str]] = None,
+                         feature_names: Optional[Sequence[str]] = None,
+                         seed: int = 42) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    """
+    Stream training files through prepare_features into a float32 matrix
+
+    Args:
+        paths: Files, directories or glob patterns
+        prepare_features: (chunk, feature_names) -> (X, y) function that reads
+                          the given columns in order, e.g. TrustScoreMLEngine.prepare_features
+        chunk_size: Rows per chunk
+        max_rows: Keep a uniform reservoir sample of at most this many rows,
+                  bounding peak memory regardless of dataset size (None: DEFAULT_MAX_ROWS)
+        feature_columns: Optional feature names to keep
+        feature_names: Matrix column order (default: the first chunk's feature
+                       columns); later chunks are reindexed to it
+        seed: Reservoir sampling seed
+
+    Returns:
+        Tuple of (X, y, load statistics); the statistics include the feature names
+    """
+    max_rows = max_rows or DEFAULT_MAX_ROWS
+    reservoir = None
+    stats = {'chunks': 0, 'rows_read': 0, 'files': resolve_data_files(paths)}
+
+    for chunk in iter_data_chunks(paths, chunk_size, feature_columns):
+        if feature_names is None:
+            # Pin the columns so every chunk has the same width and order
+            feature_names = [column for column in chunk.columns if column != LABEL_COLUMN]
+        X_chunk, y_chunk = prepare_features(chunk, feature_names)
+        X_chunk = np.asarray(X_chunk, dtype=np.float32)
+        y_chunk = np.asarray(y_chunk, dtype=np.int64)
+        stats['chunks'] += 1
+        stats['rows_read'] += len(X_chunk)
+
+        if reservoir is None:
+            reservoir = ReservoirSample(max_rows, X_chunk.shape[1], seed=seed)
+        reservoir.add(X_chunk, y_chunk)
+
+    if stats['chunks'] == 0:
+        raise ValueError("No rows found in the training files")
+
+    X, y = reservoir.result()
+    stats['rows_kept'] = len(X)
+    stats['feature_names'] = list(feature_names)
+    logger.info(f"✅ Streamed {stats['rows_read']} rows in {stats['chunks']} chunks, kept {stats['rows_kept']}")
+    return X, y, stats
@@ -249,6 +249,39 @@ class ElasticsearchIntegration:
             logger.error(f"Bulk indexing failed: {str(e)}")
             return False
 
+    def bulk_index_documents(self, documents: List[Dict], index_prefix: str,
+                             chunk_size: int = 500) -> List[bool]:
+        """
+        Bulk index documents into today's index and report success per document
+        Returns one flag per document, in order (all False without a client)
+        """
+        if not self.es_client or not documents:
+            return [False] * len(documents)
+
+        date_str = datetime.utcnow().strftime("%Y-%m-%d")
+        index_name = f"{index_prefix}-{date_str}"
+
+        actions = []
+        for doc in documents:
+            source = dict(doc)
+            source['@timestamp'] = source.get('timestamp', datetime.utcnow().isoformat())
+            actions.append({"_index": index_name, "_source": source})
+
+        outcomes = []
+        try:
+            # streaming_bulk yields one (ok, item) per action, in order
+            for ok, item in helpers.streaming_bulk(self.es_client, actions, chunk_size=chunk_size,
+                                                   raise_on_error=False, raise_on_exception=False):
+                if not ok:
+                    logger.warning(f"Bulk indexing into {index_name} rejected a document: {item}")
+                outcomes.append(ok)
+        except Exception as e:
+            logger.error(f"Bulk indexing failed: {str(e)}")
+        outcomes.extend([False] * (len(documents) - len(outcomes)))
+
+        logger.info(f"Bulk indexed {sum(outcomes)}/{len(documents)} documents to {index_name}")
+        return outcomes
+
     def search_telemetry(self, query: Dict, size: int = 100) -> List[Dict]:
         """Search telemetry data"""
         try:
@@ -26,6 +26,8 @@ from itertools import cycle
 import warnings
 warnings.filterwarnings('ignore')
 
+from app.ml_engine import predict_with_probabilities
+
 logger = logging.getLogger(__name__)
 
 class TrustEngineEvaluator:
@@ -133,7 +135,7 @@ class TrustEngineEvaluator:
         logger.info("🔬 Starting comprehensive model evaluation...")
 
         # Prepare test data
-        X_test, y_test = ml_engine.prepare_features(test_data)
+        X_test, y_test = ml_engine.prepare_features(test_data, ml_engine.feature_names or None)
 
         evaluation_results = {}
 
@@ -141,19 +143,14 @@ class TrustEngineEvaluator:
             logger.info(f"Evaluating {model_name}...")
 
             # Prepare data based on model type
-            if model_name in ['MLP', 'KNN', 'AdaptiveKNN'] and 'standard' in ml_engine.scalers:
-                X_eval = ml_engine.scalers['standard'].transform(X_test)
-            else:
-                X_eval = X_test
+            scaler = ml_engine.get_scaler(model_name)
+            X_eval = scaler.transform(X_test) if scaler is not None else X_test
 
-            # Make predictions
+            # Make predictions and get probabilities in a single forward pass
             start_time = datetime.now()
-            y_pred = model.predict(X_eval)
+            y_pred, y_pred_proba = self._get_prediction_probabilities(model, X_eval)
             prediction_time = (datetime.now() - start_time).total_seconds()
 
-            # Get prediction probabilities
-            y_pred_proba = self._get_prediction_probabilities(model, X_eval)
-
             # Calculate comprehensive metrics
             metrics = self._calculate_comprehensive_metrics(
                 y_test, y_pred, y_pred_proba, prediction_time, len(X_test)
@@ -176,17 +173,20 @@ class TrustEngineEvaluator:
         }
 
     def _get_prediction_probabilities(self, model, X_test):
-        """Get prediction probabilities safely"""
+        """Get class predictions and prediction probabilities safely"""
+        if hasattr(model, 'predict_proba'):
+            try:
+                return predict_with_probabilities(model, X_test)
+            except Exception as e:
+                logger.warning(f"Could not get prediction probabilities: {e}")
+
+        y_pred = model.predict(X_test)
         try:
-            if hasattr(model, 'predict_proba'):
-                return model.predict_proba(X_test)
-            elif hasattr(model, 'decision_function'):
-                return model.decision_function(X_test)
-            else:
-                return None
+            if hasattr(model, 'decision_function'):
+                return y_pred, model.decision_function(X_test)
         except Exception as e:
             logger.warning(f"Could not get prediction probabilities: {e}")
-            return None
+        return y_pred, None
 
     def _calculate_comprehensive_metrics(self, y_true, y_pred, y_pred_proba,
                                        prediction_time, n_samples) -> Dict:
@@ -512,20 +512,18 @@ class TrustEngineEvaluator:
 
             # Prepare test data
             test_subset = test_data.head(session_count)
-            X_test, y_test = ml_engine.prepare_features(test_subset)
+            X_test, y_test = ml_engine.prepare_features(test_subset, ml_engine.feature_names or None)
 
             session_results = {}
 
             for model_name, model in ml_engine.trained_models.items():
                 # Prepare data for model
-                if model_name in ['MLP', 'KNN', 'AdaptiveKNN'] and 'standard' in ml_engine.scalers:
-                    X_eval = ml_engine.scalers['standard'].transform(X_test)
-                else:
-                    X_eval = X_test
+                scaler = ml_engine.get_scaler(model_name)
+                X_eval = scaler.transform(X_test) if scaler is not None else X_test
 
-                # Measure performance
+                # Measure performance on the serving path (single predict_proba pass)
                 start_time = datetime.now()
-                predictions = model.predict(X_eval)
+                predictions, _ = predict_with_probabilities(model, X_eval)
                 end_time = datetime.now()
 
                 total_time = (end_time - start_time).total_seconds()
@@ -0,0 +1,131 @@
+"""
+Feature Layout for Trust Score Inference
+Compiles the stored feature_names order into a reusable feature-vector assembler
+"""
+
+import threading
+import numpy as np
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+class FeatureLayout:
+    """
+    Precompiled mapping from CICIDS2017 feature names to matrix columns
+    Built once whenever the ML engine's feature_names change
+    """
+
+    def __init__(self, feature_names: Sequence[str], dtype=np.float64, default_value: float = 0.0):
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        self.dtype = np.dtype(dtype)
+        self.default_value = default_value
+        self.index = {name: i for i, name in enumerate(self.feature_names)}
+        self._defaults = np.full(self.n_features, default_value, dtype=self.dtype)
+        self._local = threading.local()
+
+    def _row_buffer(self) -> np.ndarray:
+        """Per-thread preallocated (1, n_features) buffer for single-row assembly"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = np.empty((1, self.n_features), dtype=self.dtype)
+            self._local.buffer = buffer
+        return buffer
+
+    def assemble(self, features: Any, out: np.ndarray = None) -> Tuple[np.ndarray, List[str]]:
+        """
+        Map a single payload onto a (1, n_features) row
+
+        Args:
+            features: Dict keyed by feature name, or a pre-ordered list/NumPy row
+            out: Optional (1, n_features) buffer; defaults to a per-thread buffer
+                 that is overwritten by the next call on the same thread
+
+        Returns:
+            Tuple of the assembled row and the payload keys unknown to the layout
+
+        Raises:
+            ValueError: If the payload is malformed, or a value is missing
+                        (None) or not finite
+        """
+        row = self._row_buffer() if out is None else out
+        unknown_keys = self._fill_row(row[0], features)
+        if not np.isfinite(row[0]).all():
+            raise ValueError(self._non_finite_error(row[0]))
+        return row, unknown_keys
+
+    def assemble_batch(self, samples: Any) -> Tuple[np.ndarray, Dict[int, str], Dict[int, List[str]]]:
+        """
+        Map many payloads onto an (n_samples, n_features) matrix
+
+        Returns:
+            Tuple of (matrix, row errors by index, unknown keys by index).
+            Rows listed in the errors dict (malformed, or with missing or
+            non-finite values) are left at default values.
+        """
+        if isinstance(samples, np.ndarray) and samples.ndim == 2:
+            self._check_width(samples.shape[1])
+            matrix = np.ascontiguousarray(samples, dtype=self.dtype)
+            row_errors = self._non_finite_rows(matrix)
+            if row_errors:
+                # Never overwrite the caller's array
+                if np.shares_memory(matrix, samples):
+                    matrix = matrix.copy()
+                matrix[list(row_errors)] = self._defaults
+            return matrix, row_errors, {}
+
+        matrix = np.empty((len(samples), self.n_features), dtype=self.dtype)
+        row_errors = {}
+        unknown_keys = {}
+
+        for i, features in enumerate(samples):
+            try:
+                unknown = self._fill_row(matrix[i], features)
+                if unknown:
+                    unknown_keys[i] = unknown
+            except (TypeError, ValueError) as e:
+                matrix[i] = self._defaults
+                row_errors[i] = str(e)
+
+        for i, error in self._non_finite_rows(matrix).items():
+            matrix[i] = self._defaults
+            row_errors[i] = error
+            unknown_keys.pop(i, None)
+
+        return matrix, row_errors, unknown_keys
+
+    def _fill_row(self, row: np.ndarray, features: Any) -> List[str]:
+        """Write one payload into a 1-D row view, returning unknown keys"""
+        if isinstance(features, dict):
+            row[:] = self._defaults
+            unknown_keys = []
+            for feature_name, value in features.items():
+                column = self.index.get(feature_name)
+                if column is None:
+                    unknown_keys.append(feature_name)
+                else:
+                    row[column] = value
+            return unknown_keys
+
+        if isinstance(features, (list, tuple, np.ndarray)):
+            values = np.asarray(features, dtype=self.dtype).reshape(-1)
+            self._check_width(values.shape[0])
+            row[:] = values
+            return []
+
+        raise ValueError("Sample must be an object of feature name/value pairs or an ordered list of values")
+
+    def _non_finite_rows(self, matrix: np.ndarray) -> Dict[int, str]:
+        """Errors for rows holding NaN/inf (None values are stored as NaN)"""
+        finite = np.isfinite(matrix).all(axis=1)
+        if finite.all():
+            return {}
+        return {int(i): self._non_finite_error(matrix[i]) for i in np.flatnonzero(~finite)}
+
+    def _non_finite_error(self, row: np.ndarray) -> str:
+        names = [self.feature_names[i] for i in np.flatnonzero(~np.isfinite(row))]
+        shown = ', '.join(names[:5]) + (f" and {len(names) - 5} more" if len(names) > 5 else '')
+        return f"Feature values must be finite numbers; missing or non-finite: {shown}"
+
+    def _check_width(self, width: int):
+        if width != self.n_features:
+            raise ValueError(f"Expected {self.n_features} feature values, got {width}")
@@ -0,0 +1,103 @@
+"""
+Telemetry Feature Schema
+CICIDS2017 flow features read by the STRIDE mapping and the heuristic trust
+score, and helpers that turn telemetry records into a NumPy feature matrix
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Real CICIDS2017 feature names, in the order the heuristics read them
+FEATURE_NAMES = (
+    'Flow Duration', 'Total Fwd Packets', 'Total Backward Packets',
+    'Total Length of Fwd Packets', 'Total Length of Bwd Packets',
+    'Fwd Packet Length Max', 'Fwd Packet Length Min', 'Fwd Packet Length Mean',
+    'Fwd Packet Length Std', 'Bwd Packet Length Max', 'Bwd Packet Length Min',
+    'Bwd Packet Length Mean', 'Bwd Packet Length Std', 'Flow Bytes/s',
+    'Flow Packets/s', 'Flow IAT Mean', 'Flow IAT Std', 'Flow IAT Max',
+    'Flow IAT Min', 'Fwd IAT Total', 'Fwd IAT Mean', 'Fwd IAT Std',
+    'Fwd IAT Max', 'Fwd IAT Min', 'Bwd IAT Total', 'Bwd IAT Mean',
+    'Bwd IAT Std', 'Bwd IAT Max', 'Bwd IAT Min', 'Fwd PSH Flags',
+    'Bwd PSH Flags', 'Fwd URG Flags', 'Bwd URG Flags', 'Fwd Header Length',
+    'Bwd Header Length', 'Fwd Packets/s', 'Bwd Packets/s', 'Min Packet Length',
+    'Max Packet Length', 'Packet Length Mean', 'Packet Length Std',
+    'Packet Length Variance', 'FIN Flag Count', 'SYN Flag Count',
+    'RST Flag Count', 'PSH Flag Count', 'ACK Flag Count', 'URG Flag Count',
+    'CWE Flag Count', 'ECE Flag Count', 'Down/Up Ratio', 'Average Packet Size',
+    'Avg Fwd Segment Size', 'Avg Bwd Segment Size', 'Fwd Header Length.1',
+    'Fwd Avg Bytes/Bulk', 'Fwd Avg Packets/Bulk', 'Fwd Avg Bulk Rate',
+    'Bwd Avg Bytes/Bulk', 'Bwd Avg Packets/Bulk', 'Bwd Avg Bulk Rate',
+    'Subflow Fwd Packets', 'Subflow Fwd Bytes', 'Subflow Bwd Packets',
+    'Subflow Bwd Bytes', 'Init_Win_bytes_forward', 'Init_Win_bytes_backward',
+    'act_data_pkt_fwd', 'min_seg_size_forward'
+)
+NUM_FEATURES = len(FEATURE_NAMES)
+
+# Missing features count as 0
+_DEFAULTS = (0,) * NUM_FEATURES
+_NUMERIC_KINDS = 'biuf'
+
+
+def feature_values(telemetry_data: Dict) -> List:
+    """One record's feature values in FEATURE_NAMES order, as given"""
+    return list(map(telemetry_data.get, FEATURE_NAMES, _DEFAULTS))
+
+
+def feature_vector(telemetry_data: Dict) -> np.ndarray:
+    """
+    One record's features as a float64 vector
+
+    Raises:
+        TypeError: If a feature value is not a number (None, strings, ...)
+    """
+    try:
+        values = np.array(feature_values(telemetry_data))
+    except ValueError:
+        values = None
+    if values is None or values.dtype.kind not in _NUMERIC_KINDS:
+        raise TypeError("Telemetry feature values must be numbers")
+    return values.astype(np.float64, copy=False)
+
+
+def feature_matrix(records: List[Dict]) -> Tuple[np.ndarray, Dict[int, str]]:
+    """
+    Features of many records as an (n_records, NUM_FEATURES) float64 matrix
+
+    Returns:
+        (matrix, row_errors): rows whose values are not all numbers are
+        zero-filled and listed in row_errors by index
+    """
+    rows = [feature_values(record) for record in records]
+    try:
+        matrix = np.array(rows).reshape(len(rows), NUM_FEATURES)
+        if matrix.dtype.kind in _NUMERIC_KINDS:
+            return matrix.astype(np.float64, copy=False), {}
+    except ValueError:
+        pass
+
+    # Rare: find the offending rows one by one
+    matrix = np.zeros((len(rows), NUM_FEATURES))
+    row_errors = {}
+    for i, record in enumerate(records):
+        try:
+            matrix[i] = feature_vector(record)
+        except TypeError as e:
+            row_errors[i] = str(e)
+    return matrix, row_errors
+
+
+def row_sums(matrix: np.ndarray) -> np.ndarray:
+    """
+    Per-row sums accumulated left to right, like the built-in sum()
+
+    np.sum adds pairwise, which can differ from sum() in the last bit; the
+    heuristics compare these sums against fixed thresholds, so they keep
+    the sequential order.
+    """
+    return np.cumsum(matrix, axis=1)[:, -1]
+
+
+def row_means(matrix: np.ndarray) -> np.ndarray:
+    """Per-row feature mean (see row_sums)"""
+    return row_sums(matrix) / matrix.shape[1]
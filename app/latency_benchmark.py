@@ -0,0 +1,193 @@
+"""
+Latency Benchmark Harness for the Trust Score ML Engine
+Times single-row and batched prediction calls with perf_counter_ns over warmup
+plus measured iterations, and reports percentiles, throughput and allocations
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import itertools
+import tracemalloc
+import numpy as np
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Benchmarked prediction paths; 'single_row_cached' only with the prediction cache enabled
+BENCHMARK_PATHS = ('single_row', 'single_row_cached', 'batch')
+
+# Latency percentiles reported for every benchmarked path
+LATENCY_PERCENTILES = (50, 95, 99)
+
+# Calls traced to measure allocations (kept separate from the timed calls,
+# since tracing slows every allocation down)
+ALLOCATION_CALLS = 10
+
+
+def summarize_latencies(samples_ns: Sequence[int], rows_per_call: int = 1) -> Dict[str, float]:
+    """Percentile, mean and max latency in ms and throughput in rows/second"""
+    samples = np.asarray(samples_ns, dtype=np.int64)
+    latencies_ms = samples / 1e6
+    total_seconds = samples.sum() / 1e9
+    summary = {f'p{p}_ms': float(np.percentile(latencies_ms, p)) for p in LATENCY_PERCENTILES}
+    summary.update({
+        'mean_ms': float(latencies_ms.mean()),
+        'min_ms': float(latencies_ms.min()),
+        'max_ms': float(latencies_ms.max()),
+        'iterations': len(samples),
+        'rows_per_call': rows_per_call,
+        'total_seconds': float(total_seconds),
+        'throughput_rows_per_second': len(samples) * rows_per_call / total_seconds if total_seconds else 0.0
+    })
+    return summary
+
+
+def time_calls(fn: Callable[[], Any], iterations: int, warmup: int = 0) -> np.ndarray:
+    """Run `warmup` untimed calls, then time `iterations` calls in nanoseconds"""
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+    for _ in range(warmup):
+        fn()
+    samples = np.empty(iterations, dtype=np.int64)
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        samples[i] = time.perf_counter_ns() - start
+    return samples
+
+
+def measure_allocations(fn: Callable[[], Any], calls: int = ALLOCATION_CALLS) -> Dict[str, float]:
+    """
+    Allocations of `calls` traced calls: peak transient bytes above the starting
+    point, and memory blocks and bytes still allocated afterwards, per call
+    """
+    owns_trace = not tracemalloc.is_tracing()
+    if owns_trace:
+        tracemalloc.start()
+    try:
+        ignore_tracemalloc = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        before = tracemalloc.take_snapshot().filter_traces(ignore_tracemalloc)
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        for _ in range(calls):
+            fn()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        after = tracemalloc.take_snapshot().filter_traces(ignore_tracemalloc)
+    finally:
+        if owns_trace:
+            tracemalloc.stop()
+
+    diff = after.compare_to(before, 'filename')
+    return {
+        'traced_calls': calls,
+        'peak_bytes': int(peak),
+        'retained_blocks_per_call': sum(stat.count_diff for stat in diff) / calls,
+        'retained_bytes_per_call': sum(stat.size_diff for stat in diff) / calls
+    }
+
+
+def benchmark_path(fn: Callable[[], Any], iterations: int, warmup: int, rows_per_call: int = 1,
+                   trace_allocations: bool = True) -> Dict[str, Any]:
+    """Latency summary of one prediction path, with its allocations if traced"""
+    result = summarize_latencies(time_calls(fn, iterations, warmup), rows_per_call)
+    if trace_allocations:
+        result['allocations'] = measure_allocations(fn)
+    return result
+
+
+def benchmark_engine(engine, rows: List[Dict], models: Optional[List[str]] = None,
+                     iterations: int = 100, warmup: int = 10, batch_size: int = 100,
+                     trace_allocations: bool = True) -> Dict[str, Dict]:
+    """
+    Benchmark the engine's serving paths for each model
+
+    Args:
+        engine: TrustScoreMLEngine with trained models
+        rows: Feature dicts cycled through by the timed calls
+        models: Model names (defaults to every servable model)
+        iterations: Timed calls per path
+        warmup: Untimed calls per path before timing
+        batch_size: Rows per predict_trust_scores_batch call
+
+    Returns:
+        Per-model 'single_row' and 'batch' latency summaries. 'single_row' bypasses
+        the prediction cache; when the engine has one enabled, 'single_row_cached'
+        times the cached path as served, with its cache hit rate
+    """
+    if not rows:
+        raise ValueError("No benchmark rows")
+    batch_size = max(1, min(batch_size, len(rows)))
+    batches = [rows[i:i + batch_size] for i in range(0, len(rows) - batch_size + 1, batch_size)]
+
+    results = {}
+    for name in models or list(engine.trained_models):
+        single_rows = itertools.cycle(rows)
+        row_batches = itertools.cycle(batches)
+        single_row = benchmark_path(lambda: engine.predict_trust_score(next(single_rows), name, use_cache=False),
+                                    iterations, warmup, 1, trace_allocations)
+        batch = benchmark_path(lambda: engine.predict_trust_scores_batch(next(row_batches), name),
+                               iterations, warmup, batch_size, trace_allocations)
+        results[name] = {
+            'single_row': single_row,
+            'batch': batch,
+            # Summary fields kept from the original single-call benchmark
+            'throughput_sessions_per_second': batch['throughput_rows_per_second'],
+            'average_authentication_latency_ms': single_row['mean_ms'],
+            'total_processing_time_seconds': single_row['total_seconds'] + batch['total_seconds'],
+            'sessions_processed': iterations * (1 + batch_size)
+        }
+
+        cache = engine.prediction_cache
+        if cache is not None:
+            before = cache.stats()
+            cached = benchmark_path(lambda: engine.predict_trust_score(next(single_rows), name),
+                                    iterations, warmup, 1, trace_allocations)
+            after = cache.stats()
+            hits = after['hits'] - before['hits']
+            lookups = hits + after['misses'] - before['misses']
+            cached['cache_hit_rate'] = hits / lookups if lookups else 0.0
+            results[name]['single_row_cached'] = cached
+    return results
+
+
+def environment_info() -> Dict[str, Any]:
+    """Interpreter, library and host details stored next to results"""
+    import sklearn
+    return {
+        'timestamp': datetime.utcnow().isoformat(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def write_results(path: str, results: Dict, config: Dict) -> Dict:
+    """Write benchmark results as JSON with their configuration and environment"""
+    document = {'environment': environment_info(), 'config': config, 'results': results}
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    return document
+
+
+def compare_results(baseline: Dict, current: Dict, metrics: Sequence[str] = ('p50_ms', 'p99_ms')) -> Dict:
+    """
+    Ratio current/baseline of latency metrics per model and path
+    Both arguments are documents written by write_results
+    """
+    comparison = {}
+    for name, paths in current['results'].items():
+        base_paths = baseline['results'].get(name)
+        if not base_paths:
+            continue
+        for path in BENCHMARK_PATHS:
+            if path not in paths or path not in base_paths:
+                continue
+            comparison.setdefault(name, {})[path] = {
+                metric: paths[path][metric] / base_paths[path][metric] if base_paths[path][metric] else None
+                for metric in metrics
+            }
+    return comparison
@@ -0,0 +1,86 @@
+"""
+Training Memory Profile for the Trust Score ML Engine
+Counts full feature-matrix copies and tracks peak traced memory per training stage
+"""
+
+import tracemalloc
+import numpy as np
+from typing import Any, Dict, Optional
+
+
+class MemoryProfile:
+    """
+    Memory accounting for one training run
+
+    record() notes every full-matrix array a stage produces and whether it is a
+    copy or a view of its source; copies are counted whether or not tracing is
+    on. With trace=True, peak memory allocated through tracemalloc (which NumPy
+    reports to) is measured per stage relative to the memory in use when the
+    run started. tracemalloc traces every thread in the process, serving
+    threads included, so tracing is opt-in. Memory used inside process-pool
+    workers is not traced.
+    """
+
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.copies = []
+        self.stages = {}
+        self.raw_bytes = None
+        self._owns_trace = False
+        self._baseline = 0
+        self._peak = 0
+
+    def start(self, raw: np.ndarray) -> 'MemoryProfile':
+        """Start profiling a run whose raw feature matrix is `raw`"""
+        self.raw_bytes = int(raw.nbytes)
+        if self.trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_trace = True
+            tracemalloc.reset_peak()
+            self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def record(self, stage: str, array: np.ndarray, source: Optional[Any] = None) -> np.ndarray:
+        """
+        Note an array produced by a stage; counted as a copy unless it shares
+        memory with `source`
+        """
+        if source is None or not np.shares_memory(array, source):
+            self.copies.append({
+                'stage': stage,
+                'shape': list(array.shape),
+                'dtype': str(array.dtype),
+                'nbytes': int(array.nbytes)
+            })
+        return array
+
+    def checkpoint(self, stage: str):
+        """Peak traced memory since the previous checkpoint, attributed to `stage`"""
+        if not self.trace:
+            return
+        peak = tracemalloc.get_traced_memory()[1] - self._baseline
+        self.stages[stage] = max(self.stages.get(stage, 0), int(peak))
+        self._peak = max(self._peak, peak)
+        tracemalloc.reset_peak()
+
+    def stop(self):
+        """Stop tracing if this profile started it"""
+        if self._owns_trace:
+            tracemalloc.stop()
+            self._owns_trace = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        copied_bytes = sum(copy['nbytes'] for copy in self.copies)
+        profile = {
+            'raw_bytes': self.raw_bytes,
+            'matrix_copies': len(self.copies),
+            'copied_bytes': copied_bytes,
+            'copies': self.copies,
+            'traced': self.trace
+        }
+        if self.trace and self.raw_bytes:
+            profile['peak_traced_bytes'] = int(self._peak)
+            profile['peak_to_raw_ratio'] = self._peak / self.raw_bytes
+            profile['stage_peak_bytes'] = self.stages
+        return profile
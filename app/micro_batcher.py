@@ -0,0 +1,193 @@
+"""
+Micro-Batching for Single-Row Trust Score Predictions
+Coalesces concurrent prediction requests for the same model into one
+vectorized predict_proba call
+"""
+
+import time
+import queue
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from app.config import Config
+from app.ml_engine import TrustScoreMLEngine, ml_engine
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the batch-size and queue-depth histogram buckets
+HISTOGRAM_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class Histogram:
+    """Counts of observed values per power-of-two bucket"""
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value: int):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0
+        }
+
+
+class MicroBatcher:
+    """
+    Dynamic batcher in front of TrustScoreMLEngine.predict_trust_scores_batch
+
+    Each model gets a dispatcher thread. A batch starts with the first waiting
+    request and closes after max_wait_ms or max_batch_size rows, whichever comes
+    first; every request then receives its own row of the batch result.
+    """
+
+    def __init__(self, engine: TrustScoreMLEngine, max_wait_ms: float = 2.0, max_batch_size: int = 64):
+        self.engine = engine
+        self.configure(max_wait_ms, max_batch_size)
+        self._queues = {}
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.batch_sizes = Histogram()
+        self.queue_depths = Histogram()
+        self.requests = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    def configure(self, max_wait_ms: float, max_batch_size: int):
+        """Tune the batching window"""
+        if max_wait_ms < 0 or max_batch_size < 1:
+            raise ValueError("max_wait_ms must be >= 0 and max_batch_size >= 1")
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+
+    def predict(self, features: Dict, model_name: str = 'RandomForest', timeout: Optional[float] = 30.0) -> Dict:
+        """
+        Predict one row through the batcher; blocks until its batch has run
+
+        Raises:
+            ValueError: If the row cannot be scored (same as predict_trust_score)
+        """
+        return self.submit(features, model_name).result(timeout=timeout)
+
+    def submit(self, features: Dict, model_name: str = 'RandomForest') -> Future:
+        """Queue one row and return a Future for its prediction"""
+        request_queue = self._get_queue(model_name)
+        future = Future()
+        request_queue.put((features, future, time.perf_counter()))
+        with self._stats_lock:
+            self.requests += 1
+            self.queue_depths.observe(request_queue.qsize())
+        return future
+
+    def _get_queue(self, model_name: str) -> queue.Queue:
+        with self._lock:
+            request_queue = self._queues.get(model_name)
+            if request_queue is None:
+                request_queue = queue.Queue()
+                self._queues[model_name] = request_queue
+                thread = threading.Thread(target=self._dispatch, args=(model_name, request_queue),
+                                          name=f'micro-batcher-{model_name}', daemon=True)
+                self._threads[model_name] = thread
+                thread.start()
+            return request_queue
+
+    def _collect_batch(self, request_queue: queue.Queue) -> List:
+        """Wait for a first request, then gather more until the window closes"""
+        batch = [request_queue.get()]
+        if batch[0] is None:
+            return []
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = request_queue.get(timeout=remaining) if remaining > 0 else request_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown sentinel: finish this batch, then stop
+                request_queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _dispatch(self, model_name: str, request_queue: queue.Queue):
+        while True:
+            batch = self._collect_batch(request_queue)
+            if not batch:
+                break
+            self._run_batch(model_name, batch)
+
+    def _run_batch(self, model_name: str, batch: List):
+        started = time.perf_counter()
+        try:
+            results = self.engine.predict_trust_scores_batch([features for features, _, _ in batch], model_name)
+        except Exception as e:
+            with self._stats_lock:
+                self.failed_batches += 1
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # Re-score each request on its own so one bad row fails only its caller
+            logger.warning(f"⚠️ Batch of {len(batch)} {model_name} predictions failed ({str(e)}); "
+                           f"scoring requests individually")
+            for item in batch:
+                self._run_batch(model_name, [item])
+            return
+
+        with self._stats_lock:
+            self.batches += 1
+            self.batch_sizes.observe(len(batch))
+
+        for (_, future, enqueued), result in zip(batch, results):
+            if 'error' in result:
+                future.set_exception(ValueError(result['error']))
+                continue
+            result['batch_size'] = len(batch)
+            result['queue_wait_ms'] = (started - enqueued) * 1000
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Request/batch counters and batch-size and queue-depth histograms"""
+        with self._stats_lock:
+            return {
+                'max_wait_ms': self.max_wait_ms,
+                'max_batch_size': self.max_batch_size,
+                'requests': self.requests,
+                'batches': self.batches,
+                'failed_batches': self.failed_batches,
+                'batch_size_histogram': self.batch_sizes.to_dict(),
+                'queue_depth_histogram': self.queue_depths.to_dict(),
+                'models': sorted(self._queues)
+            }
+
+    def close(self):
+        """Stop the dispatcher threads after the batches already queued"""
+        with self._lock:
+            for request_queue in self._queues.values():
+                request_queue.put(None)
+            threads = list(self._threads.values())
+            self._queues, self._threads = {}, {}
+        for thread in threads:
+            thread.join()
+
+
+# Global micro-batcher for the shared engine (used by /api/ml/predict when ML_MICRO_BATCHING is set)
+micro_batcher = MicroBatcher(ml_engine, max_wait_ms=Config.ML_BATCH_MAX_WAIT_MS,
+                             max_batch_size=Config.ML_BATCH_MAX_SIZE)
@@ -0,0 +1,163 @@
+"""
+Model Artifact Bundles for the Trust Score ML Engine
+Versioned single-file bundles of all trained models with a checksummed manifest,
+loadable with memory-mapped NumPy arrays so worker processes share pages
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import joblib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT_VERSION = 1
+# Bundles are written to one file per model version (BUNDLE_FILE_PATTERN); bundles
+# from before versioned files use BUNDLE_FILENAME
+BUNDLE_FILENAME = 'trust_engine_bundle.joblib'
+BUNDLE_FILE_PATTERN = 'trust_engine_bundle-{version}.joblib'
+MANIFEST_FILENAME = 'manifest.json'
+
+
+def is_bundle_directory(directory: str) -> bool:
+    """Check whether a directory holds a model artifact bundle"""
+    return os.path.exists(os.path.join(directory, MANIFEST_FILENAME))
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Stream a file through SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bundle_filename(manifest: Dict[str, Any]) -> str:
+    """Bundle file a manifest points to"""
+    return manifest.get('bundle_file', BUNDLE_FILENAME)
+
+
+def _remove_stale_bundles(directory: str, keep):
+    """Delete bundle files other than keep; readers that mapped them keep their pages"""
+    for path in glob.glob(os.path.join(directory, BUNDLE_FILE_PATTERN.format(version='*'))):
+        if os.path.basename(path) not in keep:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not remove old bundle {path}: {e}")
+
+
+def save_bundle(directory: str, payload: Dict[str, Any], model_version: Optional[str] = None,
+                metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Write a model artifact bundle and its manifest
+
+    The bundle goes to a new per-version file that is renamed into place and then
+    referenced by the manifest, so a bundle another process has memory-mapped is
+    never truncated or rewritten. The previous version's file is kept for readers
+    that still hold the old manifest; older ones are removed
+
+    Args:
+        directory: Target directory (created if missing)
+        payload: Objects to persist (models, scalers, feature names, ...)
+        model_version: Version label; defaults to a UTC timestamp
+        metadata: JSON-serializable fields copied into the manifest
+
+    Returns:
+        The manifest that was written
+    """
+    os.makedirs(directory, exist_ok=True)
+    model_version = model_version or datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+    filename = BUNDLE_FILE_PATTERN.format(version=re.sub(r'[^A-Za-z0-9._-]', '_', str(model_version)))
+    bundle_path = os.path.join(directory, filename)
+
+    # Uncompressed so NumPy arrays can be memory-mapped on load
+    tmp_bundle_path = f"{bundle_path}.{os.getpid()}.tmp"
+    try:
+        joblib.dump(payload, tmp_bundle_path)
+        os.replace(tmp_bundle_path, bundle_path)
+    finally:
+        if os.path.exists(tmp_bundle_path):
+            os.remove(tmp_bundle_path)
+
+    manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+    previous_files = set()
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                previous_files.add(bundle_filename(json.load(f)))
+        except (OSError, ValueError):
+            pass
+
+    manifest = {
+        'bundle_format_version': BUNDLE_FORMAT_VERSION,
+        'model_version': model_version,
+        'created_at': datetime.utcnow().isoformat(),
+        'bundle_file': filename,
+        'files': {
+            filename: {
+                'sha256': file_sha256(bundle_path),
+                'size_bytes': os.path.getsize(bundle_path)
+            }
+        }
+    }
+    manifest.update(metadata or {})
+
+    # Write the manifest last and atomically: a bundle is only visible once complete
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(tmp_path, manifest_path)
+    _remove_stale_bundles(directory, previous_files | {filename})
+
+    logger.info(f"💾 Saved model bundle {manifest['model_version']} to {directory}")
+    return manifest
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    """Read and sanity-check a bundle manifest"""
+    with open(os.path.join(directory, MANIFEST_FILENAME), 'r') as f:
+        manifest = json.load(f)
+
+    if manifest.get('bundle_format_version') != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format version: {manifest.get('bundle_format_version')}")
+    return manifest
+
+
+def verify_bundle(directory: str, manifest: Dict[str, Any]):
+    """Verify every bundle file against the manifest checksums"""
+    for filename, expected in manifest['files'].items():
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            raise ValueError(f"Bundle file missing: {filename}")
+        if os.path.getsize(path) != expected['size_bytes'] or file_sha256(path) != expected['sha256']:
+            raise ValueError(f"Bundle checksum mismatch for {filename}")
+
+
+def load_bundle(directory: str, mmap_mode: Optional[str] = 'r',
+                verify_checksums: bool = True) -> Dict[str, Any]:
+    """
+    Load a model artifact bundle
+
+    Args:
+        directory: Bundle directory
+        mmap_mode: joblib mmap mode for NumPy arrays ('r' shares pages across
+                   worker processes; None reads everything into memory)
+        verify_checksums: Verify file checksums against the manifest first
+
+    Returns:
+        Dict with the 'manifest' and the saved 'payload'
+    """
+    manifest = read_manifest(directory)
+    if verify_checksums:
+        verify_bundle(directory, manifest)
+
+    payload = joblib.load(os.path.join(directory, bundle_filename(manifest)), mmap_mode=mmap_mode)
+    logger.info(f"📂 Loaded model bundle {manifest['model_version']} from {directory}")
+    return {'manifest': manifest, 'payload': payload}
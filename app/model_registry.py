@@ -0,0 +1,192 @@
+"""
+Model Registry for the Trust Score ML Engine
+Owns the model set served by the shared engine and hot-swaps versioned
+model directories without restarting workers
+"""
+
+import os
+import gc
+import json
+import hashlib
+import time
+import weakref
+import threading
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.ml_engine import TrustScoreMLEngine, ml_engine
+from app.model_artifacts import MANIFEST_FILENAME
+
+logger = logging.getLogger(__name__)
+
+
+def directory_signature(directory: str) -> Optional[str]:
+    """
+    Cheap change marker for a model directory
+    Bundles are identified by their manifest version; per-model file layouts
+    by the names, sizes and modification times of their files
+    """
+    if not os.path.isdir(directory):
+        return None
+
+    manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                return f"bundle:{json.load(f).get('model_version')}"
+        except (OSError, ValueError):
+            # Manifest is being replaced; try again on the next poll
+            return None
+
+    entries = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(('.joblib', '.json')):
+            stat = os.stat(os.path.join(directory, filename))
+            entries.append(f"{filename}:{stat.st_size}:{stat.st_mtime_ns}")
+    if not entries:
+        return None
+    return f"files:{hashlib.sha256(chr(10).join(entries).encode('utf-8')).hexdigest()[:16]}"
+
+
+class ModelRegistry:
+    """
+    Versioned, atomic model swaps for one TrustScoreMLEngine
+
+    A new version is loaded and validated in a staging engine, then adopted by
+    the serving engine in a single locked step. Requests already running keep
+    the model objects they hold and finish on the old version; once they
+    release them the old version is garbage collected.
+    """
+
+    def __init__(self, engine: TrustScoreMLEngine, max_history: int = 20):
+        self.engine = engine
+        self.max_history = max_history
+        self.history = []
+        self._swap_lock = threading.Lock()
+        self._retired = []
+        self._watch_thread = None
+        self._watch_stop = threading.Event()
+        self._watch_signature = None
+        self.watch_directory = None
+
+    @property
+    def current_version(self) -> Optional[str]:
+        return self.engine.model_version
+
+    def load_version(self, directory: str) -> Dict[str, Any]:
+        """
+        Load a model directory (bundle or per-model files) and swap it in
+        Bundles are memory-mapped, so workers loading the same version share pages
+
+        Raises:
+            ValueError: If the directory holds no models or fails validation;
+                        the serving version is left untouched
+        """
+        start_time = time.perf_counter()
+        staging = TrustScoreMLEngine()
+        # Keep the serving backend selections for per-model files; bundles carry their own
+        staging.inference_backends = dict(self.engine.inference_backends)
+        staging.inference_backend_options = dict(self.engine.inference_backend_options)
+
+        loaded_models = staging.load_models(directory)
+        if not loaded_models:
+            raise ValueError(f"No models found in {directory}")
+
+        if staging.model_version is None:
+            # Per-model files carry no version; derive one every worker agrees on
+            staging.model_version = directory_signature(directory)
+
+        with self._swap_lock:
+            previous_version = self.engine.model_version
+            self._retire(previous_version, self.engine.trained_models, self.engine.compiled_models)
+            self.engine.adopt_models(staging)
+            entry = {
+                'version': staging.model_version,
+                'previous_version': previous_version,
+                'source': os.path.abspath(directory),
+                'models': loaded_models,
+                'loaded_at': datetime.utcnow().isoformat(),
+                'load_seconds': time.perf_counter() - start_time
+            }
+            self.history.append(entry)
+            del self.history[:-self.max_history]
+
+        # Drop the staging references so the old version can be freed once idle
+        del staging
+        gc.collect()
+
+        logger.info(f"🔄 Swapped models {previous_version} -> {entry['version']} from {directory}")
+        return entry
+
+    def _retire(self, version: Optional[str], trained_models: Dict, compiled_models: Dict):
+        """Track a replaced version weakly to report when its memory is released"""
+        references = [weakref.ref(model) for model in list(trained_models.values()) + list(compiled_models.values())]
+        if references:
+            self._retired.append((version, references))
+
+    def retired_versions_in_memory(self) -> List[str]:
+        """Replaced versions still referenced by in-flight requests"""
+        self._retired = [(version, refs) for version, refs in self._retired
+                         if any(ref() is not None for ref in refs)]
+        return [version for version, _ in self._retired]
+
+    def watch(self, directory: str, interval: float = 10.0, load_existing: bool = True):
+        """
+        Poll a model directory and hot-swap whenever its contents change
+
+        Args:
+            directory: Directory holding a bundle or per-model files
+            interval: Seconds between polls
+            load_existing: Load the models already in the directory right away
+        """
+        self.stop_watching()
+        self.watch_directory = directory
+        self._watch_signature = None if load_existing else directory_signature(directory)
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch_loop, args=(directory, interval), name='model-registry-watch', daemon=True
+        )
+        self._watch_thread.start()
+        logger.info(f"👀 Watching {directory} for new model versions every {interval}s")
+
+    def _watch_loop(self, directory: str, interval: float):
+        while not self._watch_stop.is_set():
+            self.check_for_update(directory)
+            self._watch_stop.wait(interval)
+
+    def check_for_update(self, directory: str) -> Optional[Dict[str, Any]]:
+        """Swap in the directory's models if they changed since the last check"""
+        signature = directory_signature(directory)
+        if signature is None or signature == self._watch_signature:
+            return None
+        try:
+            entry = self.load_version(directory)
+        except Exception as e:
+            logger.error(f"❌ Rejected model update from {directory}: {str(e)}")
+            entry = None
+        # Remember the signature either way so a bad version is not retried every poll
+        self._watch_signature = signature
+        return entry
+
+    def stop_watching(self):
+        """Stop the directory watch thread"""
+        if self._watch_thread is not None:
+            self._watch_stop.set()
+            self._watch_thread.join()
+            self._watch_thread = None
+
+    def status(self) -> Dict[str, Any]:
+        """Current version, swap history and watch state"""
+        return {
+            'current_version': self.current_version,
+            'models': list(self.engine.trained_models.keys()),
+            'history': self.history[-10:],
+            'retired_versions_in_memory': self.retired_versions_in_memory(),
+            'watch_directory': self.watch_directory,
+            'watching': self._watch_thread is not None
+        }
+
+
+# Global model registry for the shared engine
+model_registry = ModelRegistry(ml_engine)
@@ -0,0 +1,267 @@
+"""
+Approximate Nearest-Neighbour Index for KNN Trust Score Classification
+Random-projection forest that replaces brute-force / tree search for the
+KNN and AdaptiveKNN classifiers with a configurable recall/speed trade-off
+"""
+
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier
+import logging
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Distance metrics the index can evaluate exactly on its candidate sets
+SUPPORTED_METRICS = ('euclidean', 'manhattan', 'minkowski')
+
+
+class RandomProjectionForest:
+    """
+    Forest of random-projection trees for approximate k-NN search
+
+    Each tree recursively splits the training rows with a random hyperplane
+    (the perpendicular direction between two sampled rows) at the median
+    projection, until leaves hold at most leaf_size rows. A query visits one
+    leaf per tree and the union of those leaves is searched exactly.
+
+    Recall/speed trade-off:
+        n_trees   - more trees give more candidates and higher recall
+        leaf_size - larger leaves give more candidates per tree and higher recall
+    """
+
+    def __init__(self, n_trees: int = 8, leaf_size: int = 64, metric: str = 'euclidean',
+                 p: float = 2, random_state: int = 42, query_chunk_size: int = 128):
+        if metric not in SUPPORTED_METRICS:
+            raise ValueError(f"Unsupported metric '{metric}'. Available: {list(SUPPORTED_METRICS)}")
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.metric = metric
+        self.p = p
+        self.random_state = random_state
+        self.query_chunk_size = query_chunk_size
+        self.data = None
+
+    def fit(self, X) -> 'RandomProjectionForest':
+        """Build all projection trees and pack them into contiguous arrays"""
+        self.data = np.ascontiguousarray(X)
+        rng = np.random.default_rng(self.random_state)
+        trees = [self._build_tree(rng) for _ in range(self.n_trees)]
+
+        # Concatenate trees with global node/leaf ids so queries walk every tree at once.
+        # Hyperplanes are stored only for split nodes; leaves share the all-zero row 0.
+        node_offsets = np.cumsum([0] + [len(tree['offset']) for tree in trees[:-1]])
+        leaf_offsets = np.cumsum([0] + [len(tree['leaves']) for tree in trees[:-1]])
+        normal_offsets = np.cumsum([1] + [len(tree['normals']) for tree in trees[:-1]])
+        self.normals = np.concatenate([np.zeros((1, self.data.shape[1]), dtype=np.float32)] +
+                                      [tree['normals'] for tree in trees])
+        self.normal_row = np.concatenate([np.where(tree['normal_row'] >= 0, tree['normal_row'] + base, 0)
+                                          for tree, base in zip(trees, normal_offsets)])
+        self.offset = np.concatenate([tree['offset'] for tree in trees])
+        self.left = np.concatenate([tree['left'] + base for tree, base in zip(trees, node_offsets)])
+        self.right = np.concatenate([tree['right'] + base for tree, base in zip(trees, node_offsets)])
+        self.leaf_id = np.concatenate([np.where(tree['leaf_id'] >= 0, tree['leaf_id'] + base, -1)
+                                       for tree, base in zip(trees, leaf_offsets)])
+        self.leaves = np.concatenate([tree['leaves'] for tree in trees])
+        self.roots = np.asarray(node_offsets, dtype=np.intp)
+        self.max_depth = max(tree['depth'] for tree in trees)
+
+        logger.info(f"Built random-projection forest: {self.n_trees} trees, "
+                    f"{self.data.shape[0]} rows, leaf size {self.leaf_size}")
+        return self
+
+    @property
+    def n_samples(self) -> int:
+        return 0 if self.data is None else self.data.shape[0]
+
+    def _build_tree(self, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """Split rows recursively into leaves of at most leaf_size rows"""
+        normals, normal_rows, offsets, lefts, rights, leaf_ids = [], [], [], [], [], []
+        leaves = []
+        max_depth = 0
+
+        def new_node() -> int:
+            normal_rows.append(-1)
+            offsets.append(0.0)
+            lefts.append(-1)
+            rights.append(-1)
+            leaf_ids.append(-1)
+            return len(offsets) - 1
+
+        stack = [(new_node(), np.arange(self.n_samples), 0)]
+
+        while stack:
+            node, indices, depth = stack.pop()
+            if len(indices) <= self.leaf_size:
+                # Leaves point back to themselves so every query can take max_depth steps
+                lefts[node] = rights[node] = node
+                leaf_ids[node] = len(leaves)
+                leaves.append(indices)
+                max_depth = max(max_depth, depth)
+                continue
+
+            normal, offset, goes_left = self._split(rng, indices)
+            normal_rows[node] = len(normals)
+            normals.append(normal)
+            offsets[node] = offset
+
+            left, right = new_node(), new_node()
+            lefts[node], rights[node] = left, right
+            stack.append((left, indices[goes_left], depth + 1))
+            stack.append((right, indices[~goes_left], depth + 1))
+
+        # Pad leaves to a fixed width so candidate gathering stays vectorized
+        padded_leaves = np.full((len(leaves), self.leaf_size), -1, dtype=np.intp)
+        for leaf_id, indices in enumerate(leaves):
+            padded_leaves[leaf_id, :len(indices)] = indices
+
+        return {
+            'normals': np.asarray(normals, dtype=np.float32).reshape(-1, self.data.shape[1]),
+            'normal_row': np.asarray(normal_rows, dtype=np.intp),
+            'offset': np.asarray(offsets, dtype=np.float64),
+            'left': np.asarray(lefts, dtype=np.intp),
+            'right': np.asarray(rights, dtype=np.intp),
+            'leaf_id': np.asarray(leaf_ids, dtype=np.intp),
+            'leaves': padded_leaves,
+            'depth': max_depth
+        }
+
+    def _split(self, rng: np.random.Generator, indices: np.ndarray) -> Tuple[np.ndarray, float, np.ndarray]:
+        """Choose a random hyperplane and split the rows at the median projection"""
+        for _ in range(5):
+            a, b = self.data[rng.choice(indices, size=2, replace=False)]
+            # Hyperplanes are stored as float32; split on the stored precision
+            normal = (a - b).astype(np.float32).astype(np.float64)
+            projections = self.data[indices] @ normal
+            offset = float(np.median(projections))
+            goes_left = projections <= offset
+            n_left = int(goes_left.sum())
+            if 0 < n_left < len(indices):
+                return normal, offset, goes_left
+
+        # Degenerate rows (e.g. duplicates): split arbitrarily, queries follow the left branch
+        goes_left = np.zeros(len(indices), dtype=bool)
+        goes_left[:len(indices) // 2] = True
+        return normal, float(np.max(projections)), goes_left
+
+    def _query_leaves(self, X: np.ndarray) -> np.ndarray:
+        """Route every query row to its leaf in every tree: (n_queries, n_trees) leaf ids"""
+        nodes = np.tile(self.roots, (X.shape[0], 1))
+        for _ in range(self.max_depth):
+            projections = np.einsum('qd,qtd->qt', X, self.normals[self.normal_row[nodes]].astype(np.float64))
+            nodes = np.where(projections <= self.offset[nodes], self.left[nodes], self.right[nodes])
+        return self.leaf_id[nodes]
+
+    def _distances(self, queries: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        diff = self.data[candidates] - queries[:, np.newaxis, :]
+        if self.metric == 'manhattan' or (self.metric == 'minkowski' and self.p == 1):
+            return np.abs(diff).sum(axis=2)
+        if self.metric == 'euclidean' or self.p == 2:
+            return np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+        return (np.abs(diff) ** self.p).sum(axis=2) ** (1.0 / self.p)
+
+    def kneighbors(self, X, n_neighbors: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate k nearest neighbours of each query row
+
+        Returns:
+            (distances, indices), both of shape (n_queries, n_neighbors).
+            Slots without a candidate have distance inf and index -1.
+        """
+        if self.data is None:
+            raise ValueError("Index has not been fitted")
+        X = np.asarray(X, dtype=np.float64)
+        n_queries = X.shape[0]
+        distances = np.full((n_queries, n_neighbors), np.inf)
+        indices = np.full((n_queries, n_neighbors), -1, dtype=np.intp)
+
+        for start in range(0, n_queries, self.query_chunk_size):
+            queries = X[start:start + self.query_chunk_size]
+            candidates = self.leaves[self._query_leaves(queries)].reshape(len(queries), -1)
+
+            # The same row can be reached through several trees: keep one copy
+            candidates.sort(axis=1)
+            duplicate = np.zeros(candidates.shape, dtype=bool)
+            duplicate[:, 1:] = candidates[:, 1:] == candidates[:, :-1]
+            invalid = duplicate | (candidates < 0)
+
+            candidate_distances = self._distances(queries, np.where(invalid, 0, candidates))
+            candidate_distances[invalid] = np.inf
+
+            k = min(n_neighbors, candidates.shape[1])
+            nearest = np.argpartition(candidate_distances, k - 1, axis=1)[:, :k]
+            nearest_distances = np.take_along_axis(candidate_distances, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1, kind='stable')
+            nearest = np.take_along_axis(nearest, order, axis=1)
+
+            chunk_distances = np.take_along_axis(candidate_distances, nearest, axis=1)
+            chunk_indices = np.take_along_axis(candidates, nearest, axis=1)
+            chunk_indices[np.isinf(chunk_distances)] = -1
+
+            distances[start:start + len(queries), :k] = chunk_distances
+            indices[start:start + len(queries), :k] = chunk_indices
+
+        return distances, indices
+
+
+class ApproximateKNNClassifier:
+    """
+    Serve a fitted KNN / AdaptiveKNN model from a RandomProjectionForest
+    Keeps the source model's classes_, n_neighbors, weights and metric
+    """
+
+    def __init__(self, knn: Any, n_trees: int = 8, leaf_size: int = 64, random_state: int = 42):
+        """
+        Build an approximate index from a fitted KNeighborsClassifier, or a
+        fitted search object (e.g. GridSearchCV) whose best_estimator_ is one
+        """
+        estimator = getattr(knn, 'best_estimator_', knn)
+        if not isinstance(estimator, KNeighborsClassifier) or not hasattr(estimator, '_fit_X'):
+            raise ValueError(f"Cannot index {type(knn).__name__}: expected a fitted KNeighborsClassifier")
+        if estimator.weights not in ('uniform', 'distance'):
+            raise ValueError(f"Unsupported KNN weights: {estimator.weights}")
+
+        metric = estimator.effective_metric_
+        p = (estimator.effective_metric_params_ or {}).get('p', 2)
+
+        self.classes_ = estimator.classes_
+        self.n_features_in_ = estimator.n_features_in_
+        self.n_neighbors = estimator.n_neighbors
+        self.weights = estimator.weights
+        self.params = {'n_trees': n_trees, 'leaf_size': leaf_size, 'random_state': random_state}
+        self._y = np.asarray(estimator._y)
+        self.index = RandomProjectionForest(
+            n_trees=n_trees, leaf_size=leaf_size, metric=metric, p=p, random_state=random_state
+        ).fit(estimator._fit_X)
+
+    @property
+    def n_samples_fit_(self) -> int:
+        return self.index.n_samples
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities from (distance-)weighted votes of the approximate neighbours"""
+        distances, indices = self.index.kneighbors(X, self.n_neighbors)
+        valid = indices >= 0
+        labels = self._y[np.where(valid, indices, 0)]
+
+        if self.weights == 'distance':
+            # Mirror sklearn: exact matches take all the weight
+            with np.errstate(divide='ignore'):
+                weights = 1.0 / distances
+            exact = distances == 0
+            has_exact = exact.any(axis=1)
+            weights[has_exact] = exact[has_exact].astype(np.float64)
+        else:
+            weights = np.ones_like(distances)
+        weights[~valid] = 0.0
+
+        proba = np.zeros((len(indices), len(self.classes_)))
+        for class_index in range(len(self.classes_)):
+            proba[:, class_index] = (weights * (labels == class_index)).sum(axis=1)
+
+        normalizer = proba.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        return proba / normalizer
+
+    def predict(self, X) -> np.ndarray:
+        """Predict class labels as the argmax of predict_proba over classes_"""
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
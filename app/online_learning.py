@@ -0,0 +1,311 @@
+"""
+Online Learning for the Trust Score ML Engine
+Updates the serving classifiers from mini-batches of newly labelled telemetry
+between full retrains, on a schedule or when enough rows have arrived
+"""
+
+import copy
+import time
+import threading
+import logging
+import numpy as np
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sklearn.base import clone
+
+from app.data_loader import ReservoirSample, LABEL_COLUMN
+from app.ml_engine import TrustScoreMLEngine, ml_engine
+
+logger = logging.getLogger(__name__)
+
+# Classifiers with an incremental update path
+#   NaiveBayes, MLP: partial_fit on each mini-batch
+#   KNN: refit on a bounded reservoir sample of all rows seen so far
+# Forests and hyperparameter searches keep to full retrains.
+ONLINE_MODELS = ('NaiveBayes', 'MLP', 'KNN')
+
+# Models whose inputs go through the incrementally updated scaler
+ONLINE_SCALED_MODELS = ('MLP', 'KNN')
+
+
+class OnlineLearner:
+    """
+    Mini-batch updates of the engine's serving models
+
+    Labelled rows are buffered by add_samples and applied by update(), either
+    called directly, by the scheduler thread every `interval` seconds, or as
+    soon as `trigger_rows` rows are pending. Each update works on copies of the
+    serving models and publishes them atomically; if a full retrain or a model
+    swap lands in the meantime the update is discarded and its rows re-queued.
+    """
+
+    def __init__(self, engine: TrustScoreMLEngine, reservoir_size: int = 20000,
+                 min_batch_size: int = 32, max_pending: int = 100000, seed: int = 42):
+        self.engine = engine
+        self.reservoir_size = reservoir_size
+        self.min_batch_size = min_batch_size
+        self.seed = seed
+        self.trigger_rows = None
+
+        self._pending = deque(maxlen=max_pending)
+        self._pending_lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._reservoir = None
+        self._reservoir_version = None
+
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.interval = None
+
+        self.stats = {
+            'updates': 0,
+            'rows_received': 0,
+            'rows_applied': 0,
+            'rows_dropped': 0,
+            'stale_updates': 0,
+            'last_update_at': None,
+            'last_update_seconds': None,
+            'last_update_rows': 0
+        }
+        self._last_update_monotonic = None
+
+    def add_samples(self, records: List[Dict]) -> int:
+        """
+        Queue labelled rows for the next update
+
+        Args:
+            records: Feature dicts with either an attack 'Label' (mapped through
+                     the engine's STRIDE mapping) or an integer 'trust_score'
+
+        Returns:
+            Number of rows accepted (rows without a label are ignored)
+        """
+        accepted = 0
+        with self._pending_lock:
+            for record in records:
+                if LABEL_COLUMN in record:
+                    label = self.engine._map_to_stride_categories(record[LABEL_COLUMN])
+                elif 'trust_score' in record:
+                    label = int(record['trust_score'])
+                else:
+                    continue
+                features = {k: v for k, v in record.items() if k not in (LABEL_COLUMN, 'trust_score')}
+                if len(self._pending) == self._pending.maxlen:
+                    self.stats['rows_dropped'] += 1
+                self._pending.append((features, label, time.monotonic()))
+                accepted += 1
+            self.stats['rows_received'] += accepted
+            pending = len(self._pending)
+
+        if self.trigger_rows and pending >= self.trigger_rows:
+            self._wake.set()
+        return accepted
+
+    @property
+    def pending_rows(self) -> int:
+        return len(self._pending)
+
+    def update(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Apply the pending rows to the online models
+
+        Args:
+            force: Update even if fewer than min_batch_size rows are pending
+
+        Raises:
+            ValueError: If the engine has no trained models to update
+        """
+        with self._update_lock:
+            with self._pending_lock:
+                if not self._pending or (len(self._pending) < self.min_batch_size and not force):
+                    return {'status': 'skipped', 'pending_rows': len(self._pending)}
+                batch = list(self._pending)
+                self._pending.clear()
+
+            try:
+                summary = self._apply_batch(batch)
+            except Exception:
+                self._requeue(batch)
+                raise
+
+            if summary['status'] == 'stale':
+                self._requeue(batch)
+            return summary
+
+    def _requeue(self, batch: List):
+        with self._pending_lock:
+            self._pending.extendleft(reversed(batch))
+
+    def _apply_batch(self, batch: List) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        engine = self.engine
+
+        # Snapshot the serving model set; updates are made on copies
+        with engine._model_lock:
+            version = engine.model_version
+            trained_models = dict(engine.trained_models)
+            scalers = dict(engine.scalers)
+            feature_layout = engine.feature_layout
+            base_scaler = engine.get_scaler('MLP') or engine.get_scaler('KNN')
+
+        online_names = [name for name in ONLINE_MODELS if name in trained_models]
+        if not online_names or feature_layout is None:
+            raise ValueError("No trained NaiveBayes, MLP or KNN model to update. Train models first.")
+
+        X, row_errors, _ = feature_layout.assemble_batch([features for features, _, _ in batch])
+        y = np.array([label for _, label, _ in batch], dtype=np.int64)
+        if row_errors:
+            valid = np.setdiff1d(np.arange(len(batch)), list(row_errors))
+            X, y = X[valid], y[valid]
+
+        # Incremental scaler shared by the scaled online models
+        scaler = None
+        if base_scaler is not None and any(name in ONLINE_SCALED_MODELS for name in online_names):
+            scaler = copy.deepcopy(base_scaler)
+            scaler.partial_fit(X)
+
+        updated_models, model_stats = {}, {}
+        for name in online_names:
+            model = trained_models[name]
+            if name == 'KNN':
+                if scaler is None:
+                    continue
+                updated_models[name], model_stats[name] = self._update_knn(
+                    model, X, y, base_scaler, scaler, version
+                )
+                continue
+
+            # partial_fit cannot add classes to an already fitted model
+            known = np.isin(y, model.classes_)
+            model = copy.deepcopy(model)
+            if known.any():
+                inputs = X[known]
+                if name in ONLINE_SCALED_MODELS:
+                    if scaler is None:
+                        continue
+                    inputs = scaler.transform(inputs)
+                model.partial_fit(inputs, y[known])
+            updated_models[name] = model
+            model_stats[name] = {'rows_applied': int(known.sum()), 'rows_unknown_class': int((~known).sum())}
+
+        new_scalers = dict(scalers)
+        if scaler is not None:
+            for name in ONLINE_SCALED_MODELS:
+                if name in updated_models:
+                    new_scalers[name] = scaler
+
+        new_version = datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+        published = engine._publish_models(
+            {**trained_models, **updated_models}, new_scalers,
+            model_version=new_version, expected_version=version
+        )
+        if not published:
+            logger.warning(f"⚠️ Online update discarded: models changed from {version} during the update")
+            self.stats['stale_updates'] += 1
+            self._reservoir = None
+            return {'status': 'stale', 'base_version': version}
+
+        if 'KNN' in updated_models:
+            self._reservoir_version = new_version
+
+        elapsed = time.perf_counter() - start_time
+        oldest_row_age = time.monotonic() - min(received for _, _, received in batch)
+        self.stats['updates'] += 1
+        self.stats['rows_applied'] += len(X)
+        self.stats['last_update_at'] = datetime.utcnow().isoformat()
+        self.stats['last_update_seconds'] = elapsed
+        self.stats['last_update_rows'] = len(X)
+        self._last_update_monotonic = time.monotonic()
+
+        logger.info(f"🔁 Online update {version} -> {new_version}: {len(X)} rows in {elapsed:.3f}s")
+        return {
+            'status': 'updated',
+            'base_version': version,
+            'model_version': new_version,
+            'rows': len(X),
+            'rows_invalid': len(row_errors),
+            'models': model_stats,
+            'update_seconds': elapsed,
+            'max_row_staleness_seconds': oldest_row_age
+        }
+
+    def _update_knn(self, model, X: np.ndarray, y: np.ndarray, base_scaler, scaler,
+                    version: Optional[str]):
+        """Refit KNN on the reservoir sample after adding the new rows"""
+        if self._reservoir is None or self._reservoir_version != version:
+            # Start from the rows the serving model was fitted on (stored scaled)
+            fitted_rows = base_scaler.inverse_transform(model._fit_X)
+            fitted_labels = np.asarray(model.classes_)[model._y]
+            self._reservoir = ReservoirSample(self.reservoir_size, X.shape[1], dtype=np.float64, seed=self.seed)
+            self._reservoir.add(fitted_rows, fitted_labels)
+
+        self._reservoir.add(X, y)
+        X_sample, y_sample = self._reservoir.result()
+        knn = clone(model).fit(scaler.transform(X_sample), y_sample)
+        return knn, {
+            'rows_applied': len(X),
+            'reservoir_rows': len(X_sample),
+            'rows_seen': self._reservoir.rows_seen
+        }
+
+    def start(self, interval: float = 60.0, trigger_rows: Optional[int] = None):
+        """
+        Run updates in a background thread
+
+        Args:
+            interval: Seconds between scheduled updates
+            trigger_rows: Also update as soon as this many rows are pending
+        """
+        self.stop()
+        self.interval = interval
+        self.trigger_rows = trigger_rows
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='online-learning', daemon=True)
+        self._thread.start()
+        logger.info(f"🔁 Online learning every {interval}s"
+                    + (f" or every {trigger_rows} rows" if trigger_rows else ""))
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.update()
+            except Exception as e:
+                logger.error(f"❌ Online update failed: {str(e)}")
+
+    def stop(self):
+        """Stop the background update thread"""
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.trigger_rows = None
+
+    def status(self) -> Dict[str, Any]:
+        """Update counters, pending rows and model freshness"""
+        since_update = None
+        if self._last_update_monotonic is not None:
+            since_update = time.monotonic() - self._last_update_monotonic
+        return {
+            **self.stats,
+            'pending_rows': self.pending_rows,
+            'seconds_since_last_update': since_update,
+            'running': self._thread is not None,
+            'interval': self.interval,
+            'trigger_rows': self.trigger_rows,
+            'min_batch_size': self.min_batch_size,
+            'reservoir_size': self.reservoir_size,
+            'model_version': self.engine.model_version,
+            'online_models': list(ONLINE_MODELS)
+        }
+
+
+# Global online learner for the shared engine
+online_learner = OnlineLearner(ml_engine)
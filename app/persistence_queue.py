@@ -0,0 +1,368 @@
+"""
+Write-Behind Persistence Queue for Telemetry Ingestion
+Takes Supabase and Elasticsearch writes off the request path: documents are
+queued in memory and written in batches by background workers
+"""
+
+import os
+import json
+import time
+import random
+import atexit
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Queue kinds of the default writers: Supabase tables and Elasticsearch index prefixes
+SUPABASE_KINDS = ('TelemetryData', 'TrustScore')
+ELASTICSEARCH_KINDS = ('es:telemetrydata', 'es:trustscore', 'es:wazuh_alerts')
+
+
+class QueueFullError(Exception):
+    """Raised when the queue cannot take more documents (backpressure)"""
+
+
+class WriterUnavailable(Exception):
+    """
+    Raised by a writer whose optional backend is not configured or not reachable
+    Its documents are skipped: not retried and not dead-lettered
+    """
+
+
+class PersistenceQueue:
+    """
+    Bounded write-behind queue drained by worker threads
+
+    Each queued item is a (kind, document) pair; `writers` maps a kind to a
+    callable that writes a list of documents. A writer either returns None
+    (everything written), returns one success flag per document, or raises
+    (nothing written). Failed documents are retried with exponential backoff
+    and full jitter, then appended to the dead-letter JSONL file. A writer
+    raising WriterUnavailable has its documents skipped right away, so an
+    optional backend being down never ties up the workers.
+
+    Items live in process memory only: anything still queued when the
+    process is killed is lost. stop() drains the queue on a clean shutdown.
+    """
+
+    def __init__(self, writers: Dict[str, Callable[[List[Dict]], Optional[List[bool]]]],
+                 max_size: int = 50000, batch_size: int = 500, flush_interval: float = 0.05,
+                 workers: int = 2, max_retries: int = 5, backoff_base: float = 0.1,
+                 backoff_max: float = 10.0, enqueue_timeout: float = 0.0,
+                 dead_letter_path: str = 'data/persistence_dead_letter.jsonl'):
+        if max_size < 1 or batch_size < 1 or workers < 1:
+            raise ValueError("max_size, batch_size and workers must be at least 1")
+        self.writers = dict(writers)
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.num_workers = workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.enqueue_timeout = enqueue_timeout
+        self.dead_letter_path = dead_letter_path
+
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._dead_letter_lock = threading.Lock()
+        self._abort = threading.Event()
+        self._stopping = False
+        self._threads = []
+        self._in_flight = 0
+
+        self.stats = {
+            'enqueued': 0,
+            'rejected': 0,
+            'written': 0,
+            'failed_writes': 0,
+            'retries': 0,
+            'dead_lettered': 0,
+            'skipped': 0,
+            'batches': 0,
+            'max_depth': 0,
+            'last_error': None,
+            'last_error_at': None
+        }
+        self.written_by_kind = {}
+
+    def submit(self, kind: str, document: Dict, timeout: Optional[float] = None):
+        """Queue one document; see submit_many"""
+        self.submit_many([(kind, document)], timeout)
+
+    def submit_many(self, items: Iterable[Tuple[str, Dict]], timeout: Optional[float] = None):
+        """
+        Queue documents as one unit: either all are queued or none is
+
+        Args:
+            items: (kind, document) pairs
+            timeout: Seconds to wait for room (defaults to enqueue_timeout)
+
+        Raises:
+            QueueFullError: If there is no room for every item within the timeout
+            ValueError: If a kind has no writer, or the items exceed the queue size
+        """
+        items = list(items)
+        for kind, _ in items:
+            if kind not in self.writers:
+                raise ValueError(f"No writer for queue kind '{kind}'")
+        if len(items) > self.max_size:
+            raise ValueError(f"{len(items)} items exceed the queue size of {self.max_size}")
+
+        timeout = self.enqueue_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        now = time.monotonic()
+        with self._cond:
+            if self._stopping:
+                self.stats['rejected'] += len(items)
+                raise QueueFullError("Persistence queue is shutting down")
+            while len(self._items) + len(items) > self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['rejected'] += len(items)
+                    raise QueueFullError(
+                        f"Persistence queue full ({len(self._items)}/{self.max_size} items)"
+                    )
+                self._cond.wait(remaining)
+            self._items.extend((kind, document, now) for kind, document in items)
+            self.stats['enqueued'] += len(items)
+            self.stats['max_depth'] = max(self.stats['max_depth'], len(self._items))
+            self._cond.notify_all()
+
+    def start(self):
+        """Start the worker threads"""
+        if self._threads:
+            return
+        self._stopping = False
+        self._abort.clear()
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._run, name=f'persistence-writer-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"💾 Write-behind persistence started: {self.num_workers} workers, "
+                    f"queue size {self.max_size}, batches of {self.batch_size}")
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = 30.0):
+        """
+        Stop the workers
+
+        Args:
+            drain: Write out queued items first; otherwise abandon retries and
+                   leave the queue as is
+            timeout: Seconds to wait for each worker
+        """
+        if not drain:
+            self._abort.set()
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until every queued item has been written or dead-lettered"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._items or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _next_batch(self) -> Optional[List]:
+        with self._cond:
+            while True:
+                while not self._items and not self._stopping:
+                    self._cond.wait()
+                if not self._items or self._abort.is_set():
+                    return None
+                # Let a small batch fill up for flush_interval before writing it
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._items) < self.batch_size and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                # Another worker may have taken the items in the meantime
+                if self._items:
+                    break
+            batch = [self._items.popleft() for _ in range(min(self.batch_size, len(self._items)))]
+            self._in_flight += len(batch)
+            # Producers waiting for room
+            self._cond.notify_all()
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            try:
+                by_kind = {}
+                for kind, document, _ in batch:
+                    by_kind.setdefault(kind, []).append(document)
+                for kind, documents in by_kind.items():
+                    self._write_with_retry(kind, documents)
+                with self._cond:
+                    self.stats['batches'] += 1
+            except Exception as e:
+                logger.error(f"❌ Persistence worker error: {str(e)}")
+            finally:
+                with self._cond:
+                    self._in_flight -= len(batch)
+                    self._cond.notify_all()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _write_with_retry(self, kind: str, documents: List[Dict]):
+        writer = self.writers[kind]
+        pending = documents
+        error = None
+        attempts = 0
+        while pending:
+            attempts += 1
+            try:
+                outcome = writer(pending)
+                failed = [] if outcome is None else [doc for doc, ok in zip(pending, outcome) if not ok]
+                error = f"{len(failed)} documents rejected" if failed else None
+            except WriterUnavailable as e:
+                self._skip(kind, pending, str(e))
+                return
+            except Exception as e:
+                failed = pending
+                error = f"{type(e).__name__}: {str(e)}"
+
+            with self._cond:
+                written = len(pending) - len(failed)
+                self.stats['written'] += written
+                self.written_by_kind[kind] = self.written_by_kind.get(kind, 0) + written
+                if failed:
+                    self.stats['failed_writes'] += 1
+                    self.stats['last_error'] = f"{kind}: {error}"
+                    self.stats['last_error_at'] = datetime.utcnow().isoformat()
+
+            pending = failed
+            if not pending or attempts > self.max_retries:
+                break
+            with self._cond:
+                self.stats['retries'] += 1
+            if self._abort.wait(self._backoff(attempts - 1)):
+                break
+
+        if pending:
+            logger.error(f"❌ {len(pending)} {kind} documents dead-lettered after {attempts} attempts: {error}")
+            self._dead_letter(kind, pending, error, attempts)
+
+    def _skip(self, kind: str, documents: List[Dict], reason: str):
+        with self._cond:
+            first = self.stats['skipped'] == 0
+            self.stats['skipped'] += len(documents)
+        log = logger.warning if first else logger.debug
+        log(f"⚠️ Skipped {len(documents)} {kind} documents: {reason}")
+
+    def _dead_letter(self, kind: str, documents: List[Dict], error: Optional[str], attempts: int):
+        failed_at = datetime.utcnow().isoformat()
+        with self._dead_letter_lock:
+            try:
+                directory = os.path.dirname(self.dead_letter_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.dead_letter_path, 'a') as f:
+                    for document in documents:
+                        f.write(json.dumps({
+                            'kind': kind,
+                            'document': document,
+                            'error': error,
+                            'attempts': attempts,
+                            'failed_at': failed_at
+                        }, default=str) + '\n')
+            except OSError as e:
+                logger.error(f"❌ Could not write dead-letter file {self.dead_letter_path}: {str(e)}")
+        with self._cond:
+            self.stats['dead_lettered'] += len(documents)
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth and utilization, write/retry/dead-letter counters"""
+        with self._cond:
+            oldest_age = time.monotonic() - self._items[0][2] if self._items else 0.0
+            return {
+                **self.stats,
+                'depth': len(self._items),
+                'in_flight': self._in_flight,
+                'max_size': self.max_size,
+                'utilization': len(self._items) / self.max_size,
+                'oldest_item_age_seconds': oldest_age,
+                'written_by_kind': dict(self.written_by_kind),
+                'workers': len(self._threads),
+                'running': bool(self._threads) and not self._stopping,
+                'dead_letter_path': self.dead_letter_path
+            }
+
+
+def _supabase_writer(table: str) -> Callable[[List[Dict]], None]:
+    def write(documents: List[Dict]):
+        from app.utils import get_supabase_client
+        get_supabase_client().table(table).insert(documents).execute()
+    return write
+
+
+# Monotonic time until which Elasticsearch writes are skipped after it was found unreachable
+_elasticsearch_down_until = 0.0
+
+
+def _elasticsearch_writer(index_prefix: str) -> Callable[[List[Dict]], List[bool]]:
+    def write(documents: List[Dict]) -> List[bool]:
+        global _elasticsearch_down_until
+        from app.elasticsearch_integration import elasticsearch_integration
+        client = elasticsearch_integration.es_client
+        if client is None:
+            raise WriterUnavailable("Elasticsearch client is not configured")
+        if time.monotonic() < _elasticsearch_down_until:
+            raise WriterUnavailable("Elasticsearch is unreachable")
+
+        outcome = elasticsearch_integration.bulk_index_documents(documents, index_prefix)
+        # Nothing indexed: tell rejected documents apart from an outage
+        if documents and not any(outcome):
+            try:
+                reachable = client.ping()
+            except Exception:
+                reachable = False
+            if not reachable:
+                _elasticsearch_down_until = time.monotonic() + Config.PERSISTENCE_ES_RETRY_INTERVAL
+                raise WriterUnavailable("Elasticsearch is unreachable")
+        return outcome
+    return write
+
+
+def default_writers() -> Dict[str, Callable]:
+    """Bulk writers for the Supabase tables and Elasticsearch indices used by ingestion"""
+    writers = {table: _supabase_writer(table) for table in SUPABASE_KINDS}
+    writers.update({kind: _elasticsearch_writer(kind.split(':', 1)[1]) for kind in ELASTICSEARCH_KINDS})
+    return writers
+
+
+# Global write-behind queue (started by app/__init__.py when PERSISTENCE_WRITE_BEHIND is set)
+persistence_queue = PersistenceQueue(
+    default_writers(),
+    max_size=Config.PERSISTENCE_QUEUE_SIZE,
+    batch_size=Config.PERSISTENCE_BATCH_SIZE,
+    workers=Config.PERSISTENCE_WORKERS,
+    max_retries=Config.PERSISTENCE_MAX_RETRIES,
+    enqueue_timeout=Config.PERSISTENCE_ENQUEUE_TIMEOUT_MS / 1000.0,
+    dead_letter_path=Config.PERSISTENCE_DEAD_LETTER_PATH
+)
+atexit.register(persistence_queue.stop)
@@ -0,0 +1,117 @@
+"""
+Prediction Result Cache for the Trust Score ML Engine
+LRU/TTL cache of single-row predictions keyed on model version and a hash of
+the quantized feature vector
+"""
+
+import time
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def quantize_features(row: np.ndarray, significant_digits: Optional[int]) -> bytes:
+    """
+    Bytes identifying a feature vector up to `significant_digits` significant digits
+    Values are rounded to an integer mantissa and a decimal exponent; a mantissa
+    that rounds up to the next decade (9.996 -> 10.0 at 3 digits) is renormalized
+    so vectors that round to the same values always hash the same. None or 0
+    keeps exact values.
+    """
+    x = np.asarray(row, dtype=np.float64).ravel()
+    if not significant_digits:
+        return x.tobytes()
+
+    finite = np.isfinite(x) & (x != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exponent = np.where(finite, np.floor(np.log10(np.abs(x))), 0).astype(np.int64)
+        mantissa = np.where(finite, np.round(x * 10.0 ** (significant_digits - 1 - exponent)), 0).astype(np.int64)
+    # Rounding (or log10 error) can carry into the next decade: 999.6 -> 1000 is 100e1
+    carried = np.abs(mantissa) >= 10 ** significant_digits
+    mantissa = np.where(carried, mantissa // 10, mantissa)
+    exponent = exponent + carried
+    # Zeros and non-finite values are kept exactly
+    exact = np.where(finite, 0.0, x)
+    return mantissa.tobytes() + exponent.tobytes() + exact.tobytes()
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of prediction results with a time-to-live
+
+    Keys include the model version, so results of a replaced model set are
+    never served; invalidate() additionally frees them on every model swap.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: Optional[float] = 300.0,
+                 significant_digits: Optional[int] = 3):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.significant_digits = significant_digits
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def make_key(self, model_name: str, model_version: Optional[str], row: np.ndarray) -> Tuple:
+        digest = hashlib.blake2b(quantize_features(row, self.significant_digits), digest_size=16).digest()
+        return (model_name, model_version, digest)
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Cached result for a key (a copy), or None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result = entry
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    def put(self, key: Tuple, result: Dict[str, Any]):
+        """Store a result, evicting the least recently used entries beyond max_entries"""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (expires_at, dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry (called when the serving models change)"""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and configuration"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'significant_digits': self.significant_digits,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
@@ -7,6 +7,10 @@ from app.wazuh_simulation import wazuh_simulation
 from datetime import datetime
 from app.turest_score import calculate_trust_score
 from app.auth import require_auth, require_vm_agent
+from app.config import Config
+from app.telemetry_ingest import parse_telemetry_batch, build_telemetry_rows, ingest_telemetry_records, persistence_items
+from app.persistence_queue import persistence_queue, QueueFullError
+from app.supabase_pool import supabase_pool
 
 bp = Blueprint('routes', __name__)
 
@@ -59,6 +63,9 @@ def root():
             'GET /auth/logout': 'Okta logout',
             'GET /auth/user': 'Get current user info',
             'POST /telemetry': 'Ingest telemetry data (VM agents)',
+            'POST /telemetry/batch': 'Ingest a JSON array or NDJSON of telemetry records (VM agents)',
+            'GET /telemetry/persistence': 'Write-behind persistence queue metrics (users)',
+            'GET /supabase/pool': 'Supabase connection pool metrics (users)',
             'GET /trust_score': 'Get trust score for a session (users)',
             'POST /generate_synthetic_telemetry': 'Generate and process synthetic telemetry data (users)',
             'POST /test_sample_data': 'Test with sample CICIDS2017 data (users)',
@@ -93,58 +100,106 @@ def ingest_telemetry():
     telemetry_data['vm_agent_id'] = request.current_user.email
     telemetry_data['ingestion_timestamp'] = datetime.utcnow().isoformat()
 
-    stride_mapping = map_to_stride(telemetry_data)
-    supabase = get_supabase_client()
+    rows = build_telemetry_rows(telemetry_data)
+    stride_mapping = rows['stride']
+    data = rows['telemetry']
+    trust_data = rows['trust']
+    trust_score, mfa_required = trust_data['trust_score'], trust_data['mfa_required']
+
+    if Config.PERSISTENCE_WRITE_BEHIND:
+        # Answer now; Supabase and Elasticsearch writes are batched in the background
+        try:
+            persistence_queue.submit_many(persistence_items([data], [trust_data]))
+        except QueueFullError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 503, {'Retry-After': '1'}
+    else:
+        supabase = get_supabase_client()
+
+        supabase.table('TelemetryData').insert(data).execute()
+        # Enhanced Elasticsearch indexing
+        try:
+            elasticsearch_integration.index_telemetry(data)
+        except Exception as es_exc:
+            print(f"[Elasticsearch] Telemetry indexing failed: {es_exc}")
+
+        supabase.table('TrustScore').insert(trust_data).execute()
+        # Index trust score to Elasticsearch
+        try:
+            elasticsearch_integration.index_trust_score(trust_data)
+        except Exception as es_exc:
+            print(f"[Elasticsearch] TrustScore indexing failed: {es_exc}")
+
+    # Labelled telemetry keeps the online models fresh between full retrains
+    if Config.ML_ONLINE_LEARNING and 'Label' in data['features']:
+        from app.online_learning import online_learner
+        online_learner.add_samples([data['features']])
 
-    # Compose the data to insert
-    data = {
-        'vm_id': telemetry_data.get('vm_id'),
-        'vm_agent_id': telemetry_data.get('vm_agent_id'),
-        'timestamp': datetime.utcnow().isoformat(),
-        'event_type': telemetry_data.get('event_type'),
+    return jsonify({
+        'status': 'success',
+        'session_id': telemetry_data.get('session_id'),
         'stride_category': stride_mapping['stride_category'],
         'risk_level': stride_mapping['risk_level'],
-        'features': {k: v for k, v in telemetry_data.items()
-                    if k not in ['vm_id', 'vm_agent_id', 'event_type', 'timestamp', 'ingestion_timestamp']}
-    }
+        'trust_score': trust_score,
+        'mfa_required': mfa_required
+    })
 
-    supabase.table('TelemetryData').insert(data).execute()
-    # Enhanced Elasticsearch indexing
+@bp.route('/telemetry/batch', methods=['POST'])
+@require_vm_agent
+def ingest_telemetry_batch():
+    """
+    Ingest many telemetry records from a VM agent in one request
+    Body: JSON array, {"records": [...]}, or NDJSON (application/x-ndjson)
+    """
     try:
-        elasticsearch_integration.index_telemetry(data)
-    except Exception as es_exc:
-        print(f"[Elasticsearch] Telemetry indexing failed: {es_exc}")
+        records, parse_errors = parse_telemetry_batch(request.get_data(), request.content_type)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
 
-    # Calculate and store trust score
-    trust_score, mfa_required = calculate_trust_score(
-        stride_mapping['risk_level'],
-        stride_mapping['stride_category'],
-        telemetry_data
-    )
+    if len(records) > Config.TELEMETRY_BATCH_MAX_RECORDS:
+        return jsonify({
+            'status': 'error',
+            'message': f'Batch of {len(records)} records exceeds the limit of {Config.TELEMETRY_BATCH_MAX_RECORDS}'
+        }), 413
 
-    trust_data = {
-        'session_id': telemetry_data.get('session_id'),
-        'vm_id': telemetry_data.get('vm_id'),
-        'vm_agent_id': telemetry_data.get('vm_agent_id'),
-        'timestamp': datetime.utcnow().isoformat(),
-        'trust_score': trust_score,
-        'mfa_required': mfa_required
-    }
+    # Labelled records keep the online models fresh between full retrains
+    online = None
+    if Config.ML_ONLINE_LEARNING:
+        from app.online_learning import online_learner as online
 
-    supabase.table('TrustScore').insert(trust_data).execute()
-    # Index trust score to Elasticsearch
+    write_behind = Config.PERSISTENCE_WRITE_BEHIND
     try:
-        elasticsearch_integration.index_trust_score(trust_data)
-    except Exception as es_exc:
-        print(f"[Elasticsearch] TrustScore indexing failed: {es_exc}")
+        summary = ingest_telemetry_records(
+            records,
+            vm_agent_id=request.current_user.email,
+            supabase=None if write_behind else get_supabase_client(),
+            es_integration=elasticsearch_integration,
+            parse_errors=parse_errors,
+            online_learner=online,
+            write_queue=persistence_queue if write_behind else None
+        )
+    except QueueFullError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503, {'Retry-After': '1'}
+
+    status_code = 200 if summary['failed_records'] == 0 else 207
+    return jsonify({'status': 'success' if status_code == 200 else 'partial', **summary}), status_code
 
+@bp.route('/telemetry/persistence', methods=['GET'])
+@require_auth
+def get_persistence_metrics():
+    """Write-behind queue depth, utilization, retries and dead-letter counts"""
     return jsonify({
         'status': 'success',
-        'session_id': telemetry_data.get('session_id'),
-        'stride_category': stride_mapping['stride_category'],
-        'risk_level': stride_mapping['risk_level'],
-        'trust_score': trust_score,
-        'mfa_required': mfa_required
+        'write_behind': Config.PERSISTENCE_WRITE_BEHIND,
+        'queue': persistence_queue.metrics()
+    })
+
+@bp.route('/supabase/pool', methods=['GET'])
+@require_auth
+def get_supabase_pool_metrics():
+    """Supabase connection pool utilization and request counters for this worker process"""
+    return jsonify({
+        'status': 'success',
+        'pool': supabase_pool.metrics()
     })
 
 @bp.route('/trust_score', methods=['GET'])
@@ -372,6 +427,7 @@ def process_wazuh_alerts():
         alerts = wazuh_integration.get_alerts(agent_id=agent_id, limit=limit)
         processed_count = 0
         telemetry_results = []
+        supabase = get_supabase_client()
         for alert in alerts:
             telemetry = wazuh_integration.convert_wazuh_alert_to_telemetry(alert)
             if telemetry:
@@ -381,7 +437,6 @@ def process_wazuh_alerts():
                     stride_mapping['stride_category'],
                     telemetry
                 )
-                supabase = get_supabase_client()
                 telemetry_data = {
                     'vm_id': telemetry.get('vm_id'),
                     'vm_agent_id': 'wazuh-agent',
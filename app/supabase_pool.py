@@ -0,0 +1,196 @@
+"""
+Pooled Supabase Client
+One Supabase client per process on a shared keep-alive httpx connection pool,
+rebuilt after fork so worker processes never share sockets with their parent
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+from supabase import Client, ClientOptions, create_client
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class _MeteredTransport(httpx.BaseTransport):
+    """HTTP transport that counts requests in flight and failed requests"""
+
+    def __init__(self, pool: 'SupabaseClientPool', transport: httpx.BaseTransport):
+        self.pool = pool
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.pool._request_started()
+        failed = True
+        try:
+            response = self.transport.handle_request(request)
+            failed = False
+            return response
+        finally:
+            self.pool._request_finished(failed)
+
+    def close(self):
+        self.transport.close()
+
+
+class SupabaseClientPool:
+    """
+    Process-wide Supabase client backed by one pooled httpx.Client
+
+    Connections (and their TLS sessions) are kept alive and reused across
+    requests and threads instead of being set up by a new client on every
+    get_supabase_client() call. After os.fork() the child drops the parent's
+    client without closing it and lazily builds its own; a pid check covers
+    forks that bypass the os.register_at_fork hooks.
+    """
+
+    def __init__(self, url: str, key: str, max_connections: int = 20,
+                 max_keepalive_connections: int = 10, keepalive_expiry: float = 30.0,
+                 timeout: float = 30.0, http2: bool = True,
+                 transport: Optional[httpx.BaseTransport] = None):
+        self.url = url
+        self.key = key
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.http2 = http2
+        self._transport_override = transport
+
+        self._lock = threading.Lock()
+        self._client = None
+        self._http = None
+        self._inner_transport = None
+        self._pid = os.getpid()
+        # Clients inherited across fork: kept referenced so garbage collection
+        # never closes connections that belong to the parent process
+        self._abandoned = []
+        self._reset_stats()
+
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+
+    def _reset_stats(self):
+        self.stats = {
+            'clients_created': 0,
+            'checkouts': 0,
+            'requests': 0,
+            'failed_requests': 0,
+            'in_flight': 0,
+            'max_in_flight': 0,
+            'forks_detected': 0,
+            'created_at': None
+        }
+
+    def get_client(self) -> Client:
+        """The process's Supabase client, created on first use"""
+        if self._pid != os.getpid():
+            self._after_fork_in_child()
+        with self._lock:
+            if self._client is None:
+                self._client = self._build_client()
+            self.stats['checkouts'] += 1
+            return self._client
+
+    def _build_client(self) -> Client:
+        if self._transport_override is not None:
+            inner = self._transport_override
+        else:
+            inner = httpx.HTTPTransport(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                )
+            )
+        self._inner_transport = inner
+        self._http = httpx.Client(
+            transport=_MeteredTransport(self, inner),
+            timeout=httpx.Timeout(self.timeout),
+            follow_redirects=True
+        )
+        client = create_client(self.url, self.key, options=ClientOptions(httpx_client=self._http))
+        self.stats['clients_created'] += 1
+        self.stats['created_at'] = time.time()
+        logger.info(f"🔌 Supabase client pool ready (pid {os.getpid()}, "
+                    f"{self.max_connections} connections, HTTP/2 {'on' if self.http2 else 'off'})")
+        return client
+
+    def _after_fork_in_child(self):
+        if self._http is not None:
+            self._abandoned.append(self._http)
+        self._lock = threading.Lock()
+        self._client = None
+        self._http = None
+        self._inner_transport = None
+        self._pid = os.getpid()
+        forks = self.stats['forks_detected'] + 1
+        self._reset_stats()
+        self.stats['forks_detected'] = forks
+
+    def _request_started(self):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['in_flight'] += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+
+    def _request_finished(self, failed: bool):
+        with self._lock:
+            self.stats['in_flight'] -= 1
+            if failed:
+                self.stats['failed_requests'] += 1
+
+    def _connection_counts(self) -> Optional[Dict[str, int]]:
+        """Open/idle connections of the underlying httpcore pool, if it can be inspected"""
+        connections = getattr(getattr(self._inner_transport, '_pool', None), 'connections', None)
+        if connections is None:
+            return None
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {'open': len(connections), 'idle': idle, 'active': len(connections) - idle}
+
+    def metrics(self) -> Dict[str, Any]:
+        """Checkouts, request counters and connection pool utilization"""
+        with self._lock:
+            stats = dict(self.stats)
+        connections = self._connection_counts()
+        active = connections['active'] if connections else stats['in_flight']
+        return {
+            **stats,
+            'pid': self._pid,
+            'initialized': self._client is not None,
+            'max_connections': self.max_connections,
+            'max_keepalive_connections': self.max_keepalive_connections,
+            'keepalive_expiry': self.keepalive_expiry,
+            'http2': self.http2,
+            'connections': connections,
+            'utilization': active / self.max_connections if self.max_connections else 0.0,
+            'requests_per_client': stats['requests'] / max(stats['clients_created'], 1)
+        }
+
+    def close(self):
+        """Close the pooled connections (the next get_client() builds a new client)"""
+        with self._lock:
+            if self._http is not None:
+                self._http.close()
+            self._client = None
+            self._http = None
+            self._inner_transport = None
+
+
+# Global Supabase client pool (get_supabase_client() in app/utils.py hands out its client)
+supabase_pool = SupabaseClientPool(
+    Config.SUPABASE_URL,
+    Config.SUPABASE_API_KEY,
+    max_connections=Config.SUPABASE_POOL_MAX_CONNECTIONS,
+    max_keepalive_connections=Config.SUPABASE_POOL_MAX_KEEPALIVE,
+    keepalive_expiry=Config.SUPABASE_POOL_KEEPALIVE_EXPIRY,
+    timeout=Config.SUPABASE_TIMEOUT,
+    http2=Config.SUPABASE_HTTP2
+)
@@ -0,0 +1,183 @@
+"""
+Vectorized Synthetic CICIDS2017 Data Generator
+Builds load-test datasets column by column from the sample flow template,
+as DataFrames or streamed Parquet / NPY shards
+"""
+
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List, Optional
+
+from app.data_loader import NON_FEATURE_FIELDS, LABEL_COLUMN
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_TEMPLATE_PATH = "data/sample_cicids2017_data.json"
+
+# Common initial TCP window sizes and how often they occur
+WINDOW_SIZE_FEATURES = ('Init_Win_bytes_forward', 'Init_Win_bytes_backward')
+WINDOW_SIZES = np.array([0, 65535, 32768, 8192])
+WINDOW_SIZE_PROBABILITIES = np.array([0.1, 0.5, 0.3, 0.1])
+
+# Label mix of the original sample loaders
+BINARY_LABEL_MIX = {'BENIGN': 0.8, 'MALICIOUS': 0.2}
+
+# Class frequencies of the full CICIDS2017 MachineLearningCVE release
+CICIDS2017_LABEL_MIX = {
+    'BENIGN': 0.8030,
+    'DoS Hulk': 0.0816,
+    'PortScan': 0.0561,
+    'DDoS': 0.0452,
+    'DoS GoldenEye': 0.0036,
+    'FTP-Patator': 0.0028,
+    'SSH-Patator': 0.0021,
+    'DoS slowloris': 0.0020,
+    'DoS Slowhttptest': 0.0019,
+    'Bot': 0.0007,
+    'Web Attack – Brute Force': 0.0005,
+    'Web Attack – XSS': 0.0002,
+    'Infiltration': 0.00001,
+    'Web Attack – Sql Injection': 0.00001,
+    'Heartbleed': 0.00001
+}
+
+# How each feature varies around its template value
+VARIATION_STYLES = ('sampled', 'gaussian')
+
+
+def load_feature_template(path: str = SAMPLE_TEMPLATE_PATH) -> Dict:
+    """Feature values of a single CICIDS2017 flow, without metadata fields"""
+    with open(path, 'r') as f:
+        sample = json.load(f)
+    return {k: v for k, v in sample.items() if k not in NON_FEATURE_FIELDS}
+
+
+class SyntheticFlowGenerator:
+    """
+    Generates CICIDS2017-shaped flows around a template flow
+
+    Every feature column is drawn in one NumPy call:
+      - 'sampled': window sizes categorical, counts/flags Poisson, Duration/IAT
+        exponential, everything else the template value scaled by U(0.7, 1.3)
+      - 'gaussian': window sizes categorical, counts/flags the template value
+        plus N(0, 1) truncated to integers, everything else scaled by N(1, 0.2)
+    Output is deterministic for a given seed and chunk size.
+    """
+
+    def __init__(self, template: Optional[Dict] = None, label_mix: Optional[Dict[str, float]] = None,
+                 seed: Optional[int] = 42, variation: str = 'sampled'):
+        if variation not in VARIATION_STYLES:
+            raise ValueError(f"Unknown variation style '{variation}'. Choose from {VARIATION_STYLES}")
+
+        self.template = template if template is not None else load_feature_template()
+        self.variation = variation
+        self.seed = seed
+
+        label_mix = label_mix or BINARY_LABEL_MIX
+        weights = np.array(list(label_mix.values()), dtype=np.float64)
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Label mix weights must be non-negative and not all zero")
+        self.labels = np.array(list(label_mix.keys()), dtype=object)
+        self.label_probabilities = weights / weights.sum()
+
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def feature_names(self) -> List[str]:
+        return list(self.template.keys())
+
+    def _generate_column(self, feature: str, base_value, n_rows: int) -> np.ndarray:
+        rng = self._rng
+        if not isinstance(base_value, (int, float)) or isinstance(base_value, bool):
+            return np.full(n_rows, base_value, dtype=object)
+
+        if feature in WINDOW_SIZE_FEATURES:
+            return rng.choice(WINDOW_SIZES, size=n_rows, p=WINDOW_SIZE_PROBABILITIES)
+
+        is_count = 'Count' in feature or 'Flags' in feature
+        if self.variation == 'sampled':
+            if is_count:
+                return rng.poisson(lam=max(1, abs(base_value)), size=n_rows)
+            if 'Duration' in feature or 'IAT' in feature:
+                return rng.exponential(scale=max(0.001, abs(base_value)), size=n_rows)
+            return np.maximum(0, base_value * rng.uniform(0.7, 1.3, size=n_rows))
+
+        if is_count:
+            # int() truncation toward zero, as the row-wise loader did
+            return np.maximum(0, np.trunc(base_value + rng.normal(0, 1, size=n_rows))).astype(np.int64)
+        return np.maximum(0, base_value * rng.normal(1, 0.2, size=n_rows))
+
+    def generate(self, n_rows: int, dtype=None) -> pd.DataFrame:
+        """
+        Generate n_rows flows with a Label column
+
+        Args:
+            n_rows: Number of rows
+            dtype: Optional dtype for every numeric feature (e.g. np.float32);
+                   by default counts stay integer and the rest float64
+        """
+        columns = {}
+        for feature, base_value in self.template.items():
+            column = self._generate_column(feature, base_value, n_rows)
+            if dtype is not None and column.dtype != object:
+                column = column.astype(dtype, copy=False)
+            columns[feature] = column
+        columns[LABEL_COLUMN] = self._rng.choice(self.labels, size=n_rows, p=self.label_probabilities)
+        return pd.DataFrame(columns)
+
+    def iter_chunks(self, n_rows: int, chunk_size: int = 100000, dtype=None) -> Iterator[pd.DataFrame]:
+        """Generate n_rows flows in DataFrames of at most chunk_size rows"""
+        for start in range(0, n_rows, chunk_size):
+            yield self.generate(min(chunk_size, n_rows - start), dtype=dtype)
+
+    def write_shards(self, directory: str, n_rows: int, shard_rows: int = 1000000,
+                     shard_format: str = 'parquet', prefix: str = 'cicids2017_synthetic') -> List[str]:
+        """
+        Stream n_rows flows to disk one shard at a time
+
+        Args:
+            directory: Output directory
+            n_rows: Total rows
+            shard_rows: Rows per shard; only one shard is held in memory
+            shard_format: 'parquet' (readable by app.data_loader) or 'npy'
+                          (float32 feature matrix plus a label array per shard,
+                          with feature order in <prefix>_features.json)
+            prefix: Shard file name prefix
+
+        Returns:
+            List of written file paths
+        """
+        if shard_format not in ('parquet', 'npy'):
+            raise ValueError(f"Unknown shard format '{shard_format}'. Choose 'parquet' or 'npy'")
+        os.makedirs(directory, exist_ok=True)
+
+        paths = []
+        for index, chunk in enumerate(self.iter_chunks(n_rows, shard_rows, dtype=np.float32)):
+            base = os.path.join(directory, f"{prefix}_{index:05d}")
+            if shard_format == 'parquet':
+                chunk.to_parquet(f"{base}.parquet", index=False)
+                paths.append(f"{base}.parquet")
+            else:
+                features = chunk.drop(columns=[LABEL_COLUMN])
+                np.save(f"{base}_X.npy", np.ascontiguousarray(features.to_numpy(dtype=np.float32)))
+                np.save(f"{base}_y.npy", chunk[LABEL_COLUMN].to_numpy(dtype=str))
+                paths.extend([f"{base}_X.npy", f"{base}_y.npy"])
+            logger.info(f"💾 Wrote synthetic shard {index} ({len(chunk)} rows)")
+
+        if shard_format == 'npy':
+            features_path = os.path.join(directory, f"{prefix}_features.json")
+            with open(features_path, 'w') as f:
+                json.dump(self.feature_names, f)
+            paths.append(features_path)
+        return paths
+
+
+def generate_cicids2017_data(n_rows: int = 1000, label_mix: Optional[Dict[str, float]] = None,
+                             seed: Optional[int] = 42, variation: str = 'sampled',
+                             template_path: str = SAMPLE_TEMPLATE_PATH, dtype=None) -> pd.DataFrame:
+    """Synthetic CICIDS2017 DataFrame around the sample flow template"""
+    generator = SyntheticFlowGenerator(load_feature_template(template_path), label_mix, seed, variation)
+    return generator.generate(n_rows, dtype=dtype)
@@ -1,51 +1,78 @@
+import numpy as np
+
+from app.feature_schema import NUM_FEATURES, feature_values, row_means
+
+# STRIDE thresholds on the telemetry feature values
+DOS_AVERAGE_THRESHOLD = 80
+ELEVATION_MAX_THRESHOLD = 90
+DISCLOSURE_AVERAGE_THRESHOLD = 60
+
+# STRIDE rules in priority order: (category, risk level); the last always matches
+STRIDE_RULES = (
+    ('Denial of Service', 5),         # average feature value > 80
+    ('Elevation of Privilege', 4),    # largest feature value > 90
+    ('Spoofing', 3),                  # failed login event
+    ('Information Disclosure', 3),    # average feature value > 60
+    ('Unknown', 1),
+)
+_STRIDE_CATEGORIES = np.array([category for category, _ in STRIDE_RULES], dtype=object)
+_STRIDE_RISK_LEVELS = np.array([risk for _, risk in STRIDE_RULES])
+
+
 # ... Function to process telemetry data and map to STRIDE ...
 def map_to_stride(telemetry_data):
-    # Real CICIDS2017 feature names (replace with actual names from your dataset)
-    real_feature_names = [
-        'Flow Duration', 'Total Fwd Packets', 'Total Backward Packets',
-        'Total Length of Fwd Packets', 'Total Length of Bwd Packets',
-        'Fwd Packet Length Max', 'Fwd Packet Length Min', 'Fwd Packet Length Mean',
-        'Fwd Packet Length Std', 'Bwd Packet Length Max', 'Bwd Packet Length Min',
-        'Bwd Packet Length Mean', 'Bwd Packet Length Std', 'Flow Bytes/s',
-        'Flow Packets/s', 'Flow IAT Mean', 'Flow IAT Std', 'Flow IAT Max',
-        'Flow IAT Min', 'Fwd IAT Total', 'Fwd IAT Mean', 'Fwd IAT Std',
-        'Fwd IAT Max', 'Fwd IAT Min', 'Bwd IAT Total', 'Bwd IAT Mean',
-        'Bwd IAT Std', 'Bwd IAT Max', 'Bwd IAT Min', 'Fwd PSH Flags',
-        'Bwd PSH Flags', 'Fwd URG Flags', 'Bwd URG Flags', 'Fwd Header Length',
-        'Bwd Header Length', 'Fwd Packets/s', 'Bwd Packets/s', 'Min Packet Length',
-        'Max Packet Length', 'Packet Length Mean', 'Packet Length Std',
-        'Packet Length Variance', 'FIN Flag Count', 'SYN Flag Count',
-        'RST Flag Count', 'PSH Flag Count', 'ACK Flag Count', 'URG Flag Count',
-        'CWE Flag Count', 'ECE Flag Count', 'Down/Up Ratio', 'Average Packet Size',
-        'Avg Fwd Segment Size', 'Avg Bwd Segment Size', 'Fwd Header Length.1',
-        'Fwd Avg Bytes/Bulk', 'Fwd Avg Packets/Bulk', 'Fwd Avg Bulk Rate',
-        'Bwd Avg Bytes/Bulk', 'Bwd Avg Packets/Bulk', 'Bwd Avg Bulk Rate',
-        'Subflow Fwd Packets', 'Subflow Fwd Bytes', 'Subflow Bwd Packets',
-        'Subflow Bwd Bytes', 'Init_Win_bytes_forward', 'Init_Win_bytes_backward',
-        'act_data_pkt_fwd', 'min_seg_size_forward'
-    ]
-    
     # Extract real features from telemetry data
-    features = {name: telemetry_data.get(name, 0) for name in real_feature_names}
-    
+    values = feature_values(telemetry_data)
+
     # Simple heuristic: analyze feature patterns to determine threat
-    avg_feature_value = sum(features.values()) / len(features)
-    max_feature_value = max(features.values())
-    
+    avg_feature_value = sum(values) / NUM_FEATURES
+    max_feature_value = max(values)
+
     # Determine STRIDE category based on feature patterns
-    if avg_feature_value > 80:
+    if avg_feature_value > DOS_AVERAGE_THRESHOLD:
         stride_category = 'Denial of Service'
         risk_level = 5
-    elif max_feature_value > 90:
+    elif max_feature_value > ELEVATION_MAX_THRESHOLD:
         stride_category = 'Elevation of Privilege'
         risk_level = 4
     elif telemetry_data.get('event_type') == 'login_failed':
         stride_category = 'Spoofing'
         risk_level = 3
-    elif avg_feature_value > 60:
+    elif avg_feature_value > DISCLOSURE_AVERAGE_THRESHOLD:
         stride_category = 'Information Disclosure'
         risk_level = 3
     else:
         stride_category = 'Unknown'
         risk_level = 1
     return {'stride_category': stride_category, 'risk_level': risk_level}
+
+
+def stride_from_features(features, event_types=None):
+    """
+    map_to_stride for every row of a feature matrix in one pass
+
+    Args:
+        features: (n_records, NUM_FEATURES) matrix from app.feature_schema,
+                  or one record's feature vector
+        event_types: Each record's 'event_type' (optional)
+
+    Returns:
+        (stride_categories, risk_levels) arrays
+    """
+    features = np.atleast_2d(features)
+    n_records = len(features)
+    avg_feature_value = row_means(features)
+    # max() skips NaN unless it is the first value; only the threshold test matters here
+    exceeds_max = ((np.fmax.reduce(features, axis=1) > ELEVATION_MAX_THRESHOLD)
+                   & ~np.isnan(features[:, 0]))
+    if event_types is None:
+        login_failed = np.zeros(n_records, dtype=bool)
+    else:
+        login_failed = np.fromiter((event_type == 'login_failed' for event_type in event_types),
+                                   dtype=bool, count=n_records)
+
+    # First matching rule per record
+    matches = np.stack([avg_feature_value > DOS_AVERAGE_THRESHOLD, exceeds_max, login_failed,
+                        avg_feature_value > DISCLOSURE_AVERAGE_THRESHOLD, np.ones(n_records, dtype=bool)])
+    rules = matches.argmax(axis=0)
+    return _STRIDE_CATEGORIES[rules], _STRIDE_RISK_LEVELS[rules]
@@ -0,0 +1,265 @@
+"""
+Batched Telemetry Ingestion for VM Agents
+Parses JSON arrays or NDJSON of telemetry records, scores them in one pass and
+writes them with bulk Supabase inserts and Elasticsearch bulk requests
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.feature_schema import feature_matrix
+from app.telemetry import map_to_stride, stride_from_features
+from app.turest_score import calculate_trust_score, trust_scores_from_features
+
+logger = logging.getLogger(__name__)
+
+# Record keys stored as columns rather than in the 'features' JSON
+TELEMETRY_METADATA_FIELDS = ('vm_id', 'vm_agent_id', 'event_type', 'timestamp', 'ingestion_timestamp')
+
+# Rows per Supabase insert request
+SUPABASE_INSERT_CHUNK_SIZE = 1000
+
+# Content types read as newline-delimited JSON
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonlines')
+
+
+def parse_telemetry_batch(body: bytes, content_type: Optional[str] = None) -> Tuple[List[Any], Dict[int, str]]:
+    """
+    Records of a batch request body
+
+    Accepts a JSON array, a JSON object with a 'records' array, or NDJSON
+    (one record per line; selected by content type, or when the body is
+    not a single JSON document).
+
+    Returns:
+        Tuple of (records, parse errors by record index). Records that
+        failed to parse are None.
+
+    Raises:
+        ValueError: If the body holds no records
+    """
+    text = body.decode('utf-8') if isinstance(body, bytes) else body
+    mime = (content_type or '').split(';')[0].strip().lower()
+
+    if mime not in NDJSON_CONTENT_TYPES:
+        try:
+            document = json.loads(text)
+        except ValueError:
+            document = None
+        else:
+            if isinstance(document, dict) and 'records' in document:
+                document = document['records']
+            if not isinstance(document, list):
+                raise ValueError("Expected a JSON array of records, {\"records\": [...]}, or NDJSON")
+            if not document:
+                raise ValueError("No telemetry records in request body")
+            errors = {i: "Record must be a JSON object" for i, record in enumerate(document)
+                      if not isinstance(record, dict)}
+            return [None if i in errors else record for i, record in enumerate(document)], errors
+
+    records, errors = [], {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Record must be a JSON object")
+        except ValueError as e:
+            errors[len(records)] = f"Invalid NDJSON line: {e}"
+            record = None
+        records.append(record)
+
+    if not records:
+        raise ValueError("No telemetry records in request body")
+    return records, errors
+
+
+def build_telemetry_rows(telemetry_data: Dict) -> Dict[str, Any]:
+    """
+    Score one telemetry record and compose its TelemetryData and TrustScore rows
+    The record must already carry 'vm_agent_id' and 'ingestion_timestamp'.
+    """
+    stride_mapping = map_to_stride(telemetry_data)
+    trust_score, mfa_required = calculate_trust_score(
+        stride_mapping['risk_level'],
+        stride_mapping['stride_category'],
+        telemetry_data
+    )
+    return _compose_rows(telemetry_data, stride_mapping, trust_score, mfa_required,
+                         datetime.utcnow().isoformat())
+
+
+def score_telemetry_records(records: List[Dict]) -> Tuple[List[Optional[Dict[str, Any]]], Dict[int, str]]:
+    """
+    build_telemetry_rows for many records, scored as one feature matrix
+
+    Returns:
+        Tuple of (rows per record, scoring errors by record index); records
+        that could not be scored have None rows
+    """
+    features, errors = feature_matrix(records)
+    stride_categories, risk_levels = stride_from_features(features, [r.get('event_type') for r in records])
+    trust_scores, mfa_required = trust_scores_from_features(risk_levels, features)
+    now = datetime.utcnow().isoformat()
+
+    rows = []
+    for i, (record, category, risk_level, trust_score, mfa) in enumerate(zip(
+            records, stride_categories.tolist(), risk_levels.tolist(),
+            trust_scores.tolist(), mfa_required.tolist())):
+        if i in errors:
+            rows.append(None)
+            continue
+        stride_mapping = {'stride_category': category, 'risk_level': risk_level}
+        rows.append(_compose_rows(record, stride_mapping, trust_score, mfa, now))
+    return rows, errors
+
+
+def _compose_rows(telemetry_data: Dict, stride_mapping: Dict, trust_score, mfa_required: bool,
+                  now: str) -> Dict[str, Any]:
+    telemetry_row = {
+        'vm_id': telemetry_data.get('vm_id'),
+        'vm_agent_id': telemetry_data.get('vm_agent_id'),
+        'timestamp': now,
+        'event_type': telemetry_data.get('event_type'),
+        'stride_category': stride_mapping['stride_category'],
+        'risk_level': stride_mapping['risk_level'],
+        'features': {k: v for k, v in telemetry_data.items() if k not in TELEMETRY_METADATA_FIELDS}
+    }
+
+    trust_row = {
+        'session_id': telemetry_data.get('session_id'),
+        'vm_id': telemetry_data.get('vm_id'),
+        'vm_agent_id': telemetry_data.get('vm_agent_id'),
+        'timestamp': now,
+        'trust_score': trust_score,
+        'mfa_required': mfa_required
+    }
+
+    return {'telemetry': telemetry_row, 'trust': trust_row, 'stride': stride_mapping}
+
+
+def persistence_items(telemetry_rows: List[Dict], trust_rows: List[Dict]) -> List[Tuple[str, Dict]]:
+    """(kind, document) pairs for the write-behind queue: Supabase rows and their Elasticsearch copies"""
+    items = [('TelemetryData', row) for row in telemetry_rows]
+    items += [('TrustScore', row) for row in trust_rows]
+    items += [('es:telemetrydata', row) for row in telemetry_rows]
+    items += [('es:trustscore', row) for row in trust_rows]
+    return items
+
+
+def _bulk_insert(supabase, table: str, rows: List[Dict], chunk_size: int) -> List[Optional[str]]:
+    """Insert rows in chunks; returns an error message (or None) per row"""
+    errors: List[Optional[str]] = [None] * len(rows)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            supabase.table(table).insert(chunk).execute()
+        except Exception as e:
+            logger.error(f"❌ Bulk insert of {len(chunk)} rows into {table} failed: {str(e)}")
+            errors[start:start + len(chunk)] = [f"{table} insert failed: {str(e)}"] * len(chunk)
+    return errors
+
+
+def ingest_telemetry_records(records: List[Optional[Dict]], vm_agent_id: str, supabase,
+                           es_integration=None, parse_errors: Optional[Dict[int, str]] = None,
+                           online_learner=None, write_queue=None,
+                           chunk_size: int = SUPABASE_INSERT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Score and store a batch of telemetry records
+
+    Args:
+        records: Telemetry dicts (None for records that failed to parse)
+        vm_agent_id: Identity of the submitting VM agent
+        supabase: Supabase client for the TelemetryData/TrustScore bulk inserts
+        es_integration: ElasticsearchIntegration for bulk indexing (optional)
+        parse_errors: Errors by record index from parse_telemetry_batch
+        online_learner: Receives the features of stored records that carry a 'Label'
+        write_queue: PersistenceQueue to hand the writes to instead of writing them
+                     here (raises QueueFullError if it has no room for the batch)
+
+    Returns:
+        Per-record results in request order plus success/failure counts
+    """
+    parse_errors = parse_errors or {}
+    ingestion_timestamp = datetime.utcnow().isoformat()
+    results: List[Dict] = [None] * len(records)
+    scored = []
+
+    # Score every parsed record as one feature matrix
+    indices, telemetry = [], []
+    for i, record in enumerate(records):
+        if i in parse_errors or record is None:
+            results[i] = {'index': i, 'status': 'error', 'error': parse_errors.get(i, "Empty record")}
+            continue
+        telemetry_data = dict(record)
+        telemetry_data['vm_agent_id'] = vm_agent_id
+        telemetry_data['ingestion_timestamp'] = ingestion_timestamp
+        indices.append(i)
+        telemetry.append(telemetry_data)
+
+    scored_rows, scoring_errors = score_telemetry_records(telemetry)
+    for position, (i, rows) in enumerate(zip(indices, scored_rows)):
+        if rows is None:
+            results[i] = {'index': i, 'status': 'error',
+                          'error': f"Scoring failed: {scoring_errors[position]}"}
+            continue
+        scored.append((i, rows))
+        results[i] = {
+            'index': i,
+            'status': 'success',
+            'session_id': rows['trust']['session_id'],
+            'stride_category': rows['stride']['stride_category'],
+            'risk_level': rows['stride']['risk_level'],
+            'trust_score': rows['trust']['trust_score'],
+            'mfa_required': rows['trust']['mfa_required']
+        }
+
+    telemetry_rows = [rows['telemetry'] for _, rows in scored]
+    trust_rows = [rows['trust'] for _, rows in scored]
+
+    # Write-behind: queue every write at once and answer without waiting for storage
+    if write_queue is not None:
+        if scored:
+            write_queue.submit_many(persistence_items(telemetry_rows, trust_rows))
+    # Bulk writes: a failed chunk fails only the records in it. Trust scores are
+    # inserted only for stored telemetry, so a failed chunk leaves no orphaned rows
+    elif scored:
+        telemetry_errors = _bulk_insert(supabase, 'TelemetryData', telemetry_rows, chunk_size)
+        stored = [position for position, error in enumerate(telemetry_errors) if error is None]
+        trust_errors = _bulk_insert(supabase, 'TrustScore', [trust_rows[position] for position in stored],
+                                    chunk_size)
+        storage_errors = [f"{error}; TrustScore not stored" if error else None for error in telemetry_errors]
+        for position, trust_error in zip(stored, trust_errors):
+            storage_errors[position] = trust_error
+        for (i, _), storage_error in zip(scored, storage_errors):
+            if storage_error:
+                results[i]['status'] = 'error'
+                results[i]['error'] = storage_error
+
+    # Elasticsearch indexing stays best-effort, as for single records
+    indexed = None
+    if es_integration is not None and write_queue is None and scored:
+        telemetry_indexed = es_integration.bulk_index_documents(telemetry_rows, 'telemetrydata')
+        trust_indexed = es_integration.bulk_index_documents(trust_rows, 'trustscore')
+        for (i, _), telemetry_ok, trust_ok in zip(scored, telemetry_indexed, trust_indexed):
+            results[i]['indexed'] = telemetry_ok and trust_ok
+        indexed = sum(1 for (i, _) in scored if results[i]['indexed'])
+
+    if online_learner is not None:
+        labelled = [rows['telemetry']['features'] for i, rows in scored
+                    if results[i]['status'] == 'success' and 'Label' in rows['telemetry']['features']]
+        if labelled:
+            online_learner.add_samples(labelled)
+
+    succeeded = sum(1 for result in results if result['status'] == 'success')
+    return {
+        'total_records': len(records),
+        'successful_records': succeeded,
+        'failed_records': len(records) - succeeded,
+        'indexed_records': indexed,
+        'persistence': 'queued' if write_queue is not None else 'written',
+        'results': results
+    }
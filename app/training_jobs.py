@@ -0,0 +1,195 @@
+"""
+Background Training Jobs for the Trust Score ML Engine
+Runs model training outside the request thread and tracks per-classifier progress
+"""
+
+import uuid
+import time
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job-level stages, in order
+JOB_STAGES = ('queued', 'loading_data', 'training', 'saving', 'completed', 'failed')
+
+# Per-classifier stages; 'queued' classifiers wait for a process-pool worker
+CLASSIFIER_STAGES = ('pending', 'queued', 'training', 'completed', 'failed')
+
+
+class TrainingJob:
+    """State and progress of one background training run"""
+
+    def __init__(self, config: Dict, classifier_names: List[str],
+                 expected_durations: Optional[Dict[str, float]] = None):
+        self.job_id = uuid.uuid4().hex
+        self.config = config
+        self.status = 'queued'
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.expected_durations = expected_durations or {}
+        self.classifiers = {
+            name: {'stage': 'pending', 'started': None, 'finished': None}
+            for name in classifier_names
+        }
+        self._lock = threading.Lock()
+
+    def set_stage(self, stage: str):
+        """Move the job to another stage"""
+        if stage not in JOB_STAGES:
+            raise ValueError(f"Unknown job stage: {stage}")
+        with self._lock:
+            self.status = stage
+        logger.info(f"📋 Training job {self.job_id}: {stage}")
+
+    def update_classifier(self, name: str, stage: str):
+        """Progress callback for TrustScoreMLEngine.train_all_classifiers"""
+        if stage not in CLASSIFIER_STAGES:
+            raise ValueError(f"Unknown classifier stage: {stage}")
+        now = time.monotonic()
+        with self._lock:
+            progress = self.classifiers.setdefault(name, {'stage': 'pending', 'started': None, 'finished': None})
+            progress['stage'] = stage
+            if stage == 'training':
+                progress['started'] = now
+            elif stage in ('completed', 'failed'):
+                progress['finished'] = now
+
+    def _classifier_elapsed(self, progress: Dict, now: float) -> Optional[float]:
+        if progress['started'] is None:
+            return None
+        return (progress['finished'] or now) - progress['started']
+
+    def eta_seconds(self, now: float = None) -> Optional[float]:
+        """
+        Estimated seconds until every classifier has finished
+        Uses each classifier's duration in the previous training run, falling
+        back to the mean duration of classifiers already finished in this job.
+        Classifiers are assumed to run one after another, so for parallel
+        training this is an upper bound.
+        """
+        now = now or time.monotonic()
+        with self._lock:
+            finished = [self._classifier_elapsed(p, now) for p in self.classifiers.values()
+                        if p['stage'] in ('completed', 'failed')]
+            fallback = sum(finished) / len(finished) if finished else None
+
+            remaining = 0.0
+            for name, progress in self.classifiers.items():
+                if progress['stage'] in ('completed', 'failed'):
+                    continue
+                expected = self.expected_durations.get(name, fallback)
+                if expected is None:
+                    return None
+                if progress['stage'] == 'training':
+                    expected = max(expected - self._classifier_elapsed(progress, now), 0.0)
+                remaining += expected
+        return remaining
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        """JSON-serializable job status"""
+        now = time.monotonic()
+        finished = self.status in ('completed', 'failed')
+        end = self.finished_at or datetime.utcnow()
+
+        classifiers = {}
+        with self._lock:
+            for name, progress in self.classifiers.items():
+                elapsed = self._classifier_elapsed(progress, now)
+                classifiers[name] = {
+                    'stage': progress['stage'],
+                    'elapsed_seconds': round(elapsed, 3) if elapsed is not None else None
+                }
+
+        completed = sum(1 for p in classifiers.values() if p['stage'] in ('completed', 'failed'))
+        status = {
+            'job_id': self.job_id,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'elapsed_seconds': (end - self.started_at).total_seconds() if self.started_at else 0.0,
+            'progress': completed / len(classifiers) if classifiers else 0.0,
+            'eta_seconds': 0.0 if finished else self.eta_seconds(now),
+            'classifiers': classifiers,
+            'config': self.config,
+            'error': self.error
+        }
+        if include_result:
+            status['result'] = self.result
+        return status
+
+
+class TrainingJobManager:
+    """
+    Queue of background training jobs
+    Jobs run one at a time so two trainings never race on the same engine
+    """
+
+    def __init__(self, max_retained_jobs: int = 50):
+        self.max_retained_jobs = max_retained_jobs
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='training-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, train_fn: Callable[[TrainingJob], Any], config: Dict, classifier_names: List[str],
+               expected_durations: Optional[Dict[str, float]] = None) -> TrainingJob:
+        """
+        Enqueue a training run
+
+        Args:
+            train_fn: Callable receiving the job; it reports progress through
+                      job.set_stage / job.update_classifier and returns the results
+            config: Training configuration echoed in the job status
+            classifier_names: Classifiers whose progress is tracked
+            expected_durations: Seconds per classifier from a previous run, for the ETA
+        """
+        job = TrainingJob(config, classifier_names, expected_durations)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_finished_jobs()
+        self._executor.submit(self._run, job, train_fn)
+        logger.info(f"📋 Queued training job {job.job_id}")
+        return job
+
+    def _run(self, job: TrainingJob, train_fn: Callable[[TrainingJob], Any]):
+        job.started_at = datetime.utcnow()
+        try:
+            job.result = train_fn(job)
+            job.finished_at = datetime.utcnow()
+            job.set_stage('completed')
+        except Exception as e:
+            logger.error(f"❌ Training job {job.job_id} failed: {str(e)}")
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            job.set_stage('failed')
+
+    def _evict_finished_jobs(self):
+        """Drop the oldest finished jobs beyond max_retained_jobs"""
+        excess = len(self._jobs) - self.max_retained_jobs
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.status in ('completed', 'failed')]:
+            if excess <= 0:
+                break
+            del self._jobs[job_id]
+            excess -= 1
+
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        """Look up a job by id"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[TrainingJob]:
+        """All retained jobs, oldest first"""
+        with self._lock:
+            return list(self._jobs.values())
+
+
+# Global training job manager
+training_jobs = TrainingJobManager()
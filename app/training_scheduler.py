@@ -0,0 +1,240 @@
+"""
+Parallel Training Scheduler for the Trust Score ML Engine
+Fits independent classifiers concurrently in a process pool within a core budget,
+sharing the training matrices with workers through shared memory
+"""
+
+import os
+import time
+import queue
+import logging
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+import numpy as np
+from threadpoolctl import threadpool_limits
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Relative share of spare cores for classifiers that parallelize internally
+# (n_jobs for forests, neighbour search and grid searches; BLAS threads for MLP).
+# Classifiers without an entry, such as NaiveBayes, run on a single core.
+CORE_WEIGHTS = {
+    'AdaptiveRandomForest': 4,
+    'AdaptiveKNN': 2,
+    'RandomForest': 2,
+    'KNN': 1,
+    'MLP': 1
+}
+
+# Seconds between checks for classifiers a worker has started on
+PROGRESS_POLL_SECONDS = 0.5
+
+# Shared memory blocks mapped by this worker process, by block name
+_attached_blocks = {}
+
+# Queue on which this worker process announces the classifiers it starts
+_started_queue = None
+
+
+def allocate_cores(names: List[str], core_budget: int) -> Dict[str, int]:
+    """
+    Split a core budget between classifiers that train concurrently
+
+    Every classifier gets one core; spare cores go to the classifiers in
+    CORE_WEIGHTS in proportion to their weight (largest remainder first)
+    """
+    allocation = {name: 1 for name in names}
+    spare = core_budget - len(names)
+    weighted = [name for name in names if CORE_WEIGHTS.get(name, 0) > 0]
+    if spare <= 0 or not weighted:
+        return allocation
+
+    total_weight = sum(CORE_WEIGHTS[name] for name in weighted)
+    shares = {name: spare * CORE_WEIGHTS[name] / total_weight for name in weighted}
+    for name in weighted:
+        allocation[name] += int(shares[name])
+
+    leftover = spare - sum(int(share) for share in shares.values())
+    by_remainder = sorted(weighted, key=lambda name: shares[name] - int(shares[name]), reverse=True)
+    for name in by_remainder[:leftover]:
+        allocation[name] += 1
+    return allocation
+
+
+class SharedArrays:
+    """
+    NumPy arrays copied once into shared memory blocks
+    Workers map the blocks by name instead of unpickling a copy per task
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._blocks = []
+        self.descriptors = {}
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            if array.dtype.hasobject:
+                # Object arrays hold pointers and cannot live in shared memory
+                self.descriptors[key] = array
+                continue
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.descriptors[key] = (block.name, array.shape, array.dtype.str)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.size for block in self._blocks)
+
+    def close(self):
+        """Release and remove the shared memory blocks"""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def attach_shared_arrays(descriptors: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Read-only views of SharedArrays blocks inside a worker process"""
+    arrays = {}
+    for key, descriptor in descriptors.items():
+        if isinstance(descriptor, np.ndarray):
+            arrays[key] = descriptor
+            continue
+        name, shape, dtype = descriptor
+        block = _attached_blocks.get(name)
+        if block is None:
+            block = shared_memory.SharedMemory(name=name)
+            _attached_blocks[name] = block
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        arrays[key] = array
+    return arrays
+
+
+def limit_estimator_jobs(estimator: Any, n_jobs: int):
+    """
+    Give an estimator n_jobs workers at its outermost level only
+    Nested estimators (e.g. the forest inside a grid search) run single-threaded
+    so the two levels of parallelism never multiply
+    """
+    params = estimator.get_params()
+    updates = {key: 1 for key in params if key.endswith('__n_jobs')}
+    if 'n_jobs' in params:
+        updates['n_jobs'] = n_jobs
+    if updates:
+        estimator.set_params(**updates)
+
+
+def _init_worker(started_queue):
+    """Process-pool initializer: keep the queue for start notifications"""
+    global _started_queue
+    _started_queue = started_queue
+
+
+def _run_task(task_fn: Callable, name: str, estimator: Any, descriptors: Dict[str, Any],
+              n_jobs: int, submitted_at: float, task_kwargs: Dict) -> Dict:
+    """Worker entry point: map shared arrays, cap thread pools and run the task"""
+    started_at = time.time()
+    if _started_queue is not None:
+        _started_queue.put(name)
+    arrays = attach_shared_arrays(descriptors)
+    limit_estimator_jobs(estimator, n_jobs)
+
+    with threadpool_limits(limits=n_jobs):
+        outcome = task_fn(name, estimator, arrays, **task_kwargs)
+
+    outcome['timings']['queue_seconds'] = started_at - submitted_at
+    outcome['timings']['worker_seconds'] = time.time() - started_at
+    outcome['worker'] = {'pid': os.getpid(), 'n_jobs': n_jobs}
+    return outcome
+
+
+def train_in_process_pool(task_fn: Callable, estimators: Dict[str, Any], arrays: Dict[str, np.ndarray],
+                          core_budget: Optional[int] = None, start_method: Optional[str] = None,
+                          progress_callback: Optional[Callable[[str, str], None]] = None,
+                          **task_kwargs) -> Tuple[Dict[str, Any], Dict]:
+    """
+    Run task_fn(name, estimator, arrays, **task_kwargs) for every estimator in a process pool
+
+    Args:
+        task_fn: Module-level function that fits one estimator and returns a dict
+                 with a 'timings' dict
+        estimators: Unfitted estimators by classifier name
+        arrays: Training/test matrices shared with every task
+        core_budget: Total cores to use (defaults to all cores)
+        start_method: multiprocessing start method (defaults to the platform's)
+        progress_callback: Optional callable(name, stage) notified with 'queued'
+                           on submission, 'training' once a worker starts the
+                           task and 'completed' / 'failed' on completion
+
+    Returns:
+        Tuple of (task outcome or raised exception by name, schedule summary)
+    """
+    core_budget = max(1, int(core_budget or os.cpu_count() or 1))
+    allocation = allocate_cores(list(estimators), core_budget)
+    max_workers = min(len(estimators), core_budget)
+    context = multiprocessing.get_context(start_method)
+
+    # Heaviest classifiers first so they never wait for a free worker at the end
+    order = sorted(estimators, key=lambda name: CORE_WEIGHTS.get(name, 0), reverse=True)
+    outcomes = {}
+    started_queue = context.Queue() if progress_callback else None
+    started = set()
+
+    def report_started(name):
+        # A worker's notice can arrive after its result; report each start once
+        if name not in started:
+            started.add(name)
+            progress_callback(name, 'training')
+
+    with SharedArrays(arrays) as shared:
+        logger.info(f"⚙️ Training {len(estimators)} classifiers on {max_workers} workers "
+                    f"(core budget {core_budget}, {shared.nbytes / 1e6:.1f} MB shared)")
+
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(started_queue,)) as pool:
+            futures = {}
+            for name in order:
+                futures[pool.submit(_run_task, task_fn, name, estimators[name], shared.descriptors,
+                                    allocation[name], time.time(), task_kwargs)] = name
+                if progress_callback:
+                    progress_callback(name, 'queued')
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=PROGRESS_POLL_SECONDS if progress_callback else None,
+                                     return_when=FIRST_COMPLETED)
+                if progress_callback:
+                    while True:
+                        try:
+                            report_started(started_queue.get_nowait())
+                        except queue.Empty:
+                            break
+                for future in done:
+                    name = futures[future]
+                    try:
+                        outcomes[name] = future.result()
+                    except Exception as e:
+                        outcomes[name] = e
+                    if progress_callback:
+                        report_started(name)
+                        progress_callback(name, 'failed' if isinstance(outcomes[name], Exception) else 'completed')
+
+    if started_queue is not None:
+        started_queue.close()
+
+    schedule = {
+        'core_budget': core_budget,
+        'workers': max_workers,
+        'core_allocation': allocation,
+        'start_method': context.get_start_method()
+    }
+    return {name: outcomes[name] for name in estimators}, schedule
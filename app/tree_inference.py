@@ -0,0 +1,125 @@
+"""
+Compiled Tree-Ensemble Inference for Trust Score Classification
+Flattens fitted RandomForest models into contiguous NumPy arrays and evaluates
+all trees with vectorized traversal over the batch
+"""
+
+import numpy as np
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Marker sklearn uses for missing children at leaf nodes
+TREE_LEAF = -1
+
+# sklearn >= 1.4 stores class fractions in tree_.value; older releases store
+# weighted counts and normalize them inside DecisionTreeClassifier.predict_proba
+_TREE_VALUES_ARE_FRACTIONS = tuple(int(part) for part in sklearn.__version__.split('.')[:2]) >= (1, 4)
+
+
+class CompiledForest:
+    """
+    Flattened RandomForestClassifier for low-overhead inference
+    Produces the same predict/predict_proba output as the source sklearn model
+    """
+
+    def __init__(self, forest: Any, chunk_size: int = 4096):
+        """
+        Compile a fitted RandomForestClassifier, or a fitted search object
+        (e.g. GridSearchCV) whose best_estimator_ is a RandomForestClassifier
+
+        Args:
+            forest: Fitted model to compile
+            chunk_size: Rows per block when accumulating leaf probabilities
+        """
+        estimator = getattr(forest, 'best_estimator_', forest)
+        if not isinstance(estimator, RandomForestClassifier) or not hasattr(estimator, 'estimators_'):
+            raise ValueError(f"Cannot compile {type(forest).__name__}: expected a fitted RandomForestClassifier")
+        if estimator.n_outputs_ != 1:
+            raise ValueError("Only single-output RandomForestClassifier models can be compiled")
+
+        self.classes_ = estimator.classes_
+        self.n_features_in_ = estimator.n_features_in_
+        self.n_estimators = len(estimator.estimators_)
+        n_classes = len(self.classes_)
+
+        features, thresholds, lefts, rights, missing_left, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for tree_estimator in estimator.estimators_:
+            tree = tree_estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == TREE_LEAF
+
+            # Leaves point back to themselves so every sample can take max_depth steps
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            missing_left.append(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=np.uint8)))
+
+            # Per-leaf class probabilities, computed exactly like DecisionTreeClassifier.predict_proba
+            leaf_values = tree.value[:, 0, :n_classes].astype(np.float64)
+            if not _TREE_VALUES_ARE_FRACTIONS:
+                normalizer = leaf_values.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                leaf_values /= normalizer
+            values.append(leaf_values)
+
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        self.feature = np.ascontiguousarray(np.concatenate(features), dtype=np.intp)
+        self.threshold = np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64)
+        self.children_left = np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp)
+        self.children_right = np.ascontiguousarray(np.concatenate(rights), dtype=np.intp)
+        self.missing_go_to_left = np.ascontiguousarray(np.concatenate(missing_left), dtype=bool)
+        self.value = np.ascontiguousarray(np.concatenate(values), dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.max_depth = max_depth
+        self.node_count = offset
+        self.chunk_size = chunk_size
+
+        logger.info(f"Compiled RandomForest with {self.n_estimators} trees "
+                    f"({self.node_count} nodes, max depth {self.max_depth})")
+
+    def apply(self, X) -> np.ndarray:
+        """Return the (n_samples, n_estimators) array of global leaf indices"""
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected input with {self.n_features_in_} features, got shape {X.shape}")
+
+        nodes = np.tile(self.roots, (X.shape[0], 1))
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+
+        for _ in range(self.max_depth):
+            feature_values = X[rows, self.feature[nodes]]
+            go_left = np.where(
+                np.isnan(feature_values),
+                self.missing_go_to_left[nodes],
+                feature_values <= self.threshold[nodes]
+            )
+            nodes = np.where(go_left, self.children_left[nodes], self.children_right[nodes])
+
+        return nodes
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Average per-tree leaf probabilities, accumulated in tree order like sklearn"""
+        leaves = self.apply(X)
+        proba = np.empty((leaves.shape[0], len(self.classes_)), dtype=np.float64)
+        for start in range(0, leaves.shape[0], self.chunk_size):
+            chunk = leaves[start:start + self.chunk_size]
+            # cumsum adds trees sequentially, matching sklearn's per-tree accumulation order
+            proba[start:start + self.chunk_size] = np.cumsum(self.value[chunk], axis=1)[:, -1]
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        """Predict class labels as the argmax of predict_proba over classes_"""
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
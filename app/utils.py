@@ -1,5 +1,6 @@
-from supabase import create_client, Client
+from supabase import Client
 from app.config import Config
+from app.supabase_pool import supabase_pool
 import random
 import uuid
 from datetime import datetime
@@ -12,9 +13,8 @@ import logging
 logger = logging.getLogger(__name__)
 
 def get_supabase_client() -> Client:
-    url = Config.SUPABASE_URL
-    key = Config.SUPABASE_API_KEY
-    return create_client(url, key)
+    """Process-wide Supabase client sharing one keep-alive connection pool"""
+    return supabase_pool.get_client()
 
 
 def generate_synthetic_telemetry():
@@ -29,10 +29,17 @@ def generate_synthetic_telemetry():
     return telemetry
 
 
-def load_sample_cicids2017_data():
-    """Load sample CICIDS2017 data from JSON file and generate multiple samples for training"""
+def load_sample_cicids2017_data(n_samples=1000, seed=42, label_mix=None):
+    """
+    Load sample CICIDS2017 data from JSON file and generate multiple samples for training
+
+    Args:
+        n_samples: Number of rows to generate
+        seed: Random seed for reproducible results
+        label_mix: Optional {label: weight} mix (default 80% BENIGN, 20% MALICIOUS),
+                   e.g. app.synthetic_data.CICIDS2017_LABEL_MIX for the real attack classes
+    """
     import pandas as pd
-    import numpy as np
     import json
     import os
 
@@ -53,46 +60,12 @@ def load_sample_cicids2017_data():
         with open(json_file_path, 'r') as f:
             sample_data = json.load(f)
 
-        # Filter out non-feature fields to get only CICIDS2017 features
+        # Generate multiple samples based on the template, one column at a time
+        from app.synthetic_data import SyntheticFlowGenerator
         exclude_fields = ['session_id', 'vm_id', 'event_type', 'timestamp']
         features = {k: v for k, v in sample_data.items() if k not in exclude_fields}
-
-        # Generate multiple samples based on the template
-        n_samples = 1000
-        np.random.seed(42)  # For reproducible results
-
-        data_rows = []
-        for i in range(n_samples):
-            row = {}
-            for feature, base_value in features.items():
-                if isinstance(base_value, (int, float)):
-                    # Add realistic variations to numeric values
-                    if feature in ['Init_Win_bytes_forward', 'Init_Win_bytes_backward']:
-                        # Keep window size values realistic
-                        row[feature] = np.random.choice([0, 65535, 32768, 8192], p=[0.1, 0.5, 0.3, 0.1])
-                    elif 'Count' in feature or 'Flags' in feature:
-                        # Integer flags and counts with small variations
-                        variation = np.random.poisson(lam=max(1, abs(base_value)))
-                        row[feature] = max(0, variation)
-                    elif 'Duration' in feature or 'IAT' in feature:
-                        # Time-related features
-                        variation = np.random.exponential(scale=max(0.001, abs(base_value)))
-                        row[feature] = max(0, variation)
-                    else:
-                        # Other numeric features with realistic variations (±30%)
-                        variation_factor = np.random.uniform(0.7, 1.3)
-                        row[feature] = max(0, base_value * variation_factor)
-                else:
-                    row[feature] = base_value
-
-            data_rows.append(row)
-
-        # Create DataFrame
-        df = pd.DataFrame(data_rows)
-
-        # Add Label column (80% BENIGN, 20% MALICIOUS)
-        labels = np.random.choice(['BENIGN', 'MALICIOUS'], size=n_samples, p=[0.8, 0.2])
-        df['Label'] = labels
+        generator = SyntheticFlowGenerator(features, label_mix=label_mix, seed=seed, variation='sampled')
+        df = generator.generate(n_samples)
 
         print(f"✅ Generated CICIDS2017 dataset from sample: {df.shape[0]} samples, {df.shape[1]} features")
         print(f"   Label distribution: {df['Label'].value_counts().to_dict()}")
@@ -109,10 +82,17 @@ def load_sample_cicids2017_data():
         })
 
 
-def load_real_sample_cicids2017_data():
-    """Load data from the actual sample_cicids2017_data.json file"""
+def load_real_sample_cicids2017_data(n_samples=1000, seed=42, label_mix=None):
+    """
+    Load data from the actual sample_cicids2017_data.json file
+
+    Args:
+        n_samples: Number of rows to generate
+        seed: Random seed for reproducible results
+        label_mix: Optional {label: weight} mix (default 80% BENIGN, 20% MALICIOUS),
+                   e.g. app.synthetic_data.CICIDS2017_LABEL_MIX for the real attack classes
+    """
     import pandas as pd
-    import numpy as np
     import json
     import os
 
@@ -121,49 +101,19 @@ def load_real_sample_cicids2017_data():
 
     if not os.path.exists(json_file_path):
         print(f"❌ Sample JSON file not found: {json_file_path}")
-        return load_sample_cicids2017_data()  # Fallback to synthetic data
+        return load_sample_cicids2017_data(n_samples, seed, label_mix)  # Fallback to synthetic data
 
     try:
         # Load the JSON file
         with open(json_file_path, 'r') as f:
             sample_data = json.load(f)
 
-        # Filter out non-feature fields
+        # Create multiple variations of the single JSON sample, one column at a time
+        from app.synthetic_data import SyntheticFlowGenerator
         exclude_fields = ['session_id', 'vm_id', 'event_type', 'timestamp']
         features = {k: v for k, v in sample_data.items() if k not in exclude_fields}
-
-        # Create multiple samples based on the single JSON sample
-        n_samples = 1000
-        np.random.seed(42)  # For reproducible results
-
-        # Generate variations of the sample data
-        data_rows = []
-        for i in range(n_samples):
-            row = {}
-            for feature, base_value in features.items():
-                if isinstance(base_value, (int, float)):
-                    # Add some variation to numeric values
-                    if feature in ['Init_Win_bytes_forward', 'Init_Win_bytes_backward']:
-                        # Keep window size values as-is or common values
-                        row[feature] = np.random.choice([0, 65535, 32768, 8192], p=[0.1, 0.5, 0.3, 0.1])
-                    elif 'Count' in feature or 'Flags' in feature:
-                        # Integer flags and counts
-                        row[feature] = max(0, int(base_value + np.random.normal(0, 1)))
-                    else:
-                        # Other numeric features with some variation
-                        variation = np.random.normal(1, 0.2)  # 20% variation
-                        row[feature] = max(0, base_value * variation)
-                else:
-                    row[feature] = base_value
-
-            data_rows.append(row)
-
-        # Create DataFrame
-        df = pd.DataFrame(data_rows)
-
-        # Add Label column (80% BENIGN, 20% MALICIOUS)
-        labels = np.random.choice(['BENIGN', 'MALICIOUS'], size=n_samples, p=[0.8, 0.2])
-        df['Label'] = labels
+        generator = SyntheticFlowGenerator(features, label_mix=label_mix, seed=seed, variation='gaussian')
+        df = generator.generate(n_samples)
 
         print(f"✅ Loaded real sample CICIDS2017 data: {df.shape[0]} samples, {df.shape[1]} features")
         print(f"   Label distribution: {df['Label'].value_counts().to_dict()}")
@@ -173,7 +123,7 @@ def load_real_sample_cicids2017_data():
     except Exception as e:
         print(f"❌ Error loading sample JSON file: {e}")
         print("🔄 Falling back to synthetic data generation...")
-        return load_sample_cicids2017_data()  # Fallback to synthetic data
+        return load_sample_cicids2017_data(n_samples, seed, label_mix)  # Fallback to synthetic data
 
 
 def load_multiple_cicids2017_files(data_dir="data/"):
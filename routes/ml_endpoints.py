@@ -20,6 +20,7 @@ import base64
 # Import Trust Engine ML modules - using lazy imports to avoid circular dependency
 from app.utils import get_supabase_client, get_elasticsearch_client, load_sample_cicids2017_data
 from app.auth import require_auth
+from app.config import Config
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,19 +30,20 @@ logger = logging.getLogger(__name__)
 ml_bp = Blueprint('ml_api', __name__, url_prefix='/api/ml')
 api = Api(ml_bp)
 
-# Global ML engine instances - lazy initialization to avoid circular imports
-ml_engine = None
+# Global evaluator/visualizer instances - lazy initialization to avoid circular imports
 evaluator = None
 visualizer = None
 
 def get_ml_engine():
-    """Lazy initialization of ML engine"""
-    global ml_engine
-    if ml_engine is None:
-        from app.ml_engine import TrustScoreMLEngine
-        ml_engine = TrustScoreMLEngine()
+    """Shared ML engine (app.ml_engine.ml_engine), imported lazily to avoid circular imports"""
+    from app.ml_engine import ml_engine
     return ml_engine
 
+def get_model_registry():
+    """Registry that owns the shared engine's model set"""
+    from app.model_registry import model_registry
+    return model_registry
+
 def get_evaluator():
     """Lazy initialization of evaluator"""
     global evaluator
@@ -76,75 +78,179 @@ class MLHealthCheck(Resource):
             logger.error(f"ML health check failed: {str(e)}")
             return {"status": "unhealthy", "error": str(e)}, 500
 
+def get_micro_batcher_stats():
+    """Micro-batcher histograms when micro-batching is enabled"""
+    if not Config.ML_MICRO_BATCHING:
+        return None
+    from app.micro_batcher import micro_batcher
+    return micro_batcher.stats()
+
+def load_training_data(config: Dict) -> pd.DataFrame:
+    """Load the training dataset selected by a training config"""
+    if config["use_sample_data"]:
+        # Choose data loading method based on data_source parameter
+        data_source = config.get("data_source", "sample_template")
+
+        if data_source == "sample_template":
+            # Use sample JSON as template (default)
+            df = load_sample_cicids2017_data()
+            logger.info(f"Loaded sample-based CICIDS2017 data: {df.shape}")
+        elif data_source == "sample_variations":
+            # Use sample JSON with variations
+            from app.utils import load_real_sample_cicids2017_data
+            df = load_real_sample_cicids2017_data()
+            logger.info(f"Loaded sample variation CICIDS2017 data: {df.shape}")
+        elif data_source == "multiple_files":
+            # Load multiple JSON files from data directory
+            from app.utils import load_multiple_cicids2017_files
+            df = load_multiple_cicids2017_files()
+            logger.info(f"Loaded multiple file CICIDS2017 data: {df.shape}")
+        else:
+            # Default fallback
+            df = load_sample_cicids2017_data()
+            logger.info(f"Using default sample data loading: {df.shape}")
+    else:
+        # Load from Supabase or custom dataset
+        supabase = get_supabase_client()
+        response = supabase.table('telemetry_data').select('*').execute()
+        df = pd.DataFrame(response.data)
+        logger.info(f"Loaded telemetry data from Supabase: {df.shape}")
+
+    return df
+
+def run_training(config: Dict, job=None) -> Dict:
+    """
+    Load data, train all classifiers and optionally save them
+    Reports progress to a TrainingJob when one is given
+    """
+    if config.get("label_mapping"):
+        # Applied when the job runs so a queued job never relabels a running one
+        get_ml_engine().configure_label_mapping(config["label_mapping"])
+
+    train_kwargs = dict(
+        test_size=config["test_size"],
+        cross_validate=config["cross_validation"],
+        cv_folds=config["cv_folds"],
+        search_strategy=config["search_strategy"],
+        search_budget=config["search_budget"],
+        parallel=config["parallel"],
+        core_budget=config["core_budget"],
+        profile_memory=config["profile_memory"],
+        progress_callback=job.update_classifier if job else None
+    )
+
+    if job:
+        job.set_stage("loading_data")
+
+    if config["data_source"] == "stream":
+        # Stream CSV / JSON-lines / Parquet files in chunks; loading and training share one stage
+        if not config["data_paths"]:
+            raise ValueError("data_paths is required for the 'stream' data source")
+        if job:
+            job.set_stage("training")
+        training_results = get_ml_engine().train_from_files(
+            config["data_paths"],
+            chunk_size=config["chunk_size"],
+            max_rows=config["max_rows"],
+            **train_kwargs
+        )
+    else:
+        df = load_training_data(config)
+        if df.empty:
+            raise ValueError("No training data available")
+
+        # Train all classifiers
+        if job:
+            job.set_stage("training")
+        training_results = get_ml_engine().train_all_classifiers(df, **train_kwargs)
+
+    # Save models if requested
+    if config["save_models"]:
+        if job:
+            job.set_stage("saving")
+        if config["save_format"] == "bundle":
+            training_results["model_bundle"] = get_ml_engine().save_bundle(config["model_path"])
+        else:
+            model_paths = get_ml_engine().save_models(config["model_path"])
+            training_results["model_paths"] = model_paths
+
+    # Log training completion
+    logger.info("ML training completed successfully")
+    return training_results
+
 class TrainingResource(Resource):
     """ML Model Training Endpoints"""
 
     def post(self):
-        """Train all ML classifiers with CICIDS2017 data"""
+        """
+        Train all ML classifiers with CICIDS2017 data
+        Runs as a background job (202 + job_id) unless "async" is false
+        """
         try:
-            data = request.get_json()
+            data = request.get_json() or {}
 
             # Configuration options
             config = {
                 "use_sample_data": data.get("use_sample_data", True),
                 "data_source": data.get("data_source", "sample_template"),  # New parameter
+                "data_paths": data.get("data_paths", []),  # Files, directories or globs for "stream"
+                "chunk_size": data.get("chunk_size", 100000),
+                "max_rows": data.get("max_rows", Config.ML_TRAINING_MAX_ROWS),
                 "test_size": data.get("test_size", 0.2),
                 "cross_validation": data.get("cross_validation", True),
                 "cv_folds": data.get("cv_folds", 5),
+                "search_strategy": data.get("search_strategy", "grid"),  # "grid", "halving" or "random"
+                "search_budget": data.get("search_budget"),
+                "parallel": data.get("parallel", False),
+                "core_budget": data.get("core_budget", Config.ML_TRAINING_CORE_BUDGET or None),
+                "profile_memory": data.get("profile_memory", False),  # tracemalloc peak memory per stage
+                "label_mapping": data.get("label_mapping"),  # {attack label: trust score 1-10}
                 "save_models": data.get("save_models", False),
+                "save_format": data.get("save_format", "bundle"),  # "bundle" or "files"
                 "model_path": data.get("model_path", "models/")
             }
 
             logger.info(f"Starting ML training with config: {config}")
 
-            # Load training data
-            if config["use_sample_data"]:
-                # Choose data loading method based on data_source parameter
-                data_source = config.get("data_source", "sample_template")
-
-                if data_source == "sample_template":
-                    # Use sample JSON as template (default)
-                    df = load_sample_cicids2017_data()
-                    logger.info(f"Loaded sample-based CICIDS2017 data: {df.shape}")
-                elif data_source == "sample_variations":
-                    # Use sample JSON with variations
-                    from app.utils import load_real_sample_cicids2017_data
-                    df = load_real_sample_cicids2017_data()
-                    logger.info(f"Loaded sample variation CICIDS2017 data: {df.shape}")
-                elif data_source == "multiple_files":
-                    # Load multiple JSON files from data directory
-                    from app.utils import load_multiple_cicids2017_files
-                    df = load_multiple_cicids2017_files()
-                    logger.info(f"Loaded multiple file CICIDS2017 data: {df.shape}")
-                else:
-                    # Default fallback
-                    df = load_sample_cicids2017_data()
-                    logger.info(f"Using default sample data loading: {df.shape}")
-            else:
-                # Load from Supabase or custom dataset
-                supabase = get_supabase_client()
-                response = supabase.table('telemetry_data').select('*').execute()
-                df = pd.DataFrame(response.data)
-                logger.info(f"Loaded telemetry data from Supabase: {df.shape}")
-
-            if df.empty:
-                return {"error": "No training data available"}, 400
-
-            # Train all classifiers
-            training_results = get_ml_engine().train_all_classifiers(
-                df,
-                test_size=config["test_size"],
-                cross_validate=config["cross_validation"],
-                cv_folds=config["cv_folds"]
-            )
-
-            # Save models if requested
-            if config["save_models"]:
-                model_paths = get_ml_engine().save_models(config["model_path"])
-                training_results["model_paths"] = model_paths
-
-            # Log training completion
-            logger.info("ML training completed successfully")
+            # Validate the hyperparameter search before queueing; it is applied when the job runs
+            from app.ml_engine import SEARCH_STRATEGIES
+            if config["search_strategy"] not in SEARCH_STRATEGIES:
+                return {"error": f"Unknown search strategy '{config['search_strategy']}'",
+                        "available_strategies": list(SEARCH_STRATEGIES)}, 400
+            if config["search_budget"] is not None and (not isinstance(config["search_budget"], int)
+                                                        or config["search_budget"] < 1):
+                return {"error": "search_budget must be a positive integer"}, 400
+            if config["label_mapping"] is not None:
+                from app.ml_engine import validate_label_mapping
+                try:
+                    validate_label_mapping(config["label_mapping"])
+                except ValueError as e:
+                    return {"error": str(e)}, 400
+            for key in ("chunk_size", "max_rows"):
+                if config[key] is not None and (not isinstance(config[key], int) or config[key] < 1):
+                    return {"error": f"{key} must be a positive integer"}, 400
+
+            if data.get("async", True):
+                from app.training_jobs import training_jobs
+                job = training_jobs.submit(
+                    lambda job: run_training(config, job),
+                    config=config,
+                    classifier_names=list(get_ml_engine().classifiers.keys()),
+                    expected_durations=get_ml_engine().estimate_training_durations()
+                )
+                return {
+                    "status": "accepted",
+                    "message": "Training job queued",
+                    "job_id": job.job_id,
+                    "status_url": f"/api/ml/train/jobs/{job.job_id}",
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "config": config
+                }, 202
+
+            try:
+                training_results = run_training(config)
+            except ValueError as e:
+                return {"error": str(e)}, 400
 
             return {
                 "status": "success",
@@ -159,6 +265,24 @@ class TrainingResource(Resource):
             logger.error(traceback.format_exc())
             return {"error": f"Training failed: {str(e)}"}, 500
 
+class TrainingJobResource(Resource):
+    """Background Training Job Status Endpoints"""
+
+    def get(self, job_id=None):
+        """List training jobs, or report the stage, progress and ETA of one job"""
+        from app.training_jobs import training_jobs
+
+        if job_id is None:
+            return {
+                "jobs": [job.to_dict(include_result=False) for job in training_jobs.list_jobs()],
+                "timestamp": datetime.utcnow().isoformat()
+            }, 200
+
+        job = training_jobs.get(job_id)
+        if job is None:
+            return {"error": f"Training job not found: {job_id}"}, 404
+        return job.to_dict(), 200
+
 class PredictionResource(Resource):
     """ML Prediction Endpoints"""
 
@@ -174,16 +298,20 @@ class PredictionResource(Resource):
             features = data['features']
             classifier_name = data.get('classifier', 'RandomForest')
 
-            # Validate classifier
-            if classifier_name not in get_ml_engine().trained_models:
+            # Validate classifier ("Cascade" serves its two configured stages)
+            if not get_ml_engine().is_servable(classifier_name):
                 available = list(get_ml_engine().trained_models.keys())
                 return {
                     "error": f"Classifier '{classifier_name}' not trained",
                     "available_classifiers": available
                 }, 400
 
-            # Make prediction
-            prediction_result = get_ml_engine().predict_trust_score(features, classifier_name)
+            # Make prediction; with micro-batching, concurrent requests share one vectorized call
+            if Config.ML_MICRO_BATCHING:
+                from app.micro_batcher import micro_batcher
+                prediction_result = micro_batcher.predict(features, classifier_name)
+            else:
+                prediction_result = get_ml_engine().predict_trust_score(features, classifier_name)
 
             # Add metadata
             prediction_result.update({
@@ -220,28 +348,20 @@ class BatchPredictionResource(Resource):
             if not isinstance(batch_features, list):
                 return {"error": "batch_features must be a list"}, 400
 
-            # Validate classifier
-            if classifier_name not in get_ml_engine().trained_models:
+            # Validate classifier ("Cascade" serves its two configured stages)
+            if not get_ml_engine().is_servable(classifier_name):
                 available = list(get_ml_engine().trained_models.keys())
                 return {
                     "error": f"Classifier '{classifier_name}' not trained",
                     "available_classifiers": available
                 }, 400
 
-            # Process batch predictions
-            predictions = []
-            for i, features in enumerate(batch_features):
-                try:
-                    prediction = get_ml_engine().predict_trust_score(features, classifier_name)
-                    prediction['sample_id'] = i
-                    predictions.append(prediction)
-                except Exception as e:
-                    logger.warning(f"Failed to predict sample {i}: {str(e)}")
-                    predictions.append({
-                        "sample_id": i,
-                        "error": str(e),
-                        "trust_score": None
-                    })
+            # Process batch predictions in a single vectorized pass
+            predictions = get_ml_engine().predict_trust_scores_batch(batch_features, classifier_name)
+            for i, prediction in enumerate(predictions):
+                prediction['sample_id'] = i
+                if 'error' in prediction:
+                    logger.warning(f"Failed to predict sample {i}: {prediction['error']}")
 
             return {
                 "status": "success",
@@ -427,8 +547,15 @@ class ModelManagementResource(Resource):
         try:
             model_info = {
                 "trained_models": list(get_ml_engine().trained_models.keys()),
+                "model_version": get_ml_engine().model_version,
                 "available_classifiers": list(get_ml_engine().classifiers.keys()),
                 "training_history": get_ml_engine().training_history[-10:],  # Last 10 entries
+                "inference_backends": get_ml_engine().inference_backends,
+                "registry": get_model_registry().status(),
+                "prediction_cache": (get_ml_engine().prediction_cache.stats()
+                                     if get_ml_engine().prediction_cache else None),
+                "micro_batching": get_micro_batcher_stats(),
+                "cascade": get_ml_engine().get_cascade_stats(),
                 "model_metadata": {}
             }
 
@@ -452,7 +579,10 @@ class ModelManagementResource(Resource):
             return {"error": f"Model info failed: {str(e)}"}, 500
 
     def post(self):
-        """Load saved models from disk"""
+        """
+        Load saved models from disk and hot-swap them in
+        In-flight predictions finish on the previous version
+        """
         try:
             data = request.get_json() or {}
             model_path = data.get("model_path", "models/")
@@ -460,27 +590,66 @@ class ModelManagementResource(Resource):
             if not os.path.exists(model_path):
                 return {"error": f"Model path does not exist: {model_path}"}, 400
 
-            # Load models
-            loaded_models = get_ml_engine().load_models(model_path)
+            # Load models into a staging engine and swap atomically
+            swap = get_model_registry().load_version(model_path)
+            loaded_models = swap["models"]
 
             return {
                 "status": "success",
                 "message": f"Loaded {len(loaded_models)} models",
                 "loaded_models": loaded_models,
+                "model_version": swap["version"],
+                "previous_version": swap["previous_version"],
+                "feature_count": len(get_ml_engine().feature_names),
                 "timestamp": datetime.utcnow().isoformat()
             }, 200
 
+        except ValueError as e:
+            logger.error(f"Rejected model artifacts: {str(e)}")
+            return {"error": f"Rejected model artifacts: {str(e)}"}, 400
         except Exception as e:
             logger.error(f"Model loading failed: {str(e)}")
             return {"error": f"Model loading failed: {str(e)}"}, 500
 
+    def put(self):
+        """Select the inference backend for a trained model"""
+        try:
+            data = request.get_json() or {}
+            model_name = data.get("model")
+            backend = data.get("inference_backend", "sklearn")
+            backend_options = data.get("backend_options") or {}
+
+            if not isinstance(backend_options, dict):
+                return {"error": "backend_options must be an object"}, 400
+            if model_name not in get_ml_engine().trained_models:
+                return {
+                    "error": f"Classifier '{model_name}' not trained",
+                    "available_classifiers": list(get_ml_engine().trained_models.keys())
+                }, 400
+
+            get_ml_engine().set_inference_backend(model_name, backend, **backend_options)
+
+            return {
+                "status": "success",
+                "message": f"{model_name} now uses the {backend} inference backend",
+                "inference_backends": get_ml_engine().inference_backends,
+                "timestamp": datetime.utcnow().isoformat()
+            }, 200
+
+        except ValueError as e:
+            # Unknown backends and backend options
+            return {"error": str(e)}, 400
+        except RuntimeError as e:
+            # Retraining or reloads kept replacing the models being switched
+            return {"error": str(e)}, 409
+        except Exception as e:
+            logger.error(f"Inference backend selection failed: {str(e)}")
+            return {"error": f"Inference backend selection failed: {str(e)}"}, 500
+
     def delete(self):
         """Clear all trained models from memory"""
         try:
-            cleared_models = list(get_ml_engine().trained_models.keys())
-            get_ml_engine().trained_models.clear()
-            get_ml_engine().scalers.clear()
-            get_ml_engine().performance_metrics.clear()
+            cleared_models = get_ml_engine().clear_models()
 
             return {
                 "status": "success",
@@ -493,6 +662,126 @@ class ModelManagementResource(Resource):
             logger.error(f"Model clearing failed: {str(e)}")
             return {"error": f"Model clearing failed: {str(e)}"}, 500
 
+class OnlineLearningResource(Resource):
+    """Online (Incremental) Learning Endpoints"""
+
+    def get(self):
+        """Online update counters, pending rows and model freshness"""
+        from app.online_learning import online_learner
+        return {
+            "status": "success",
+            "online_learning": online_learner.status(),
+            "timestamp": datetime.utcnow().isoformat()
+        }, 200
+
+    def post(self):
+        """
+        Queue newly labelled rows ("Label" or "trust_score" per row)
+        Applies them right away when "update" is true
+        """
+        from app.online_learning import online_learner
+        try:
+            data = request.get_json() or {}
+            samples = data.get("samples", [])
+            if not isinstance(samples, list):
+                return {"error": "samples must be a list of labelled feature dictionaries"}, 400
+
+            accepted = online_learner.add_samples(samples)
+            response = {
+                "status": "success",
+                "accepted": accepted,
+                "ignored": len(samples) - accepted,
+                "pending_rows": online_learner.pending_rows,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+            if data.get("update", False):
+                response["update"] = online_learner.update(force=True)
+            return response, 200
+
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        except Exception as e:
+            logger.error(f"Online update failed: {str(e)}")
+            return {"error": f"Online update failed: {str(e)}"}, 500
+
+    def put(self):
+        """Start or stop scheduled online updates"""
+        from app.online_learning import online_learner
+        data = request.get_json() or {}
+        if data.get("enabled", True):
+            interval = data.get("interval", Config.ML_ONLINE_UPDATE_INTERVAL)
+            trigger_rows = data.get("trigger_rows", Config.ML_ONLINE_TRIGGER_ROWS or None)
+            if not isinstance(interval, (int, float)) or interval <= 0:
+                return {"error": "interval must be a positive number of seconds"}, 400
+            online_learner.start(interval=interval, trigger_rows=trigger_rows)
+        else:
+            online_learner.stop()
+        return {
+            "status": "success",
+            "online_learning": online_learner.status(),
+            "timestamp": datetime.utcnow().isoformat()
+        }, 200
+
+class CascadeResource(Resource):
+    """Two-Stage Cascade Endpoints (served as classifier "Cascade")"""
+
+    def get(self):
+        """Cascade configuration, per-stage hit rates and escalation counters"""
+        return {
+            "status": "success",
+            "cascade": get_ml_engine().get_cascade_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }, 200
+
+    def put(self):
+        """Configure the cascade stages and escalation thresholds"""
+        data = request.get_json() or {}
+        current = get_ml_engine().cascade_config
+        try:
+            config = get_ml_engine().configure_cascade(
+                first_stage=data.get("first_stage", current["first_stage"]),
+                second_stage=data.get("second_stage", current["second_stage"]),
+                confidence_threshold=float(data.get("confidence_threshold", current["confidence_threshold"])),
+                boundary_margin=float(data.get("boundary_margin", current["boundary_margin"]))
+            )
+        except (TypeError, ValueError) as e:
+            return {"error": str(e)}, 400
+        return {
+            "status": "success",
+            "cascade": config,
+            "timestamp": datetime.utcnow().isoformat()
+        }, 200
+
+    def post(self):
+        """Compare cascade accuracy and latency with its stages served alone on sample data"""
+        try:
+            data = request.get_json() or {}
+            num_samples = data.get("num_samples", 2000)
+            if not isinstance(num_samples, int) or num_samples <= 0:
+                return {"error": "num_samples must be a positive integer"}, 400
+
+            engine = get_ml_engine()
+            if not engine.is_servable("Cascade"):
+                return {
+                    "error": "Both cascade stages must be trained",
+                    "cascade": engine.cascade_config,
+                    "available_classifiers": list(engine.trained_models.keys())
+                }, 400
+
+            sample = load_sample_cicids2017_data(n_samples=num_samples, seed=data.get("seed", 7))
+            X = sample.reindex(columns=engine.feature_names, fill_value=0).to_numpy(dtype=engine.feature_dtype)
+            y = engine.map_labels(sample['Label'])
+
+            return {
+                "status": "success",
+                "evaluation": engine.evaluate_cascade(X, y),
+                "timestamp": datetime.utcnow().isoformat()
+            }, 200
+
+        except Exception as e:
+            logger.error(f"Cascade evaluation failed: {str(e)}")
+            return {"error": f"Cascade evaluation failed: {str(e)}"}, 500
+
 class BenchmarkResource(Resource):
     """Performance Benchmarking Endpoints"""
 
@@ -504,18 +793,36 @@ class BenchmarkResource(Resource):
             # Benchmark configuration
             config = {
                 "num_samples": data.get("num_samples", 1000),
-                "iterations": data.get("iterations", 10),
+                "iterations": data.get("iterations", 100),
+                "warmup": data.get("warmup", 10),
+                "batch_size": data.get("batch_size", 100),
                 "measure_memory": data.get("measure_memory", True),
-                "measure_latency": data.get("measure_latency", True)
+                "models": data.get("models")
             }
+            for key in ("num_samples", "iterations", "batch_size"):
+                if not isinstance(config[key], int) or config[key] < 1:
+                    return {"error": f"{key} must be a positive integer"}, 400
+            if not isinstance(config["warmup"], int) or config["warmup"] < 0:
+                return {"error": "warmup must be a non-negative integer"}, 400
 
             if not get_ml_engine().trained_models:
                 return {"error": "No trained models available for benchmarking"}, 400
-
-            # Run benchmarks
+            if config["models"] is not None:
+                unknown = [name for name in config["models"] if not get_ml_engine().is_servable(name)]
+                if unknown:
+                    return {
+                        "error": f"Models not trained: {unknown}",
+                        "available_classifiers": list(get_ml_engine().trained_models.keys())
+                    }, 400
+
+            # Run benchmarks: warmup plus timed iterations of the single-row and batched paths
             benchmark_results = get_ml_engine().benchmark_performance(
                 num_samples=config["num_samples"],
-                iterations=config["iterations"]
+                iterations=config["iterations"],
+                warmup=config["warmup"],
+                batch_size=config["batch_size"],
+                trace_allocations=config["measure_memory"],
+                models=config["models"]
             )
 
             # Add system performance metrics
@@ -552,12 +859,15 @@ class BenchmarkResource(Resource):
 # Register API resources
 api.add_resource(MLHealthCheck, '/health')
 api.add_resource(TrainingResource, '/train')
+api.add_resource(TrainingJobResource, '/train/jobs', '/train/jobs/<string:job_id>')
 api.add_resource(PredictionResource, '/predict')
 api.add_resource(BatchPredictionResource, '/predict/batch')
 api.add_resource(EvaluationResource, '/evaluate')
 api.add_resource(VisualizationResource, '/visualize/<string:chart_type>')
 api.add_resource(ModelManagementResource, '/models')
 api.add_resource(BenchmarkResource, '/benchmark')
+api.add_resource(OnlineLearningResource, '/online')
+api.add_resource(CascadeResource, '/cascade')
 
 # Traditional Flask routes for compatibility
 @ml_bp.route('/status', methods=['GET'])
@@ -570,12 +880,15 @@ def ml_status():
         "endpoints": [
             "/api/ml/health",
             "/api/ml/train",
+            "/api/ml/train/jobs/<job_id>",
             "/api/ml/predict",
             "/api/ml/predict/batch",
             "/api/ml/evaluate",
             "/api/ml/visualize/<chart_type>",
             "/api/ml/models",
-            "/api/ml/benchmark"
+            "/api/ml/benchmark",
+            "/api/ml/online",
+            "/api/ml/cascade"
         ]
     })
 
@@ -587,13 +900,16 @@ def swagger_ui():
         "note": "Install flask-swagger-ui for interactive documentation",
         "api_endpoints": {
             "health": "GET /api/ml/health - Check ML service health",
-            "train": "POST /api/ml/train - Train all ML classifiers",
+            "train": "POST /api/ml/train - Queue a training job for all ML classifiers",
+            "training_jobs": "GET /api/ml/train/jobs[/<job_id>] - Training job status, progress and ETA",
             "predict": "POST /api/ml/predict - Single prediction",
             "batch_predict": "POST /api/ml/predict/batch - Batch predictions",
             "evaluate": "GET/POST /api/ml/evaluate - Model evaluation",
             "visualize": "GET /api/ml/visualize/<chart_type> - Generate charts",
-            "models": "GET/POST/DELETE /api/ml/models - Model management",
-            "benchmark": "POST /api/ml/benchmark - Performance benchmarking"
+            "models": "GET/POST/PUT/DELETE /api/ml/models - Model management and inference backend selection",
+            "benchmark": "POST /api/ml/benchmark - Performance benchmarking",
+            "online": "GET/POST/PUT /api/ml/online - Incremental model updates from labelled telemetry",
+            "cascade": "GET/PUT/POST /api/ml/cascade - NaiveBayes-first model cascade stats, configuration and evaluation"
         }
     })
 
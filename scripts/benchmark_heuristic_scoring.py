@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Heuristic Scoring Benchmark
+Compares the STRIDE mapping and heuristic trust score as they were (feature
+list rebuilt per call, O(n^2) variance) with the shared-schema per-record
+functions and the NumPy feature-matrix path, and checks the results agree
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.feature_schema import FEATURE_NAMES, feature_matrix
+from app.telemetry import map_to_stride, stride_from_features
+from app.turest_score import calculate_trust_score, trust_scores_from_features
+
+
+def legacy_map_to_stride(telemetry_data):
+    """map_to_stride before vectorization"""
+    real_feature_names = list(FEATURE_NAMES)
+    features = {name: telemetry_data.get(name, 0) for name in real_feature_names}
+    avg_feature_value = sum(features.values()) / len(features)
+    max_feature_value = max(features.values())
+    if avg_feature_value > 80:
+        return {'stride_category': 'Denial of Service', 'risk_level': 5}
+    if max_feature_value > 90:
+        return {'stride_category': 'Elevation of Privilege', 'risk_level': 4}
+    if telemetry_data.get('event_type') == 'login_failed':
+        return {'stride_category': 'Spoofing', 'risk_level': 3}
+    if avg_feature_value > 60:
+        return {'stride_category': 'Information Disclosure', 'risk_level': 3}
+    return {'stride_category': 'Unknown', 'risk_level': 1}
+
+
+def legacy_calculate_trust_score(risk_level, stride_category, telemetry_data):
+    """calculate_trust_score (feature analysis branch) before vectorization"""
+    base_score = 100 - (risk_level * 15)
+    real_feature_names = list(FEATURE_NAMES)
+    features = {name: telemetry_data.get(name, 0) for name in real_feature_names}
+    feature_variance = sum((v - sum(features.values())/len(features))**2 for v in features.values()) / len(features)
+    if feature_variance > 1000:
+        base_score -= 20
+    elif feature_variance > 500:
+        base_score -= 10
+    trust_score = max(0, min(100, base_score))
+    return trust_score, trust_score < 60
+
+
+def generate_records(n_records: int, seed: int = 42):
+    """Telemetry records spread across every STRIDE rule and variance band"""
+    rng = np.random.default_rng(seed)
+    # Value bands: quiet, noisy, high but bounded (information disclosure), flooding
+    bands = np.array([[0.0, 10.0], [0.0, 150.0], [62.0, 90.0], [85.0, 200.0]])
+    low, high = bands[rng.integers(0, len(bands), size=n_records)].T
+    values = low[:, None] + rng.random((n_records, len(FEATURE_NAMES))) * (high - low)[:, None]
+    # Some agents omit features (read as 0)
+    present = rng.random((n_records, len(FEATURE_NAMES))) < np.where(rng.random(n_records) < 0.5, 1.0, 0.8)[:, None]
+    event_types = rng.choice(['login', 'login_failed', 'file_access'], size=n_records)
+    records = []
+    for row, mask, event_type in zip(values.tolist(), present, event_types.tolist()):
+        record = {name: value for name, value, keep in zip(FEATURE_NAMES, row, mask) if keep}
+        record['event_type'] = event_type
+        records.append(record)
+    return records
+
+
+def score_legacy(records):
+    results = []
+    for record in records:
+        stride = legacy_map_to_stride(record)
+        results.append((stride['stride_category'], stride['risk_level'],
+                        *legacy_calculate_trust_score(stride['risk_level'], stride['stride_category'], record)))
+    return results
+
+
+def score_single(records):
+    results = []
+    for record in records:
+        stride = map_to_stride(record)
+        results.append((stride['stride_category'], stride['risk_level'],
+                        *calculate_trust_score(stride['risk_level'], stride['stride_category'], record)))
+    return results
+
+
+def score_matrix(records):
+    features, _ = feature_matrix(records)
+    categories, risk_levels = stride_from_features(features, [record.get('event_type') for record in records])
+    trust_scores, mfa_required = trust_scores_from_features(risk_levels, features)
+    return list(zip(categories.tolist(), risk_levels.tolist(), trust_scores.tolist(), mfa_required.tolist()))
+
+
+def time_best(fn, records, repeats: int):
+    """Best-of-N wall time in seconds and the last result"""
+    best, result = float('inf'), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(records)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized STRIDE mapping and trust scoring")
+    parser.add_argument('--records', type=int, default=10000, help='Telemetry records to score')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per implementation (best is kept)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    print("🏁 Heuristic scoring benchmark")
+    print("=" * 60)
+    records = generate_records(args.records, args.seed)
+
+    legacy_s, expected = time_best(score_legacy, records, args.repeats)
+    results = {}
+    for name, fn in (('single_record', score_single), ('matrix', score_matrix)):
+        seconds, scored = time_best(fn, records, args.repeats)
+        results[name] = {
+            'seconds': seconds,
+            'us_per_record': seconds * 1e6 / args.records,
+            'speedup': legacy_s / seconds,
+            'identical': scored == expected
+        }
+    results['legacy'] = {'seconds': legacy_s, 'us_per_record': legacy_s * 1e6 / args.records}
+    categories = {}
+    for category, *_ in expected:
+        categories[category] = categories.get(category, 0) + 1
+
+    print(f"legacy        {results['legacy']['us_per_record']:9.2f} us/record")
+    for name in ('single_record', 'matrix'):
+        result = results[name]
+        print(f"{name:<13} {result['us_per_record']:9.2f} us/record | speed-up {result['speedup']:7.1f}x "
+              f"| identical {'✓' if result['identical'] else '✗'}")
+    print(f"STRIDE categories: {categories}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'config': vars(args), 'results': results, 'categories': categories}, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
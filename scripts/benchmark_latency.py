@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Prediction Latency Benchmark
+Times the single-row and batched serving paths of every trained model with
+warmup plus N iterations and writes percentiles, throughput and allocations as JSON
+"""
+
+import sys
+import os
+import json
+import argparse
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.ml_engine import TrustScoreMLEngine
+from app.latency_benchmark import BENCHMARK_PATHS, write_results, compare_results
+from app.utils import load_sample_cicids2017_data
+
+
+def build_engine(args) -> TrustScoreMLEngine:
+    """Load saved models, or train the requested classifiers on synthetic data"""
+    engine = TrustScoreMLEngine()
+    if args.model_dir:
+        engine.load_models(args.model_dir)
+        return engine
+
+    if args.train_models:
+        wanted = args.train_models.split(',')
+        engine.classifiers = {name: clf for name, clf in engine.classifiers.items() if name in wanted}
+    data = load_sample_cicids2017_data(n_samples=args.training_rows, seed=args.seed)
+    feature_names = engine.feature_columns(data)
+    X, y = engine.prepare_features(data, feature_names)
+    engine.train_on_arrays(X, y, feature_names=feature_names, cross_validate=False, profile_memory=False)
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prediction latency of the trust score models")
+    parser.add_argument('--model-dir', help='Saved models to benchmark (default: train on synthetic data)')
+    parser.add_argument('--train-models', default='RandomForest,NaiveBayes,MLP',
+                        help='Comma-separated classifiers to train when no --model-dir is given')
+    parser.add_argument('--training-rows', type=int, default=5000)
+    parser.add_argument('--samples', type=int, default=1000, help='Distinct rows cycled through by the timed calls')
+    parser.add_argument('--iterations', type=int, default=200, help='Timed calls per path')
+    parser.add_argument('--warmup', type=int, default=20, help='Untimed calls per path before timing')
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--no-allocations', action='store_true', help='Skip tracemalloc allocation tracing')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='latency_benchmark.json', help='JSON file for the results')
+    parser.add_argument('--baseline', help='Earlier results file to compare p50/p99 against')
+    args = parser.parse_args()
+
+    print("🏁 Prediction latency benchmark")
+    print("=" * 60)
+
+    engine = build_engine(args)
+    results = engine.benchmark_performance(
+        num_samples=args.samples,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        batch_size=args.batch_size,
+        trace_allocations=not args.no_allocations
+    )
+
+    for name, paths in results.items():
+        for path in BENCHMARK_PATHS:
+            if path not in paths:
+                continue
+            summary = paths[path]
+            print(f"{name:>20} {path:>17} | p50 {summary['p50_ms']:8.3f} ms | p95 {summary['p95_ms']:8.3f} ms "
+                  f"| p99 {summary['p99_ms']:8.3f} ms | max {summary['max_ms']:8.3f} ms "
+                  f"| {summary['throughput_rows_per_second']:10.0f} rows/s")
+
+    document = write_results(args.output, results, vars(args))
+    print(f"💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\n📊 Ratio to {args.baseline} (< 1.0 is faster)")
+        for name, paths in compare_results(baseline, document).items():
+            for path, ratios in paths.items():
+                print(f"{name:>20} {path:>17} | " + " | ".join(
+                    f"{metric} {ratio:.2f}x" if ratio is not None else f"{metric} n/a"
+                    for metric, ratio in ratios.items()
+                ))
+
+
+if __name__ == "__main__":
+    main()
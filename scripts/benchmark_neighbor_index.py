@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Approximate Nearest-Neighbour Index Benchmark
+Compares KNN scoring latency of the random-projection forest index against
+sklearn's KNeighborsClassifier at growing training-set sizes
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.neighbor_index import ApproximateKNNClassifier
+
+
+def generate_telemetry_matrix(n_rows: int, n_features: int, latent_dims: int, seed: int = 42):
+    """
+    Clustered, standardized feature matrix with trust-score labels
+    Flow features are strongly correlated, so rows are drawn from a low-dimensional
+    latent space and projected onto the full feature count
+    """
+    rng = np.random.default_rng(seed)
+    trust_scores = np.array([1, 2, 3, 5, 10])
+    centers = rng.normal(0, 3, size=(len(trust_scores), latent_dims))
+    labels = rng.integers(0, len(trust_scores), size=n_rows)
+    latent = centers[labels] + rng.normal(0, 1, size=(n_rows, latent_dims))
+    projection = rng.normal(0, 1 / np.sqrt(latent_dims), size=(latent_dims, n_features))
+    X = latent @ projection + rng.normal(0, 0.05, size=(n_rows, n_features))
+    return X, trust_scores[labels]
+
+
+def time_per_query(predict, X_queries, single_row_queries: int) -> dict:
+    """Batched and single-row latency of a predict function in milliseconds"""
+    start = time.perf_counter()
+    predict(X_queries)
+    batched_ms = (time.perf_counter() - start) * 1000 / len(X_queries)
+
+    start = time.perf_counter()
+    for row in X_queries[:single_row_queries]:
+        predict(row.reshape(1, -1))
+    single_ms = (time.perf_counter() - start) * 1000 / single_row_queries
+
+    return {'batched_latency_ms': batched_ms, 'single_row_latency_ms': single_ms}
+
+
+def benchmark_size(n_rows: int, args) -> dict:
+    X, y = generate_telemetry_matrix(n_rows + args.queries, args.features, args.latent_dims, args.seed)
+    X_train, y_train = X[:n_rows], y[:n_rows]
+    X_queries = X[n_rows:]
+
+    knn = KNeighborsClassifier(n_neighbors=args.neighbors, weights='distance')
+    start = time.perf_counter()
+    knn.fit(X_train, y_train)
+    sklearn_fit_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ann = ApproximateKNNClassifier(knn, n_trees=args.trees, leaf_size=args.leaf_size, random_state=args.seed)
+    ann_build_s = time.perf_counter() - start
+
+    sklearn_timing = time_per_query(knn.predict_proba, X_queries, args.single_row_queries)
+    ann_timing = time_per_query(ann.predict_proba, X_queries, args.single_row_queries)
+
+    # Recall@k against exact neighbours, and agreement of predicted trust scores
+    _, exact_indices = knn.kneighbors(X_queries)
+    _, approx_indices = ann.index.kneighbors(X_queries, args.neighbors)
+    recall = np.mean([
+        len(set(exact_row) & set(approx_row)) / args.neighbors
+        for exact_row, approx_row in zip(exact_indices, approx_indices)
+    ])
+    agreement = float(np.mean(knn.predict(X_queries) == ann.predict(X_queries)))
+
+    return {
+        'training_rows': n_rows,
+        'sklearn': {'fit_seconds': sklearn_fit_s, **sklearn_timing},
+        'ann': {'build_seconds': ann_build_s, **ann_timing},
+        'recall_at_k': float(recall),
+        'prediction_agreement': agreement,
+        'single_row_speedup': sklearn_timing['single_row_latency_ms'] / ann_timing['single_row_latency_ms'],
+        'batched_speedup': sklearn_timing['batched_latency_ms'] / ann_timing['batched_latency_ms']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the approximate KNN index against sklearn")
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                        help='Comma-separated training-set sizes')
+    parser.add_argument('--features', type=int, default=69, help='Feature count (CICIDS2017 default: 69)')
+    parser.add_argument('--latent-dims', type=int, default=8, help='Intrinsic dimensionality of the data')
+    parser.add_argument('--queries', type=int, default=1000, help='Query rows per size')
+    parser.add_argument('--single-row-queries', type=int, default=200, help='Queries timed one row at a time')
+    parser.add_argument('--neighbors', type=int, default=5)
+    parser.add_argument('--trees', type=int, default=8)
+    parser.add_argument('--leaf-size', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    print("🏁 Approximate KNN index benchmark")
+    print("=" * 60)
+
+    results = []
+    for n_rows in [int(size) for size in args.sizes.split(',')]:
+        result = benchmark_size(n_rows, args)
+        results.append(result)
+        print(f"{n_rows:>9} rows | sklearn {result['sklearn']['single_row_latency_ms']:8.3f} ms/row "
+              f"| ann {result['ann']['single_row_latency_ms']:8.3f} ms/row "
+              f"| batched speed-up {result['batched_speedup']:6.1f}x "
+              f"| recall@{args.neighbors} {result['recall_at_k']:.3f} "
+              f"| agreement {result['prediction_agreement']:.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'config': vars(args), 'results': results}, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Comprehensive ML Pipeline Testing and Demo Script
 Tests all 6 classifiers, generates evaluation reports, and validates API endpoints
 """
 
+import argparse
 import sys
 import os
 import json
@@ -38,8 +39,9 @@ logger = logging.getLogger(__name__)
 class MLPipelineTester:
     """Comprehensive ML Pipeline Testing Suite"""
 
-    def __init__(self, base_url: str = "http://localhost:5001"):
+    def __init__(self, base_url: str = "http://localhost:5001", profile_memory: bool = False):
         self.base_url = base_url
+        self.profile_memory = profile_memory
         self.ml_engine = TrustScoreMLEngine()
         self.evaluator = TrustEngineEvaluator()
         self.visualizer = TrustEngineVisualizer()
@@ -119,7 +121,8 @@ class MLPipelineTester:
                 df,
                 test_size=0.2,
                 cross_validate=True,
-                cv_folds=5
+                cv_folds=5,
+                profile_memory=self.profile_memory
             )
 
             training_time = time.time() - start_time
@@ -609,6 +612,12 @@ class MLPipelineTester:
 
 def main():
     """Main function to run ML pipeline tests"""
+    parser = argparse.ArgumentParser(description="Test all ML components, classifiers, and APIs")
+    parser.add_argument('--base-url', default="http://localhost:5001", help='Flask app to run the API tests against')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='Trace peak training memory per stage with tracemalloc')
+    args = parser.parse_args()
+
     print("🔬 Trust Engine ML Pipeline Comprehensive Testing")
     print("=" * 60)
     print("This script will test all ML components, classifiers, and APIs")
@@ -616,7 +625,7 @@ def main():
     print("=" * 60)
 
     # Initialize tester
-    tester = MLPipelineTester()
+    tester = MLPipelineTester(args.base_url, profile_memory=args.profile_memory)
 
     # Run full test suite
     report = tester.run_full_test_suite()
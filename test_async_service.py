@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test the asyncio ingestion service (same contracts as the Flask endpoints)
+"""
+
+import asyncio
+import httpx
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+pytest.importorskip('aiohttp')
+from aiohttp.test_utils import TestClient, TestServer
+from supabase import AsyncClientOptions, acreate_client
+
+from app.async_service import AsyncIngestionService
+from app.config import Config
+from app.ml_engine import TrustScoreMLEngine
+from app.telemetry_ingest import build_telemetry_rows
+
+SUPABASE_URL = 'https://project-id.supabase.co'
+SUPABASE_KEY = 'a' * 40 + '.b.c'
+USERS = {
+    'agent-token': {'sub': '1', 'email': 'vm-agent-7@example.com', 'groups': []},
+    'user-token': {'sub': '2', 'email': 'analyst@example.com', 'groups': []}
+}
+
+
+class RecordingElasticsearch:
+    def __init__(self):
+        self.documents = []
+
+    async def index(self, index, document):
+        self.documents.append((index.rsplit('-', 3)[0], document))
+
+
+def _http(requests):
+    """Async client answering Okta userinfo and Supabase REST calls"""
+    def handler(request):
+        requests.append(request)
+        if request.url.path.endswith('/v1/userinfo'):
+            user = USERS.get(request.headers['Authorization'].split(' ', 1)[1])
+            return httpx.Response(200, json=user) if user else httpx.Response(401)
+        if request.method == 'GET':
+            return httpx.Response(200, json=[{'trust_score': 42.0, 'mfa_required': True, 'vm_id': 'vm-3'}])
+        return httpx.Response(201, json=[])
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def _client(service):
+    client = TestClient(TestServer(service.build_app()))
+    await client.start_server()
+    return client
+
+
+def test_telemetry_and_trust_score_contracts():
+    """Agents are authenticated once per token, scored like Flask and written to both stores"""
+    async def run():
+        requests, es = [], RecordingElasticsearch()
+        http = _http(requests)
+        supabase = await acreate_client(SUPABASE_URL, SUPABASE_KEY, options=AsyncClientOptions(httpx_client=http))
+        service = AsyncIngestionService(engine=TrustScoreMLEngine(), http_client=http,
+                                        supabase_client=supabase, es_client=es)
+        client = await _client(service)
+        try:
+            record = {'vm_id': 'vm-3', 'session_id': 's-3', 'Flow Duration': 120, 'Total Fwd Packets': 9}
+            agent = {'Authorization': 'Bearer agent-token'}
+            responses = await asyncio.gather(*[client.post('/telemetry', json=dict(record), headers=agent)
+                                               for _ in range(5)])
+            bodies = [await response.json() for response in responses]
+
+            denied = await client.post('/telemetry', json=record)
+            forbidden = await client.post('/telemetry', json=record, headers={'Authorization': 'Bearer user-token'})
+            latest = await client.get('/trust_score', params={'session_id': 's-3'},
+                                      headers={'Authorization': 'Bearer user-token'})
+            latest_body = await latest.json()
+        finally:
+            await client.close()
+            await http.aclose()
+
+        expected = build_telemetry_rows({**record, 'vm_agent_id': 'vm-agent-7@example.com'})
+        assert all(response.status == 200 for response in responses)
+        for body in bodies:
+            assert body['trust_score'] == expected['trust']['trust_score']
+            assert body['stride_category'] == expected['stride']['stride_category']
+            assert body['session_id'] == 's-3'
+        assert denied.status == 401 and forbidden.status == 403
+        assert latest_body == {'trust_score': 42.0, 'mfa_required': True, 'vm_id': 'vm-3', 'session_id': 's-3'}
+
+        inserts = [r.url.path for r in requests if r.method == 'POST']
+        assert sorted(inserts) == ['/rest/v1/TelemetryData'] * 5 + ['/rest/v1/TrustScore'] * 5
+        assert sorted(kind for kind, _ in es.documents) == ['telemetrydata'] * 5 + ['trustscore'] * 5
+        assert all('@timestamp' in document for _, document in es.documents)
+        assert service.stats['auth_cache_hits'] >= 5
+
+    if Config.PERSISTENCE_WRITE_BEHIND:
+        pytest.skip("write-behind persistence replaces the direct writes checked here")
+    asyncio.run(run())
+
+
+def test_predict_matches_engine():
+    """/api/ml/predict returns the engine's prediction and rejects untrained classifiers"""
+    X, y = make_classification(n_samples=200, n_features=4, n_informative=3, n_redundant=0, random_state=4)
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'f{i}' for i in range(4)]
+    engine._publish_models({'RandomForest': RandomForestClassifier(n_estimators=10, random_state=0)
+                            .fit(X, np.array([1, 10])[y])}, {}, model_version='v1')
+    features = dict(zip(engine.feature_names, X[0].tolist()))
+
+    async def run():
+        service = AsyncIngestionService(engine=engine, http_client=_http([]),
+                                        supabase_client=object(), es_client=RecordingElasticsearch())
+        client = await _client(service)
+        try:
+            ok = await client.post('/api/ml/predict', json={'features': features, 'request_id': 'r-1'})
+            unknown = await client.post('/api/ml/predict', json={'features': features, 'classifier': 'SVM'})
+            missing = await client.post('/api/ml/predict', json={})
+            return ok.status, await ok.json(), unknown.status, missing.status
+        finally:
+            await client.close()
+            await service.http.aclose()
+
+    status, body, unknown_status, missing_status = asyncio.run(run())
+    assert status == 200 and body['status'] == 'success'
+    assert body['prediction']['trust_score'] == engine.predict_trust_score(features, 'RandomForest')['trust_score']
+    assert body['prediction']['request_id'] == 'r-1'
+    assert body['prediction']['classifier_used'] == 'RandomForest'
+    assert unknown_status == 400 and missing_status == 400
+
+
+if __name__ == "__main__":
+    test_telemetry_and_trust_score_contracts()
+    test_predict_matches_engine()
+    print("✅ Async ingestion service serves the Flask telemetry, trust score and prediction contracts")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test per-row error isolation in vectorized batch prediction
+"""
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+from app.ml_engine import TrustScoreMLEngine
+
+
+def _engine():
+    X, y = make_classification(n_samples=300, n_features=5, n_informative=4, n_redundant=0, random_state=6)
+    y = np.array([1, 10])[y]
+    scaler = StandardScaler().fit(X)
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'f{i}' for i in range(5)]
+    engine._publish_models({
+        'KNN': KNeighborsClassifier(n_neighbors=5).fit(scaler.transform(X), y),
+        'MLP': MLPClassifier(hidden_layer_sizes=(16,), max_iter=300, random_state=0).fit(scaler.transform(X), y)
+    }, {'KNN': scaler, 'MLP': scaler}, model_version='v1')
+    return engine, X
+
+
+def _mixed_batch(engine, X):
+    good = [dict(zip(engine.feature_names, row.tolist())) for row in X[:6]]
+    bad = {1: {'f0': None, 'f1': 0.5}, 3: {'f2': float('nan')}, 4: 'not a sample', 6: {'f3': float('inf')}}
+    batch = list(good)
+    for i in sorted(bad):
+        batch.insert(i, bad[i])
+    return good, bad, batch
+
+
+def test_bad_rows_fail_alone_for_nan_sensitive_models():
+    """None/NaN/inf rows get 'error' entries; the other rows score as they would on their own"""
+    engine, X = _engine()
+    good, bad, batch = _mixed_batch(engine, X)
+
+    for model_name in ('KNN', 'MLP'):
+        results = engine.predict_trust_scores_batch(batch, model_name)
+        assert len(results) == len(batch)
+        assert sorted(i for i, r in enumerate(results) if 'error' in r) == sorted(bad)
+        assert all(results[i]['trust_score'] is None for i in bad)
+        scored = [r['trust_score'] for i, r in enumerate(results) if i not in bad]
+        assert scored == [r['trust_score'] for r in engine.predict_trust_scores_batch(good, model_name)]
+
+
+def test_batch_endpoint_reports_row_errors(monkeypatch):
+    """/api/ml/predict/batch answers 200 with per-row errors instead of failing the request"""
+    import app.ml_engine
+    from app import app as flask_app
+
+    engine, X = _engine()
+    _, bad, batch = _mixed_batch(engine, X)
+    monkeypatch.setattr(app.ml_engine, 'ml_engine', engine)
+
+    response = flask_app.test_client().post('/api/ml/predict/batch',
+                                            json={'batch_features': batch, 'classifier': 'KNN'})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['total_samples'] == len(batch)
+    assert body['successful_predictions'] == len(batch) - len(bad)
+    assert [p['sample_id'] for p in body['predictions']] == list(range(len(batch)))
+    assert 'f0' in body['predictions'][1]['error']
+
+
+if __name__ == "__main__":
+    import pytest
+    test_bad_rows_fail_alone_for_nan_sensitive_models()
+    with pytest.MonkeyPatch.context() as mp:
+        test_batch_endpoint_reports_row_errors(mp)
+    print("✅ Batch prediction isolates rows with missing or non-finite features")
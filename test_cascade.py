@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test the NaiveBayes-first model cascade
+"""
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.naive_bayes import GaussianNB
+
+from app.ml_engine import TrustScoreMLEngine
+
+
+def _engine():
+    X, y = make_classification(n_samples=600, n_features=6, n_informative=4, n_redundant=0,
+                               n_classes=3, n_clusters_per_class=1, class_sep=1.5, random_state=4)
+    y = np.array([1, 4, 10])[y]
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'f{i}' for i in range(6)]
+    engine._publish_models({
+        'NaiveBayes': GaussianNB().fit(X, y),
+        'RandomForest': RandomForestClassifier(n_estimators=30, random_state=0).fit(X, y)
+    }, {}, model_version='v1')
+    return engine, X, y
+
+
+def test_escalation_follows_confidence_and_boundaries():
+    """Confident rows away from the cutoffs stay on NaiveBayes; the rest go to RandomForest"""
+    engine, X, _ = _engine()
+    samples = [dict(zip(engine.feature_names, row)) for row in X[:200]]
+
+    engine.configure_cascade(confidence_threshold=0.0, boundary_margin=0.0)
+    first_only = engine.predict_trust_scores_batch(samples, 'Cascade')
+    assert {r['cascade_stage'] for r in first_only} == {1}
+    assert [r['trust_score'] for r in first_only] == \
+        [r['trust_score'] for r in engine.predict_trust_scores_batch(samples, 'NaiveBayes')]
+
+    engine.configure_cascade(confidence_threshold=0.0, boundary_margin=100.0)
+    second_only = engine.predict_trust_scores_batch(samples, 'Cascade')
+    assert {r['model_used'] for r in second_only} == {'RandomForest'}
+    assert [r['trust_score'] for r in second_only] == \
+        [r['trust_score'] for r in engine.predict_trust_scores_batch(samples, 'RandomForest')]
+
+    engine.configure_cascade(confidence_threshold=0.9, boundary_margin=0.5)
+    single = engine.predict_trust_score(samples[0], 'Cascade')
+    assert single['cascade_stage'] in (1, 2)
+    stats = engine.get_cascade_stats()
+    assert stats['rows'] == 1
+    assert stats['first_stage_rows'] + stats['escalated_rows'] == 1
+
+    with pytest.raises(ValueError):
+        engine.configure_cascade(second_stage='KNN')
+
+
+def test_evaluation_reports_each_path():
+    """The evaluation compares the cascade with both stages served alone"""
+    engine, X, y = _engine()
+    report = engine.evaluate_cascade(X, y)
+
+    assert set(report['paths']) == {'NaiveBayes', 'RandomForest', 'Cascade'}
+    cascade = report['paths']['Cascade']
+    assert 0.0 < cascade['first_stage_hit_rate'] < 1.0
+    assert cascade['first_stage_hit_rate'] + cascade['escalation_rate'] == pytest.approx(1.0)
+    assert cascade['accuracy'] >= report['paths']['NaiveBayes']['accuracy']
+
+
+if __name__ == "__main__":
+    test_escalation_follows_confidence_and_boundaries()
+    test_evaluation_reports_each_path()
+    print("✅ Model cascade escalates uncertain rows to the ensemble")
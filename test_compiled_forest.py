@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test compiled RandomForest inference against sklearn output
+"""
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GridSearchCV
+
+from app.ml_engine import TrustScoreMLEngine
+from app.tree_inference import CompiledForest
+
+
+def _trust_score_dataset(n_samples=600, n_features=20):
+    """Multi-class dataset labelled with trust scores like the STRIDE mapping"""
+    X, y = make_classification(
+        n_samples=n_samples, n_features=n_features, n_informative=4, n_redundant=1,
+        n_classes=4, random_state=7
+    )
+    trust_scores = np.array([1, 3, 5, 10])
+    return X, trust_scores[y]
+
+
+def test_compiled_forest_matches_sklearn():
+    """Compiled RandomForest gives identical probabilities and classes"""
+    X, y = _trust_score_dataset()
+    forest = RandomForestClassifier(
+        n_estimators=100, max_depth=10, min_samples_split=5,
+        min_samples_leaf=2, random_state=42, n_jobs=1
+    ).fit(X, y)
+
+    compiled = CompiledForest(forest)
+
+    assert np.array_equal(compiled.predict_proba(X), forest.predict_proba(X))
+    assert np.array_equal(compiled.predict(X), forest.predict(X))
+    assert np.array_equal(compiled.predict(X[:1]), forest.predict(X[:1]))
+
+
+def test_compiled_forest_matches_adaptive_best_estimator():
+    """AdaptiveRandomForest is compiled from its best estimator, including unbounded depth"""
+    X, y = _trust_score_dataset(n_samples=300)
+    search = GridSearchCV(
+        RandomForestClassifier(random_state=42, n_jobs=1),
+        param_grid={'n_estimators': [10, 20], 'max_depth': [5, None]},
+        cv=3
+    ).fit(X, y)
+
+    compiled = CompiledForest(search)
+
+    assert np.array_equal(compiled.predict_proba(X), search.predict_proba(X))
+    assert np.array_equal(compiled.predict(X), search.predict(X))
+
+
+def test_engine_compiled_backend_predictions():
+    """Engine predictions are unchanged when RandomForest is served by the compiled backend"""
+    X, y = _trust_score_dataset(n_samples=300, n_features=6)
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'feature_{i}' for i in range(X.shape[1])]
+    engine.trained_models['RandomForest'] = RandomForestClassifier(
+        n_estimators=50, max_depth=10, random_state=42, n_jobs=1
+    ).fit(X, y)
+
+    samples = [dict(zip(engine.feature_names, row)) for row in X[:25]]
+    expected = engine.predict_trust_scores_batch(samples, 'RandomForest')
+
+    engine.set_inference_backend('RandomForest', 'compiled')
+    compiled = engine.predict_trust_scores_batch(samples, 'RandomForest')
+
+    assert [p['trust_score'] for p in compiled] == [p['trust_score'] for p in expected]
+    assert [p['confidence'] for p in compiled] == [p['confidence'] for p in expected]
+    assert engine.predict_trust_score(samples[0], 'RandomForest')['trust_score'] == expected[0]['trust_score']
+
+
+def test_backend_switch_follows_a_concurrent_retrain(monkeypatch):
+    """A model set published while a backend is being built is switched, not overwritten"""
+    X, y = _trust_score_dataset(n_samples=300, n_features=6)
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'feature_{i}' for i in range(X.shape[1])]
+    old = RandomForestClassifier(n_estimators=10, random_state=1, n_jobs=1).fit(X, y)
+    new = RandomForestClassifier(n_estimators=20, random_state=2, n_jobs=1).fit(X, y)
+    engine._publish_models({'RandomForest': old}, {}, model_version='v1')
+
+    build = engine._build_inference_model
+    built_for = []
+
+    def retrain_during_build(model, backend, options):
+        built_for.append(model)
+        if len(built_for) == 1:
+            engine._publish_models({'RandomForest': new}, {}, model_version='v2')
+        return build(model, backend, options)
+
+    monkeypatch.setattr(engine, '_build_inference_model', retrain_during_build)
+    engine.set_inference_backend('RandomForest', 'compiled', chunk_size=64)
+
+    assert built_for == [old, new]
+    assert engine.model_version == 'v2' and engine.trained_models['RandomForest'] is new
+    assert engine.compiled_models['RandomForest'].n_estimators == 20
+    assert engine.inference_backend_options['RandomForest'] == {'chunk_size': 64}
+
+    with pytest.raises(ValueError):
+        engine.set_inference_backend('RandomForest', 'compiled', n_trees=4)
+    assert engine.inference_backends['RandomForest'] == 'compiled'
+
+
+def test_backend_request_rejects_unknown_options(monkeypatch):
+    """PUT /api/ml/models answers 400 for options the selected backend does not take"""
+    import routes.ml_endpoints
+    from app import app as flask_app
+
+    X, y = _trust_score_dataset(n_samples=300, n_features=6)
+    engine = TrustScoreMLEngine()
+    engine._publish_models({'RandomForest': RandomForestClassifier(n_estimators=10, n_jobs=1).fit(X, y)}, {})
+    monkeypatch.setattr(routes.ml_endpoints, 'get_ml_engine', lambda: engine)
+    client = flask_app.test_client()
+
+    for options in ({'leaf_size': 32}, {'chunk_size': 64, 'bogus': 1}, ['chunk_size']):
+        response = client.put('/api/ml/models', json={'model': 'RandomForest', 'inference_backend': 'compiled',
+                                                      'backend_options': options})
+        assert response.status_code == 400
+    assert engine.inference_backends == {}
+
+    response = client.put('/api/ml/models', json={'model': 'RandomForest', 'inference_backend': 'compiled',
+                                                  'backend_options': {'chunk_size': 64}})
+    assert response.status_code == 200 and engine.inference_backends == {'RandomForest': 'compiled'}
+
+
+if __name__ == "__main__":
+    test_compiled_forest_matches_sklearn()
+    test_compiled_forest_matches_adaptive_best_estimator()
+    test_engine_compiled_backend_predictions()
+    with pytest.MonkeyPatch.context() as mp:
+        test_backend_switch_follows_a_concurrent_retrain(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_backend_request_rejects_unknown_options(mp)
+    print("✅ Compiled RandomForest inference matches sklearn")
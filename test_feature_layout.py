@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test feature-vector assembly with the precompiled FeatureLayout
+"""
+
+import numpy as np
+import pytest
+
+from app.feature_layout import FeatureLayout
+
+
+def test_assemble_orders_defaults_and_rejects_missing_values():
+    """Dicts and ordered lists map onto the stored order; None and non-finite values are rejected"""
+    layout = FeatureLayout(['a', 'b', 'c'])
+
+    row, unknown = layout.assemble({'c': 3, 'a': 1, 'extra': 9})
+    assert row.tolist() == [[1.0, 0.0, 3.0]] and unknown == ['extra']
+    row, unknown = layout.assemble([4, 5, 6])
+    assert row.tolist() == [[4.0, 5.0, 6.0]] and unknown == []
+
+    for bad in ({'a': None}, {'b': float('nan')}, {'c': float('inf')}, [1, None, 3]):
+        with pytest.raises(ValueError, match='finite'):
+            layout.assemble(bad)
+    with pytest.raises(ValueError):
+        layout.assemble({'a': 'high'})
+    with pytest.raises(ValueError):
+        layout.assemble([1, 2])
+
+
+def test_assemble_batch_isolates_bad_rows():
+    """Bad rows become per-row errors at default values; good rows are assembled as usual"""
+    layout = FeatureLayout(['a', 'b'])
+    samples = [{'a': 1, 'b': 2}, {'a': None}, 'not a sample', [3, 4], {'b': float('-inf'), 'x': 1}]
+    matrix, errors, unknown = layout.assemble_batch(samples)
+
+    assert matrix.tolist() == [[1, 2], [0, 0], [0, 0], [3, 4], [0, 0]]
+    assert sorted(errors) == [1, 2, 4]
+    assert errors[1].endswith(': a') and errors[4].endswith(': b')
+    assert unknown == {}
+
+    array = np.array([[1.0, 2.0], [np.nan, 1.0]])
+    matrix, errors, _ = layout.assemble_batch(array)
+    assert list(errors) == [1] and matrix[1].tolist() == [0.0, 0.0]
+    assert np.isnan(array[1, 0]), "the caller's array must not be modified"
+
+
+if __name__ == "__main__":
+    test_assemble_orders_defaults_and_rejects_missing_values()
+    test_assemble_batch_isolates_bad_rows()
+    print("✅ FeatureLayout assembles rows and rejects missing or non-finite values")
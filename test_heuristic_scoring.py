@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test that the shared-schema and vectorized heuristics score exactly like the originals
+"""
+
+import math
+import numpy as np
+import pytest
+
+from app.feature_schema import FEATURE_NAMES, feature_matrix, feature_vector
+from app.telemetry import map_to_stride, stride_from_features
+from app.turest_score import calculate_trust_score, trust_scores_from_features
+from app.telemetry_ingest import build_telemetry_rows, score_telemetry_records
+
+
+def original_scores(telemetry_data):
+    """STRIDE mapping and trust score exactly as first written (O(n^2) variance)"""
+    features = {name: telemetry_data.get(name, 0) for name in FEATURE_NAMES}
+    avg_feature_value = sum(features.values()) / len(features)
+    max_feature_value = max(features.values())
+    if avg_feature_value > 80:
+        category, risk_level = 'Denial of Service', 5
+    elif max_feature_value > 90:
+        category, risk_level = 'Elevation of Privilege', 4
+    elif telemetry_data.get('event_type') == 'login_failed':
+        category, risk_level = 'Spoofing', 3
+    elif avg_feature_value > 60:
+        category, risk_level = 'Information Disclosure', 3
+    else:
+        category, risk_level = 'Unknown', 1
+
+    base_score = 100 - (risk_level * 15)
+    feature_variance = sum((v - sum(features.values())/len(features))**2 for v in features.values()) / len(features)
+    if feature_variance > 1000:
+        base_score -= 20
+    elif feature_variance > 500:
+        base_score -= 10
+    trust_score = max(0, min(100, base_score))
+    return category, risk_level, trust_score, trust_score < 60
+
+
+def _records():
+    rng = np.random.default_rng(7)
+    records = []
+    for low, high in [(0, 10), (0, 150), (62, 90), (85, 200), (0, 45)] * 40:
+        values = rng.uniform(low, high, size=len(FEATURE_NAMES))
+        keep = rng.random(len(FEATURE_NAMES)) < rng.choice([0.6, 1.0])
+        record = {name: float(v) for name, v, k in zip(FEATURE_NAMES, values, keep) if k}
+        record['event_type'] = rng.choice(['login', 'login_failed'])
+        records.append(record)
+    # Integers, booleans, values on the thresholds and NaN
+    records.append({name: 80 for name in FEATURE_NAMES})
+    records.append({name: 60 for name in FEATURE_NAMES} | {FEATURE_NAMES[3]: 90, 'event_type': 'login_failed'})
+    records.append({name: i % 2 == 0 for i, name in enumerate(FEATURE_NAMES)})
+    records.append({FEATURE_NAMES[0]: float('nan'), FEATURE_NAMES[1]: 500.0})
+    records.append({FEATURE_NAMES[1]: float('nan'), FEATURE_NAMES[2]: 500.0})
+    records.append({'vm_id': 'vm-1'})
+    return records
+
+
+def _same(a, b):
+    return all(x == y or (isinstance(x, float) and math.isnan(x) and math.isnan(y)) for x, y in zip(a, b))
+
+
+def test_single_record_and_matrix_match_original():
+    """Per-record functions and the feature-matrix path reproduce the original results"""
+    records = _records()
+    expected = [original_scores(record) for record in records]
+
+    for record, want in zip(records, expected):
+        stride = map_to_stride(record)
+        trust_score, mfa_required = calculate_trust_score(stride['risk_level'], stride['stride_category'], record)
+        got = (stride['stride_category'], stride['risk_level'], trust_score, mfa_required)
+        assert got == want and type(trust_score) is type(want[2])
+
+        categories, risk_levels = stride_from_features(feature_vector(record), [record.get('event_type')])
+        assert (categories[0], risk_levels[0]) == want[:2]
+
+    features, errors = feature_matrix(records)
+    assert features.shape == (len(records), len(FEATURE_NAMES)) and not errors
+    categories, risk_levels = stride_from_features(features, [record.get('event_type') for record in records])
+    trust_scores, mfa_required = trust_scores_from_features(risk_levels, features)
+    got = list(zip(categories.tolist(), risk_levels.tolist(), trust_scores.tolist(), mfa_required.tolist()))
+    assert got == expected
+    assert {category for category, *_ in expected} == {
+        'Denial of Service', 'Elevation of Privilege', 'Spoofing', 'Information Disclosure', 'Unknown'}
+
+    # Without telemetry the STRIDE-weighted fallback is unchanged
+    assert calculate_trust_score(3, 'Spoofing') == (32.5, True)
+    assert calculate_trust_score(5, 'Elevation of Privilege', {}) == (0, True)
+
+
+def test_batch_rows_match_single_rows_and_isolate_bad_records():
+    """Batch scoring composes the same rows as build_telemetry_rows; non-numeric records fail alone"""
+    records = [dict(record, vm_agent_id='vm-agent-1', session_id=f's-{i}') for i, record in enumerate(_records())]
+    records.insert(3, {'vm_agent_id': 'vm-agent-1', FEATURE_NAMES[0]: None})
+
+    rows, errors = score_telemetry_records(records)
+    assert list(errors) == [3] and rows[3] is None
+    with pytest.raises(TypeError):
+        build_telemetry_rows(records[3])
+    for record, batch_rows in zip(records[:3] + records[4:], rows[:3] + rows[4:]):
+        single_rows = build_telemetry_rows(record)
+        assert batch_rows['stride'] == single_rows['stride']
+        assert batch_rows['trust']['trust_score'] == single_rows['trust']['trust_score']
+        assert batch_rows['trust']['mfa_required'] == single_rows['trust']['mfa_required']
+        assert _same(batch_rows['telemetry']['features'].values(), single_rows['telemetry']['features'].values())
+
+
+if __name__ == "__main__":
+    test_single_record_and_matrix_match_original()
+    test_batch_rows_match_single_rows_and_isolate_bad_records()
+    print("✅ Vectorized STRIDE mapping and trust scoring match the original heuristics")
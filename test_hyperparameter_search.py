@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the halving and randomized hyperparameter search of the adaptive classifiers
+"""
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import (GridSearchCV, HalvingGridSearchCV, HalvingRandomSearchCV,
+                                     RandomizedSearchCV)
+
+from app.ml_engine import TrustScoreMLEngine, ADAPTIVE_PARAM_GRIDS, DEFAULT_RANDOM_SEARCH_BUDGET
+
+GRID_SIZES = {'AdaptiveKNN': 30, 'AdaptiveRandomForest': 108}
+
+
+def _adaptive_engine():
+    engine = TrustScoreMLEngine()
+    engine.classifiers = {name: engine.classifiers[name] for name in GRID_SIZES}
+    return engine
+
+
+def _data():
+    X, y = make_classification(n_samples=300, n_features=6, n_informative=4, n_redundant=0, random_state=4)
+    return X, np.array([1, 10])[y]
+
+
+def test_strategy_and_budget_select_the_search():
+    """Each strategy builds its search class with the requested number of candidates"""
+    engine = TrustScoreMLEngine()
+    assert all(np.prod([len(v) for v in ADAPTIVE_PARAM_GRIDS[name].values()]) == size
+               for name, size in GRID_SIZES.items())
+    assert isinstance(engine.classifiers['AdaptiveRandomForest'], GridSearchCV)
+
+    engine.configure_search('random')
+    assert isinstance(engine.classifiers['AdaptiveKNN'], RandomizedSearchCV)
+    assert engine.classifiers['AdaptiveKNN'].n_iter == DEFAULT_RANDOM_SEARCH_BUDGET
+    engine.configure_search('random', 5)
+    assert engine.classifiers['AdaptiveRandomForest'].n_iter == 5
+
+    engine.configure_search('halving')
+    assert isinstance(engine.classifiers['AdaptiveKNN'], HalvingGridSearchCV)
+    engine.configure_search('halving', 6)
+    search = engine.classifiers['AdaptiveRandomForest']
+    assert isinstance(search, HalvingRandomSearchCV) and search.n_candidates == 6 and search.factor == 3
+
+    for strategy, budget in (('bayes', None), ('random', 0), ('halving', -2)):
+        with pytest.raises(ValueError):
+            engine.configure_search(strategy, budget)
+    assert engine.search_strategy == 'halving' and engine.search_budget == 6
+
+
+def test_training_reports_candidates_evaluated(monkeypatch):
+    """Search summaries count candidates per strategy and reuse the search's own CV score"""
+    X, y = _data()
+    # Same 108-point grid with smaller forests
+    monkeypatch.setitem(ADAPTIVE_PARAM_GRIDS['AdaptiveRandomForest'], 'n_estimators', [5, 10, 20])
+    expected = {'random': {'AdaptiveKNN': 5, 'AdaptiveRandomForest': 5}}
+
+    for strategy, budget in (('random', 5), ('halving', 6), ('halving', None)):
+        engine = _adaptive_engine()
+        results = engine.train_on_arrays(X, y, feature_names=[f'f{i}' for i in range(6)], cv_folds=3,
+                                         search_strategy=strategy, search_budget=budget, profile_memory=False)
+        history = engine.training_history[-1]
+        assert (history['search_strategy'], history['search_budget']) == (strategy, budget)
+
+        for name, size in GRID_SIZES.items():
+            search = results[name]['search']
+            if strategy == 'random':
+                assert search['candidates_evaluated'] == expected['random'][name]
+            else:
+                # Successive halving keeps a third of the candidates each round
+                per_round = search['candidates_per_iteration']
+                assert per_round[0] == (budget or size)
+                assert all(later == -(-earlier // 3) for earlier, later in zip(per_round, per_round[1:]))
+                assert search['candidates_evaluated'] == sum(per_round)
+                assert search['resources_per_iteration'] == sorted(search['resources_per_iteration'])
+            assert search['fits'] == search['candidates_evaluated'] * 3
+            classifier = engine.classifiers[name]
+            assert results[name]['cv_mean'] == classifier.cv_results_['mean_test_score'][classifier.best_index_]
+        assert history['candidates_evaluated'] == sum(results[name]['search']['candidates_evaluated']
+                                                      for name in GRID_SIZES)
+        if budget == 6:
+            assert history['candidates_evaluated'] == 16
+
+    # Every model shares one set of fold indices
+    assert engine._get_cv_splits(X, y, 3) is engine._get_cv_splits(X, y, 3)
+
+
+def test_train_request_validates_search_parameters(monkeypatch):
+    """/api/ml/train rejects unknown strategies and bad budgets and passes valid ones on"""
+    import routes.ml_endpoints
+    from app import app as flask_app
+
+    configs = []
+    monkeypatch.setattr(routes.ml_endpoints, 'run_training', lambda config, job=None: configs.append(config) or {})
+    client = flask_app.test_client()
+
+    for body in ({'search_strategy': 'bayes'}, {'search_budget': 0}, {'search_budget': '5'}):
+        response = client.post('/api/ml/train', json={'async': False, **body})
+        assert response.status_code == 400 and not configs
+
+    response = client.post('/api/ml/train', json={'async': False, 'search_strategy': 'halving', 'search_budget': 6})
+    assert response.status_code == 200
+    assert (configs[0]['search_strategy'], configs[0]['search_budget']) == ('halving', 6)
+    client.post('/api/ml/train', json={'async': False})
+    assert (configs[1]['search_strategy'], configs[1]['search_budget']) == ('grid', None)
+
+
+if __name__ == "__main__":
+    test_strategy_and_budget_select_the_search()
+    with pytest.MonkeyPatch.context() as mp:
+        test_training_reports_candidates_evaluated(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_train_request_validates_search_parameters(mp)
+    print("✅ Halving and randomized search honour their budgets and request parameters")
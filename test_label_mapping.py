@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test vectorized attack label to trust score mapping
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml_engine import TrustScoreMLEngine, DEFAULT_TRUST_SCORE
+
+
+def test_map_labels_matches_per_row_mapping():
+    """Factorized mapping equals the per-label lookup, including padding, unknown and missing labels"""
+    engine = TrustScoreMLEngine()
+    labels = pd.Series([' DDoS', 'BENIGN', None, 'Unseen', 'PortScan ', np.nan, 'BENIGN'] * 50)
+
+    expected = np.array([engine._map_to_stride_categories(label) for label in labels])
+    mapped = engine.map_labels(labels)
+
+    assert mapped.dtype == np.int64
+    np.testing.assert_array_equal(mapped, expected)
+    np.testing.assert_array_equal(engine.map_labels(labels.astype('category')), expected)
+    assert mapped[2] == DEFAULT_TRUST_SCORE
+
+
+def test_configured_mapping_is_saved_with_models(tmp_path):
+    """A custom mapping drives training labels and round-trips through the model metadata"""
+    engine = TrustScoreMLEngine()
+    engine.configure_label_mapping({' MALICIOUS ': 2})
+    with pytest.raises(ValueError):
+        engine.configure_label_mapping({'Bot': 11})
+
+    df = pd.DataFrame({'a': np.arange(40.0), 'b': np.arange(40.0) % 3, 'Label': ['BENIGN', 'MALICIOUS'] * 20})
+    X, y = engine.prepare_features(df)
+    assert set(y.tolist()) == {10, 2}
+    engine.feature_names = engine.feature_columns(df)
+
+    from sklearn.naive_bayes import GaussianNB
+    engine.trained_models['NaiveBayes'] = GaussianNB().fit(X, y)
+    engine.save_models(str(tmp_path))
+    loaded = TrustScoreMLEngine()
+    loaded.load_models(str(tmp_path))
+    assert loaded.stride_mapping['MALICIOUS'] == 2
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_map_labels_matches_per_row_mapping()
+    test_configured_mapping_is_saved_with_models(tempfile.mkdtemp())
+    print("✅ Label mapping is vectorized and persisted")
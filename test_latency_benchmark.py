@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test the multi-iteration latency benchmark harness
+"""
+
+import json
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.naive_bayes import GaussianNB
+
+from app.ml_engine import TrustScoreMLEngine
+from app.latency_benchmark import summarize_latencies, benchmark_engine, write_results, compare_results
+
+
+def test_summary_percentiles_and_throughput():
+    """Latencies are summarized from nanosecond samples"""
+    summary = summarize_latencies(np.arange(1, 101) * 1_000_000, rows_per_call=10)
+    assert summary['p50_ms'] == np.percentile(np.arange(1, 101), 50)
+    assert summary['max_ms'] == 100.0
+    assert summary['iterations'] == 100
+    assert summary['throughput_rows_per_second'] == 1000 / 5.05
+
+
+def test_engine_benchmark_runs_requested_iterations(tmp_path):
+    """Every model gets single-row and batched summaries with the requested iterations"""
+    X, y = make_classification(n_samples=200, n_features=4, random_state=0)
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'f{i}' for i in range(4)]
+    engine._publish_models({'NaiveBayes': GaussianNB().fit(X, np.array([1, 10])[y])}, {})
+    rows = [dict(zip(engine.feature_names, row)) for row in X[:50]]
+
+    results = benchmark_engine(engine, rows, iterations=7, warmup=2, batch_size=20)
+    for path, rows_per_call in (('single_row', 1), ('batch', 20)):
+        summary = results['NaiveBayes'][path]
+        assert summary['iterations'] == 7
+        assert summary['rows_per_call'] == rows_per_call
+        assert summary['p50_ms'] <= summary['p99_ms'] <= summary['max_ms']
+        assert 'peak_bytes' in summary['allocations']
+
+    path = tmp_path / 'latency.json'
+    document = write_results(str(path), results, {'iterations': 7})
+    assert json.loads(path.read_text())['results']['NaiveBayes']['batch']['iterations'] == 7
+    assert compare_results(document, document)['NaiveBayes']['single_row']['p50_ms'] == 1.0
+    assert 'single_row_cached' not in results['NaiveBayes']
+
+
+def test_cached_single_row_timings_are_reported_separately():
+    """With the prediction cache on, single_row times the models and single_row_cached the cache"""
+    X, y = make_classification(n_samples=200, n_features=4, random_state=0)
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'f{i}' for i in range(4)]
+    engine._publish_models({'NaiveBayes': GaussianNB().fit(X, np.array([1, 10])[y])}, {})
+    engine.enable_prediction_cache()
+    rows = [dict(zip(engine.feature_names, row)) for row in X[:5]]
+
+    results = benchmark_engine(engine, rows, iterations=7, warmup=2, batch_size=5, trace_allocations=False)
+    stats = engine.prediction_cache.stats()
+    # Only the cached path's warmup and timed calls looked up the cache
+    assert stats['hits'] + stats['misses'] == 9
+    cached = results['NaiveBayes']['single_row_cached']
+    assert cached['iterations'] == 7 and cached['cache_hit_rate'] == stats['hit_rate'] > 0
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_summary_percentiles_and_throughput()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_engine_benchmark_runs_requested_iterations(pathlib.Path(tmp))
+    test_cached_single_row_timings_are_reported_separately()
+    print("✅ Latency benchmark reports percentiles over real iterations")
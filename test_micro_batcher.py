@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test coalescing concurrent single-row predictions into batches
+"""
+
+import numpy as np
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from app.ml_engine import TrustScoreMLEngine
+from app.micro_batcher import MicroBatcher
+
+
+def _engine():
+    X, y = make_classification(n_samples=300, n_features=5, n_informative=4, n_redundant=0, random_state=2)
+    y = np.array([1, 10])[y]
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'f{i}' for i in range(5)]
+    engine._publish_models({'RandomForest': RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)},
+                           {}, model_version='v1')
+    return engine, X
+
+
+def test_concurrent_requests_share_batches():
+    """Each waiting request gets its own row's result from a shared batch"""
+    engine, X = _engine()
+    batcher = MicroBatcher(engine, max_wait_ms=50, max_batch_size=16)
+    samples = [dict(zip(engine.feature_names, row)) for row in X[:48]]
+
+    with ThreadPoolExecutor(max_workers=48) as pool:
+        results = list(pool.map(lambda sample: batcher.predict(sample, 'RandomForest'), samples))
+    batcher.close()
+
+    expected = engine.predict_trust_scores_batch(samples, 'RandomForest')
+    assert [r['trust_score'] for r in results] == [r['trust_score'] for r in expected]
+    stats = batcher.stats()
+    assert stats['requests'] == 48
+    assert stats['batches'] < 48
+    assert max(r['batch_size'] for r in results) <= 16
+    assert stats['batch_size_histogram']['count'] == stats['batches']
+
+
+def test_row_errors_fail_only_their_request():
+    """A row that cannot be converted raises for its caller alone"""
+    engine, X = _engine()
+    batcher = MicroBatcher(engine, max_wait_ms=20)
+    good = batcher.submit(dict(zip(engine.feature_names, X[0])), 'RandomForest')
+    bad = batcher.submit({'f0': 'not a number'}, 'RandomForest')
+
+    assert good.result(timeout=5)['trust_score'] in (1.0, 10.0)
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+    batcher.close()
+
+
+def test_failed_batch_is_rescored_per_request():
+    """If the vectorized call raises, co-batched requests are re-scored so only the bad one fails"""
+    engine, X = _engine()
+
+    class StrictEngine:
+        """Rejects the whole batch when any row carries a None value"""
+        def predict_trust_scores_batch(self, samples, model_name):
+            if any(None in sample.values() for sample in samples):
+                raise ValueError("Input X contains NaN")
+            return engine.predict_trust_scores_batch(samples, model_name)
+
+    for batch_engine in (engine, StrictEngine()):
+        batcher = MicroBatcher(batch_engine, max_wait_ms=50)
+        good = batcher.submit(dict(zip(engine.feature_names, X[0])), 'RandomForest')
+        bad = batcher.submit({'f0': None}, 'RandomForest')
+        other = batcher.submit(dict(zip(engine.feature_names, X[1])), 'RandomForest')
+
+        assert good.result(timeout=5)['trust_score'] in (1.0, 10.0)
+        assert other.result(timeout=5)['trust_score'] in (1.0, 10.0)
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+        batcher.close()
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_batches()
+    test_row_errors_fail_only_their_request()
+    test_failed_batch_is_rescored_per_request()
+    print("✅ Micro-batcher coalesces concurrent predictions")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test saving and loading model artifacts
+"""
+
+import os
+import json
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.naive_bayes import GaussianNB
+
+from app.ml_engine import TrustScoreMLEngine, MODEL_METADATA_FILENAME
+
+
+def _trained_engine():
+    """Engine with two small trained models and the compiled RandomForest backend"""
+    X, y = make_classification(
+        n_samples=300, n_features=6, n_informative=4, n_redundant=1, n_classes=3, random_state=7
+    )
+    y = np.array([1, 5, 10])[y]
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'feature_{i}' for i in range(X.shape[1])]
+    engine.trained_models['RandomForest'] = RandomForestClassifier(
+        n_estimators=20, max_depth=8, random_state=42, n_jobs=1
+    ).fit(X, y)
+    engine.trained_models['NaiveBayes'] = GaussianNB().fit(X, y)
+    engine.performance_metrics['NaiveBayes'] = {'accuracy': np.float64(0.9)}
+    engine.set_inference_backend('RandomForest', 'compiled')
+    return engine, X
+
+
+def test_bundle_round_trip_with_mmap(tmp_path):
+    """Models load memory-mapped from a bundle and predict identically"""
+    engine, X = _trained_engine()
+    manifest = engine.save_bundle(str(tmp_path), model_version='v1')
+
+    assert manifest['model_version'] == 'v1'
+    assert manifest['class_labels']['RandomForest'] == [1, 5, 10]
+    assert manifest['training_metrics']['NaiveBayes'] == {'accuracy': 0.9}
+
+    loaded = TrustScoreMLEngine()
+    assert sorted(loaded.load_models(str(tmp_path))) == ['NaiveBayes', 'RandomForest']
+    assert loaded.model_version == 'v1'
+    assert loaded.feature_names == engine.feature_names
+    assert isinstance(loaded.compiled_models['RandomForest'].value, np.memmap)
+
+    samples = [dict(zip(engine.feature_names, row)) for row in X[:25]]
+    for name in engine.trained_models:
+        expected = engine.predict_trust_scores_batch(samples, name)
+        actual = loaded.predict_trust_scores_batch(samples, name)
+        assert [p['trust_score'] for p in actual] == [p['trust_score'] for p in expected]
+
+
+def test_bundle_checksum_mismatch_is_rejected(tmp_path):
+    """A modified bundle file fails manifest verification"""
+    engine, _ = _trained_engine()
+    manifest = engine.save_bundle(str(tmp_path))
+
+    with open(os.path.join(tmp_path, manifest['bundle_file']), 'r+b') as f:
+        f.seek(64)
+        f.write(b'\x00')
+
+    with pytest.raises(ValueError):
+        TrustScoreMLEngine().load_models(str(tmp_path))
+
+
+def test_resave_leaves_mapped_bundle_intact(tmp_path):
+    """Saving over a served bundle writes a new file; memory-mapped models keep predicting"""
+    engine, X = _trained_engine()
+    samples = [dict(zip(engine.feature_names, row)) for row in X[:10]]
+    expected = [p['trust_score'] for p in engine.predict_trust_scores_batch(samples, 'RandomForest')]
+    first = engine.save_bundle(str(tmp_path), model_version='v1')
+
+    serving = TrustScoreMLEngine()
+    serving.load_models(str(tmp_path))
+    second = engine.save_bundle(str(tmp_path), model_version='v2')
+    assert second['bundle_file'] != first['bundle_file']
+    assert os.path.exists(os.path.join(tmp_path, first['bundle_file']))
+
+    # Only the current and the previous version's files are kept
+    engine.save_bundle(str(tmp_path), model_version='v3')
+    assert not os.path.exists(os.path.join(tmp_path, first['bundle_file']))
+    assert sorted(f for f in os.listdir(tmp_path) if f.endswith('.joblib')) == [
+        'trust_engine_bundle-v2.joblib', 'trust_engine_bundle-v3.joblib']
+    assert [p['trust_score'] for p in serving.predict_trust_scores_batch(samples, 'RandomForest')] == expected
+    reloaded = TrustScoreMLEngine()
+    reloaded.load_models(str(tmp_path))
+    assert reloaded.model_version == 'v3'
+
+
+def test_cold_start_restores_feature_metadata(tmp_path):
+    """Per-model files restore feature order and label mapping so predictions work without retraining"""
+    engine, X = _trained_engine()
+    engine.stride_mapping['Custom Attack'] = 1
+    engine.save_models(str(tmp_path))
+
+    loaded = TrustScoreMLEngine()
+    loaded.load_models(str(tmp_path))
+
+    assert loaded.feature_names == engine.feature_names
+    assert loaded.stride_mapping['Custom Attack'] == 1
+    sample = dict(zip(engine.feature_names, X[0]))
+    assert loaded.predict_trust_score(sample)['trust_score'] == engine.predict_trust_score(sample)['trust_score']
+
+
+def test_mismatched_metadata_is_rejected(tmp_path):
+    """Models whose feature count disagrees with the saved feature names are not loaded"""
+    engine, _ = _trained_engine()
+    engine.save_models(str(tmp_path))
+
+    metadata_path = os.path.join(tmp_path, MODEL_METADATA_FILENAME)
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+    metadata['feature_names'] = metadata['feature_names'][:-1]
+    with open(metadata_path, 'w') as f:
+        json.dump(metadata, f)
+
+    loaded = TrustScoreMLEngine()
+    with pytest.raises(ValueError):
+        loaded.load_models(str(tmp_path))
+    assert loaded.trained_models == {}
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_bundle_round_trip_with_mmap(tempfile.mkdtemp())
+    test_bundle_checksum_mismatch_is_rejected(tempfile.mkdtemp())
+    test_resave_leaves_mapped_bundle_intact(tempfile.mkdtemp())
+    test_cold_start_restores_feature_metadata(tempfile.mkdtemp())
+    test_mismatched_metadata_is_rejected(tempfile.mkdtemp())
+    print("✅ Model artifact bundles round-trip correctly")
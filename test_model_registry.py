@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test versioned hot-swap of the served model set
+"""
+
+import gc
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+
+from app.ml_engine import TrustScoreMLEngine
+from app.model_registry import ModelRegistry
+
+
+def _save_version(directory, seed):
+    """Train a small NaiveBayes model and save it as a bundle"""
+    X, y = make_classification(n_samples=200, n_features=5, n_informative=3, random_state=seed)
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'feature_{i}' for i in range(X.shape[1])]
+    engine.trained_models['NaiveBayes'] = GaussianNB().fit(X, np.array([5, 10])[y])
+    return engine.save_bundle(str(directory), model_version=f'v{seed}')
+
+
+def test_swap_keeps_in_flight_models_until_released(tmp_path):
+    """A swap serves the new version while requests holding the old one finish on it"""
+    _save_version(tmp_path / 'v1', 1)
+    _save_version(tmp_path / 'v2', 2)
+    registry = ModelRegistry(TrustScoreMLEngine())
+
+    assert registry.load_version(str(tmp_path / 'v1'))['version'] == 'v1'
+    in_flight_model, _, in_flight_layout = registry.engine._get_serving_models('NaiveBayes')
+
+    entry = registry.load_version(str(tmp_path / 'v2'))
+    assert entry['previous_version'] == 'v1'
+    assert registry.current_version == 'v2'
+    assert registry.engine.trained_models['NaiveBayes'] is not in_flight_model
+
+    # The in-flight request can still finish on v1
+    row, _ = in_flight_layout.assemble({'feature_0': 1.0})
+    assert in_flight_model.predict(row)[0] in (5, 10)
+    assert registry.retired_versions_in_memory() == ['v1']
+
+    del in_flight_model
+    gc.collect()
+    assert registry.retired_versions_in_memory() == []
+
+
+def test_rejected_version_leaves_current_models(tmp_path):
+    """An empty or invalid directory does not replace the serving version"""
+    _save_version(tmp_path / 'v1', 1)
+    (tmp_path / 'empty').mkdir()
+    registry = ModelRegistry(TrustScoreMLEngine())
+    registry.load_version(str(tmp_path / 'v1'))
+
+    with pytest.raises(ValueError):
+        registry.load_version(str(tmp_path / 'empty'))
+    assert registry.current_version == 'v1'
+
+
+def test_directory_watch_picks_up_new_bundle(tmp_path):
+    """A new bundle written to a watched directory is swapped in on the next check"""
+    registry = ModelRegistry(TrustScoreMLEngine())
+    directory = str(tmp_path / 'models')
+
+    _save_version(directory, 1)
+    assert registry.check_for_update(directory)['version'] == 'v1'
+    assert registry.check_for_update(directory) is None
+
+    _save_version(directory, 2)
+    assert registry.check_for_update(directory)['version'] == 'v2'
+
+
+def test_training_publishes_feature_order_with_models():
+    """A new feature order is served only together with the models trained on it"""
+    X, y = make_classification(n_samples=200, n_features=5, n_informative=3, random_state=1)
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'feature_{i}' for i in range(5)]
+    engine._publish_models({'NaiveBayes': GaussianNB().fit(X, np.array([5, 10])[y]),
+                            'KNN': KNeighborsClassifier().fit(X, np.array([5, 10])[y])}, {}, model_version='v1')
+    row = dict(zip(engine.feature_names, X[0]))
+
+    # Preparing data with a column dropped, or a failed run, leaves the serving layout alone
+    df = pd.DataFrame(X[:, :4], columns=[f'feature_{i}' for i in range(4)]).assign(Label='BENIGN')
+    engine.prepare_features(df)
+    assert engine.feature_names == [f'feature_{i}' for i in range(5)]
+    with pytest.raises(ValueError):
+        engine.train_all_classifiers(df.assign(Label=['DDoS'] + ['BENIGN'] * 199), cross_validate=False)
+    assert engine.predict_trust_score(row, 'NaiveBayes')['trust_score'] in (5.0, 10.0)
+
+    # A completed run swaps the layout and drops models fitted on the old one
+    engine.classifiers = {'NaiveBayes': GaussianNB()}
+    engine.train_all_classifiers(df.assign(Label=np.where(y == 1, 'DDoS', 'BENIGN')), cross_validate=False)
+    assert engine.feature_names == [f'feature_{i}' for i in range(4)]
+    assert set(engine.trained_models) == {'NaiveBayes'}
+    assert engine.predict_trust_score(row, 'NaiveBayes')['trust_score'] is not None
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+    test_swap_keeps_in_flight_models_until_released(pathlib.Path(tempfile.mkdtemp()))
+    test_rejected_version_leaves_current_models(pathlib.Path(tempfile.mkdtemp()))
+    test_directory_watch_picks_up_new_bundle(pathlib.Path(tempfile.mkdtemp()))
+    test_training_publishes_feature_order_with_models()
+    print("✅ Model registry hot-swaps versions correctly")
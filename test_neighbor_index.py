@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test the approximate nearest-neighbour index serving the KNN classifiers
+"""
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.neighbors import KNeighborsClassifier, NearestNeighbors
+
+from app.ml_engine import TrustScoreMLEngine
+from app.neighbor_index import ApproximateKNNClassifier, RandomProjectionForest
+
+
+def _data(n_samples=1200):
+    X, y = make_classification(n_samples=n_samples, n_features=8, n_informative=6, n_redundant=0,
+                               n_classes=3, n_clusters_per_class=1, random_state=3)
+    # Trust scores, so class indices and labels differ
+    return X, np.array([10, 1, 5])[y]
+
+
+def test_recall_against_exact_knn():
+    """The forest finds most exact neighbours, all of them once a leaf holds every row"""
+    X, _ = _data()
+    train, queries = X[:1000], X[1000:]
+    _, exact = NearestNeighbors(n_neighbors=5).fit(train).kneighbors(queries)
+
+    def recall(index):
+        distances, found = index.kneighbors(queries, n_neighbors=5)
+        assert found.shape == distances.shape == (len(queries), 5)
+        assert (np.diff(distances, axis=1) >= 0).all(), "neighbours come nearest first"
+        return np.mean([len(set(a) & set(b)) / 5 for a, b in zip(found, exact)])
+
+    few_trees = recall(RandomProjectionForest(n_trees=2, leaf_size=32).fit(train))
+    many_trees = recall(RandomProjectionForest(n_trees=16, leaf_size=64).fit(train))
+    assert 0.5 < few_trees <= many_trees and many_trees >= 0.9
+    assert recall(RandomProjectionForest(n_trees=1, leaf_size=len(train)).fit(train)) == 1.0
+
+
+def test_predict_proba_shape_and_class_order():
+    """Probabilities follow the source model's classes_ and match it when the search is exact"""
+    X, y = _data()
+    for weights in ('uniform', 'distance'):
+        knn = KNeighborsClassifier(n_neighbors=7, weights=weights).fit(X[:1000], y[:1000])
+        exact = ApproximateKNNClassifier(knn, n_trees=1, leaf_size=1000)
+        approximate = ApproximateKNNClassifier(knn, n_trees=8, leaf_size=64)
+
+        assert exact.classes_.tolist() == knn.classes_.tolist() == [1, 5, 10]
+        proba = approximate.predict_proba(X[1000:])
+        assert proba.shape == (200, 3)
+        np.testing.assert_allclose(proba.sum(axis=1), 1.0)
+        np.testing.assert_allclose(exact.predict_proba(X[1000:]), knn.predict_proba(X[1000:]))
+        assert set(approximate.predict(X[1000:]).tolist()) <= {1, 5, 10}
+        assert np.mean(approximate.predict(X[1000:]) == knn.predict(X[1000:])) >= 0.9
+
+
+def test_index_survives_save_and_load(tmp_path):
+    """Bundles and per-model files restore the ANN backend with the same answers"""
+    X, y = _data()
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'feature_{i}' for i in range(X.shape[1])]
+    engine._publish_models({'KNN': KNeighborsClassifier(n_neighbors=5).fit(X[:1000], y[:1000])}, {})
+    engine.set_inference_backend('KNN', 'ann', n_trees=4, leaf_size=32, random_state=7)
+    samples = [dict(zip(engine.feature_names, row)) for row in X[1000:1050]]
+    expected = engine.compiled_models['KNN'].predict_proba(X[1000:1050])
+    expected_scores = [p['trust_score'] for p in engine.predict_trust_scores_batch(samples, 'KNN')]
+
+    engine.save_bundle(str(tmp_path / 'bundle'), model_version='v1')
+    engine.save_models(str(tmp_path / 'files'))
+    for directory in ('bundle', 'files'):
+        loaded = TrustScoreMLEngine()
+        loaded.load_models(str(tmp_path / directory))
+        index = loaded.compiled_models['KNN']
+        assert isinstance(index, ApproximateKNNClassifier)
+        assert loaded.inference_backends['KNN'] == 'ann'
+        assert loaded.inference_backend_options['KNN'] == {'n_trees': 4, 'leaf_size': 32, 'random_state': 7}
+        np.testing.assert_allclose(index.predict_proba(X[1000:1050]), expected)
+        assert [p['trust_score'] for p in loaded.predict_trust_scores_batch(samples, 'KNN')] == expected_scores
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+    test_recall_against_exact_knn()
+    test_predict_proba_shape_and_class_order()
+    test_index_survives_save_and_load(pathlib.Path(tempfile.mkdtemp()))
+    print("✅ Approximate KNN index keeps recall, class order and survives save/load")
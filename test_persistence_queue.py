@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test the write-behind persistence queue (batching, retries, dead letters, backpressure)
+"""
+
+import json
+import pytest
+
+import app.persistence_queue
+from app.persistence_queue import PersistenceQueue, QueueFullError, WriterUnavailable
+
+
+def test_batches_and_retries_until_written(tmp_path):
+    """Documents are written in batches; transient failures are retried"""
+    written, calls = [], {'n': 0}
+
+    def flaky_writer(documents):
+        calls['n'] += 1
+        if calls['n'] <= 2:
+            raise ConnectionError("temporary outage")
+        written.extend(documents)
+
+    queue = PersistenceQueue({'TelemetryData': flaky_writer}, batch_size=50, workers=1,
+                             backoff_base=0.001, flush_interval=0.01,
+                             dead_letter_path=str(tmp_path / 'dead.jsonl'))
+    queue.submit_many(('TelemetryData', {'row': i}) for i in range(40))
+    queue.start()
+    assert queue.flush(timeout=10)
+    queue.stop()
+
+    metrics = queue.metrics()
+    assert [doc['row'] for doc in written] == list(range(40))
+    assert metrics['retries'] == 2 and metrics['batches'] == 1
+    assert metrics['written'] == 40 and metrics['dead_lettered'] == 0
+    assert not (tmp_path / 'dead.jsonl').exists()
+
+
+def test_dead_letters_and_backpressure(tmp_path):
+    """Rejected documents go to the dead-letter file; a full queue refuses new work"""
+    dead_letter = tmp_path / 'dead.jsonl'
+    queue = PersistenceQueue({'es:trustscore': lambda docs: [doc['ok'] for doc in docs]},
+                             max_size=4, workers=1, max_retries=2, backoff_base=0.001,
+                             flush_interval=0.0, dead_letter_path=str(dead_letter))
+    queue.submit_many([('es:trustscore', {'ok': True}), ('es:trustscore', {'ok': False})])
+    with pytest.raises(QueueFullError):
+        queue.submit_many([('es:trustscore', {'ok': True})] * 3)
+    assert queue.metrics()['rejected'] == 3
+
+    queue.start()
+    assert queue.flush(timeout=10)
+    queue.stop()
+
+    entries = [json.loads(line) for line in dead_letter.read_text().splitlines()]
+    assert len(entries) == 1
+    assert entries[0]['document'] == {'ok': False} and entries[0]['attempts'] == 3
+    metrics = queue.metrics()
+    assert metrics['written'] == 1 and metrics['dead_lettered'] == 1 and metrics['depth'] == 0
+
+
+def test_unavailable_elasticsearch_is_skipped(tmp_path, monkeypatch):
+    """Without a reachable Elasticsearch its documents are skipped while Supabase writes go on"""
+    from app.elasticsearch_integration import elasticsearch_integration
+
+    class DownClient:
+        def ping(self):
+            return False
+
+    bulk_calls = []
+    monkeypatch.setattr(elasticsearch_integration, 'bulk_index_documents',
+                        lambda docs, prefix: bulk_calls.append(prefix) or [False] * len(docs))
+    monkeypatch.setattr(app.persistence_queue, '_elasticsearch_down_until', 0.0)
+    es_writer = app.persistence_queue._elasticsearch_writer('trustscore')
+
+    monkeypatch.setattr(elasticsearch_integration, 'es_client', None)
+    with pytest.raises(WriterUnavailable):
+        es_writer([{'row': 0}])
+    monkeypatch.setattr(elasticsearch_integration, 'es_client', DownClient())
+    for _ in range(2):
+        with pytest.raises(WriterUnavailable):
+            es_writer([{'row': 0}])
+    assert bulk_calls == ['trustscore'], "ES is not called again until the retry interval passes"
+
+    written = []
+    queue = PersistenceQueue({'TelemetryData': written.extend, 'es:trustscore': es_writer},
+                             batch_size=10, workers=1, backoff_base=0.001, flush_interval=0.0,
+                             dead_letter_path=str(tmp_path / 'dead.jsonl'))
+    queue.submit_many([('TelemetryData', {'row': i}) for i in range(5)] +
+                      [('es:trustscore', {'row': i}) for i in range(5)])
+    queue.start()
+    assert queue.flush(timeout=10)
+    queue.stop()
+
+    metrics = queue.metrics()
+    assert len(written) == 5 and metrics['written'] == 5
+    assert metrics['skipped'] == 5 and metrics['retries'] == 0 and metrics['dead_lettered'] == 0
+    assert not (tmp_path / 'dead.jsonl').exists()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_batches_and_retries_until_written(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_dead_letters_and_backpressure(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp, pytest.MonkeyPatch.context() as mp:
+        test_unavailable_elasticsearch_is_skipped(pathlib.Path(tmp), mp)
+    print("✅ Write-behind queue batches, retries, dead-letters, skips unavailable writers and applies backpressure")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the prediction result cache
+"""
+
+import time
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.naive_bayes import GaussianNB
+
+from app.ml_engine import TrustScoreMLEngine
+from app.prediction_cache import PredictionCache, quantize_features
+
+
+def _cached_engine(**cache_options):
+    X, y = make_classification(n_samples=200, n_features=4, n_informative=3, n_redundant=0, random_state=1)
+    y = np.array([1, 10])[y]
+    engine = TrustScoreMLEngine()
+    engine.feature_names = ['a', 'b', 'c', 'd']
+    engine._publish_models({'NaiveBayes': GaussianNB().fit(X, y)}, {}, model_version='v1')
+    engine.enable_prediction_cache(**cache_options)
+    return engine, X
+
+
+def test_near_identical_features_hit_the_cache():
+    """Vectors equal to the configured significant digits share one entry"""
+    engine, X = _cached_engine(significant_digits=3)
+    sample = dict(zip(engine.feature_names, X[0]))
+    nudged = {k: v * 1.00001 for k, v in sample.items()}
+
+    first = engine.predict_trust_score(sample, 'NaiveBayes')
+    second = engine.predict_trust_score(nudged, 'NaiveBayes')
+
+    assert first['cache_hit'] is False and second['cache_hit'] is True
+    assert second['trust_score'] == first['trust_score']
+    assert quantize_features(np.array([1234.5, 0.0]), 3) != quantize_features(np.array([1244.5, 0.0]), 3)
+    assert engine.prediction_cache.stats()['hit_rate'] == 0.5
+
+
+def test_quantization_is_stable_across_decade_boundaries():
+    """Values that round up into the next decade hash like that decade's values"""
+    for below, boundary in ((9.996, 10.0), (-9.996, -10.0), (0.09996, 0.1), (999.7, 1000.0), (99999.9, 1e5)):
+        assert quantize_features(np.array([below]), 3) == quantize_features(np.array([boundary]), 3)
+    for power in range(-6, 10):
+        value = 10.0 ** power
+        assert quantize_features(np.array([value]), 3) == quantize_features(np.array([value * (1 - 1e-9)]), 3)
+    assert quantize_features(np.array([9.94]), 3) != quantize_features(np.array([10.0]), 3)
+
+
+def test_model_swap_invalidates_entries():
+    """Publishing a new model set clears the cache and keys on the new version"""
+    engine, X = _cached_engine()
+    sample = dict(zip(engine.feature_names, X[0]))
+    engine.predict_trust_score(sample, 'NaiveBayes')
+
+    engine._publish_models(dict(engine.trained_models), {}, model_version='v2')
+    assert engine.prediction_cache.stats()['entries'] == 0
+    assert engine.predict_trust_score(sample, 'NaiveBayes')['cache_hit'] is False
+
+
+def test_lru_eviction_and_ttl():
+    """Entries beyond max_entries are evicted oldest first and expire after the TTL"""
+    cache = PredictionCache(max_entries=2, ttl_seconds=0.05)
+    keys = [cache.make_key('NaiveBayes', 'v1', np.array([float(i)])) for i in range(3)]
+    for key in keys:
+        cache.put(key, {'trust_score': 10.0})
+
+    assert cache.get(keys[0]) is None and cache.get(keys[2]) == {'trust_score': 10.0}
+    time.sleep(0.06)
+    assert cache.get(keys[2]) is None
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['expirations'] == 1 and stats['hits'] == 1
+
+
+if __name__ == "__main__":
+    test_near_identical_features_hit_the_cache()
+    test_quantization_is_stable_across_decade_boundaries()
+    test_model_swap_invalidates_entries()
+    test_lru_eviction_and_ttl()
+    print("✅ Prediction cache hits, evicts and invalidates correctly")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test that predictions take their class from a single predict_proba pass
+"""
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.svm import LinearSVC
+
+from app.ml_engine import TrustScoreMLEngine, predict_with_probabilities
+
+
+class CountingForest(RandomForestClassifier):
+    """RandomForest that counts its forward passes"""
+
+    calls = {'predict': 0, 'predict_proba': 0}
+
+    def predict(self, X):
+        self.calls['predict'] += 1
+        return super().predict(X)
+
+    def predict_proba(self, X):
+        self.calls['predict_proba'] += 1
+        return super().predict_proba(X)
+
+
+def _data():
+    X, y = make_classification(n_samples=400, n_features=6, n_informative=4, n_redundant=0,
+                               n_classes=3, random_state=5)
+    # Unsorted trust scores, so class indices and labels differ
+    return X, np.array([10, 1, 5])[y]
+
+
+def test_labels_match_predict():
+    """argmax over classes_ gives predict()'s labels; models without predict_proba fall back"""
+    X, y = _data()
+    for model in (RandomForestClassifier(n_estimators=20, random_state=0), GaussianNB(),
+                  KNeighborsClassifier(), MLPClassifier(hidden_layer_sizes=(16,), max_iter=300, random_state=0)):
+        model.fit(X, y)
+        labels, proba = predict_with_probabilities(model, X)
+        np.testing.assert_array_equal(labels, model.predict(X))
+        np.testing.assert_allclose(proba, model.predict_proba(X))
+
+    svc = LinearSVC().fit(X, y)
+    labels, proba = predict_with_probabilities(svc, X)
+    assert proba is None
+    np.testing.assert_array_equal(labels, svc.predict(X))
+
+
+def test_engine_runs_one_forward_pass():
+    """Single and batch predictions call predict_proba once and never predict"""
+    X, y = _data()
+    engine = TrustScoreMLEngine()
+    engine.feature_names = [f'f{i}' for i in range(X.shape[1])]
+    engine._publish_models({'RandomForest': CountingForest(n_estimators=20, random_state=0).fit(X, y)}, {})
+    CountingForest.calls.update(predict=0, predict_proba=0)
+
+    single = engine.predict_trust_score(dict(zip(engine.feature_names, X[0])), 'RandomForest')
+    batch = engine.predict_trust_scores_batch([dict(zip(engine.feature_names, row)) for row in X[:20]],
+                                              'RandomForest')
+
+    assert CountingForest.calls == {'predict': 0, 'predict_proba': 2}
+    assert single['trust_score'] == batch[0]['trust_score']
+    reference = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y).predict(X[:20])
+    assert [r['trust_score'] for r in batch] == reference.astype(float).tolist()
+
+
+if __name__ == "__main__":
+    test_labels_match_predict()
+    test_engine_runs_one_forward_pass()
+    print("✅ Class labels come from a single predict_proba pass")
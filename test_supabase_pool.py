@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test the pooled, fork-safe Supabase client
+"""
+
+import os
+import httpx
+
+from app.supabase_pool import SupabaseClientPool
+
+SUPABASE_URL = 'https://project-id.supabase.co'
+SUPABASE_KEY = 'a' * 40 + '.b.c'
+
+
+def _pool(requests):
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(201, json=[{'id': len(requests)}])
+    return SupabaseClientPool(SUPABASE_URL, SUPABASE_KEY, max_connections=4,
+                              transport=httpx.MockTransport(handler))
+
+
+def test_client_is_reused_and_metered():
+    """Every checkout returns the same client; its requests are counted"""
+    requests = []
+    pool = _pool(requests)
+    client = pool.get_client()
+    for i in range(3):
+        assert pool.get_client() is client
+        pool.get_client().table('TrustScore').insert({'trust_score': i}).execute()
+
+    assert [str(r.url).split('?')[0] for r in requests] == [f'{SUPABASE_URL}/rest/v1/TrustScore'] * 3
+    assert requests[0].headers['apikey'] == SUPABASE_KEY
+    metrics = pool.metrics()
+    assert metrics['clients_created'] == 1
+    assert metrics['checkouts'] == 7
+    assert metrics['requests'] == 3 and metrics['in_flight'] == 0 and metrics['failed_requests'] == 0
+
+
+def test_new_client_after_fork():
+    """A forked child builds its own client instead of sharing the parent's connections"""
+    pool = _pool([])
+    parent_client = pool.get_client()
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        child_client = pool.get_client()
+        ok = child_client is not parent_client and pool.metrics()['forks_detected'] == 1
+        os.write(write_fd, b'1' if ok else b'0')
+        os._exit(0)
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    assert os.read(read_fd, 1) == b'1'
+    os.close(read_fd)
+    assert pool.get_client() is parent_client
+    assert pool.metrics()['forks_detected'] == 0
+
+
+if __name__ == "__main__":
+    test_client_is_reused_and_metered()
+    test_new_client_after_fork()
+    print("✅ Supabase client pool reuses one client per process and is fork-safe")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized synthetic CICIDS2017 data generator
+"""
+
+import numpy as np
+
+from app.data_loader import load_training_matrix
+from app.ml_engine import TrustScoreMLEngine
+from app.synthetic_data import SyntheticFlowGenerator, CICIDS2017_LABEL_MIX, load_feature_template
+from app.utils import load_sample_cicids2017_data
+
+
+def test_columns_follow_feature_distributions():
+    """Window sizes are categorical, counts integer and every feature non-negative"""
+    df = SyntheticFlowGenerator(seed=1).generate(5000)
+
+    assert set(df['Init_Win_bytes_forward'].unique()) <= {0, 65535, 32768, 8192}
+    assert df['SYN Flag Count'].dtype.kind == 'i'
+    assert (df.drop(columns=['Label']) >= 0).all().all()
+    assert abs((df['Label'] == 'BENIGN').mean() - 0.8) < 0.03
+
+
+def test_seed_and_label_mix():
+    """Same seed gives the same data; the CICIDS2017 mix produces real attack classes"""
+    first = SyntheticFlowGenerator(label_mix=CICIDS2017_LABEL_MIX, seed=3).generate(2000)
+    second = SyntheticFlowGenerator(label_mix=CICIDS2017_LABEL_MIX, seed=3).generate(2000)
+
+    assert first.equals(second)
+    assert {'BENIGN', 'DoS Hulk', 'PortScan', 'DDoS'} <= set(first['Label'])
+    assert load_sample_cicids2017_data(n_samples=300).shape == (300, len(load_feature_template()) + 1)
+
+
+def test_shards_stream_back_through_loader(tmp_path):
+    """Parquet shards are readable by the streaming loader; NPY shards hold float32 matrices"""
+    generator = SyntheticFlowGenerator(seed=5)
+    paths = generator.write_shards(str(tmp_path / 'parquet'), n_rows=2500, shard_rows=1000)
+    assert len(paths) == 3
+
+    X, y, stats = load_training_matrix(str(tmp_path / 'parquet'), TrustScoreMLEngine().prepare_features)
+    assert X.shape == (2500, len(generator.feature_names))
+    assert set(np.unique(y)) <= {5, 10}
+
+    npy_paths = generator.write_shards(str(tmp_path / 'npy'), n_rows=1500, shard_rows=1000, shard_format='npy')
+    X_shard = np.load(npy_paths[0])
+    assert X_shard.dtype == np.float32 and X_shard.shape == (1000, len(generator.feature_names))
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_columns_follow_feature_distributions()
+    test_seed_and_label_mix()
+    test_shards_stream_back_through_loader(Path(tempfile.mkdtemp()))
+    print("✅ Synthetic CICIDS2017 generator produces column-wise datasets and shards")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test batched telemetry ingestion (JSON arrays and NDJSON, bulk inserts)
+"""
+
+import json
+import pytest
+
+from app.telemetry_ingest import parse_telemetry_batch, ingest_telemetry_records, build_telemetry_rows
+
+
+class RecordingSupabase:
+    """Minimal Supabase stand-in that records bulk inserts and can fail one table (or one of its chunks)"""
+
+    def __init__(self, failing_table=None, failing_chunk=None):
+        self.inserts = []
+        self.rows = {}
+        self.failing_table = failing_table
+        self.failing_chunk = failing_chunk
+
+    def table(self, name):
+        client = self
+
+        class Query:
+            def insert(self, rows):
+                self.rows = rows
+                return self
+
+            def execute(self):
+                chunk = sum(1 for table, _ in client.inserts if table == name)
+                if name == client.failing_table and client.failing_chunk in (None, chunk):
+                    client.inserts.append((name, 0))
+                    raise RuntimeError("insert rejected")
+                client.inserts.append((name, len(self.rows)))
+                client.rows.setdefault(name, []).extend(row['vm_id'] for row in self.rows)
+
+        return Query()
+
+
+def test_parse_array_records_object_and_ndjson():
+    """All three body formats yield the same records; bad NDJSON lines become per-record errors"""
+    records = [{'vm_id': 'vm-1', 'Flow Duration': 10}, {'vm_id': 'vm-2', 'Flow Duration': 95}]
+    assert parse_telemetry_batch(json.dumps(records).encode())[0] == records
+    assert parse_telemetry_batch(json.dumps({'records': records}).encode())[0] == records
+
+    ndjson = '\n'.join(json.dumps(r) for r in records) + '\n{not json\n'
+    parsed, errors = parse_telemetry_batch(ndjson.encode(), 'application/x-ndjson')
+    assert parsed[:2] == records and parsed[2] is None
+    assert list(errors) == [2]
+
+    with pytest.raises(ValueError):
+        parse_telemetry_batch(b'[]')
+
+
+def test_batch_uses_one_insert_per_table_and_matches_single_scoring():
+    """Records are bulk inserted and scored exactly like the single-record endpoint"""
+    records = [{'vm_id': f'vm-{i}', 'session_id': f's-{i}', 'Flow Duration': i * 10} for i in range(25)]
+    supabase = RecordingSupabase()
+    summary = ingest_telemetry_records(records + [None], 'vm-agent-1', supabase,
+                                       parse_errors={25: 'Invalid NDJSON line'})
+
+    assert supabase.inserts == [('TelemetryData', 25), ('TrustScore', 25)]
+    assert summary['successful_records'] == 25 and summary['failed_records'] == 1
+    assert summary['results'][25]['status'] == 'error'
+    for record, result in zip(records, summary['results']):
+        expected = build_telemetry_rows({**record, 'vm_agent_id': 'vm-agent-1'})['trust']
+        assert result['trust_score'] == expected['trust_score']
+        assert result['session_id'] == record['session_id']
+
+    failed = ingest_telemetry_records(records, 'vm-agent-1', RecordingSupabase(failing_table='TrustScore'))
+    assert failed['failed_records'] == 25
+    assert 'TrustScore insert failed' in failed['results'][0]['error']
+
+
+def test_failed_telemetry_chunk_stores_no_trust_scores():
+    """Trust scores are only inserted for stored telemetry; the chunk's records are reported failed"""
+    records = [{'vm_id': f'vm-{i}', 'session_id': f's-{i}', 'Flow Duration': i * 10} for i in range(25)]
+    supabase = RecordingSupabase(failing_table='TelemetryData', failing_chunk=1)
+    summary = ingest_telemetry_records(records, 'vm-agent-1', supabase, chunk_size=10)
+
+    assert supabase.rows['TrustScore'] == supabase.rows['TelemetryData']
+    assert supabase.rows['TelemetryData'] == [f'vm-{i}' for i in list(range(10)) + list(range(20, 25))]
+    assert summary['successful_records'] == 15 and summary['failed_records'] == 10
+    for result in summary['results'][10:20]:
+        assert result['status'] == 'error'
+        assert 'TelemetryData insert failed' in result['error'] and 'TrustScore not stored' in result['error']
+
+
+if __name__ == "__main__":
+    test_parse_array_records_object_and_ndjson()
+    test_batch_uses_one_insert_per_table_and_matches_single_scoring()
+    test_failed_telemetry_chunk_stores_no_trust_scores()
+    print("✅ Batched telemetry ingestion parses, scores and bulk inserts records")
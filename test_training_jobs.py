@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test background training jobs and progress reporting
+"""
+
+import time
+
+from app.training_jobs import TrainingJob, TrainingJobManager
+
+
+def _wait_for(job, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while job.status not in ('completed', 'failed') and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_job_reports_classifier_progress():
+    """A job moves through its stages and exposes per-classifier progress"""
+    manager = TrainingJobManager()
+
+    def train(job):
+        job.set_stage('training')
+        for name in ('RandomForest', 'NaiveBayes'):
+            job.update_classifier(name, 'training')
+            job.update_classifier(name, 'completed')
+        return {'RandomForest': {'accuracy': 0.9}}
+
+    job = manager.submit(train, config={}, classifier_names=['RandomForest', 'NaiveBayes'])
+    _wait_for(job)
+
+    status = manager.get(job.job_id).to_dict()
+    assert status['status'] == 'completed'
+    assert status['progress'] == 1.0
+    assert status['eta_seconds'] == 0.0
+    assert status['result'] == {'RandomForest': {'accuracy': 0.9}}
+    assert all(progress['stage'] == 'completed' for progress in status['classifiers'].values())
+
+
+def test_failed_job_keeps_error():
+    """Exceptions in the training function mark the job failed"""
+    manager = TrainingJobManager()
+
+    def train(job):
+        raise ValueError("No training data available")
+
+    job = manager.submit(train, config={}, classifier_names=['MLP'])
+    _wait_for(job)
+
+    assert job.status == 'failed'
+    assert job.to_dict()['error'] == "No training data available"
+
+
+def test_eta_uses_previous_durations():
+    """ETA sums expected durations of unfinished classifiers minus time already spent"""
+    job = TrainingJob({}, ['RandomForest', 'MLP', 'KNN'], expected_durations={'RandomForest': 4.0, 'MLP': 10.0})
+    assert job.eta_seconds() is None  # KNN has no previous duration and nothing has finished
+
+    job.update_classifier('KNN', 'training')
+    job.classifiers['KNN']['started'] -= 2.0
+    job.update_classifier('KNN', 'completed')
+    job.update_classifier('RandomForest', 'training')
+    job.classifiers['RandomForest']['started'] -= 1.0
+
+    assert abs(job.eta_seconds() - 13.0) < 0.1
+
+
+if __name__ == "__main__":
+    test_job_reports_classifier_progress()
+    test_failed_job_keeps_error()
+    test_eta_uses_previous_durations()
+    print("✅ Training jobs report progress correctly")
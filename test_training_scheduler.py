@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test concurrent classifier training with the process-pool scheduler
+"""
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GridSearchCV
+from sklearn.naive_bayes import GaussianNB
+
+from app.ml_engine import fit_classifier
+from app.training_scheduler import allocate_cores, limit_estimator_jobs, train_in_process_pool
+
+CLASSIFIER_NAMES = ['RandomForest', 'KNN', 'NaiveBayes', 'MLP', 'AdaptiveKNN', 'AdaptiveRandomForest']
+
+
+def test_core_allocation_stays_within_budget():
+    """Every classifier gets a core and the spare cores go to the parallel ones"""
+    allocation = allocate_cores(CLASSIFIER_NAMES, 32)
+    assert sum(allocation.values()) == 32
+    assert allocation['NaiveBayes'] == 1
+    assert allocation['AdaptiveRandomForest'] > allocation['RandomForest'] > allocation['KNN']
+
+    assert allocate_cores(CLASSIFIER_NAMES, 2) == {name: 1 for name in CLASSIFIER_NAMES}
+
+
+def test_nested_jobs_are_not_multiplied():
+    """A grid search keeps the outer n_jobs and its inner forest runs single-threaded"""
+    search = GridSearchCV(RandomForestClassifier(n_jobs=-1), param_grid={'max_depth': [2, 4]})
+    limit_estimator_jobs(search, 6)
+    assert search.n_jobs == 6
+    assert search.estimator.n_jobs == 1
+
+
+def test_pool_training_matches_sequential():
+    """Models fitted in worker processes from shared memory match in-process fits"""
+    X, y = make_classification(n_samples=300, n_features=8, n_informative=4, random_state=3)
+    arrays = {'X_train': X[:240], 'X_test': X[240:], 'X_train_scaled': X[:240],
+              'X_test_scaled': X[240:], 'y_train': y[:240]}
+    splits = [(np.arange(0, 120), np.arange(120, 240)), (np.arange(120, 240), np.arange(0, 120))]
+
+    def estimators():
+        return {'RandomForest': RandomForestClassifier(n_estimators=20, random_state=42),
+                'NaiveBayes': GaussianNB()}
+
+    outcomes, schedule = train_in_process_pool(
+        fit_classifier, estimators(), arrays, core_budget=2, cv_splits=splits, cross_validate=True
+    )
+    assert schedule['workers'] == 2
+
+    for name, estimator in estimators().items():
+        expected = fit_classifier(name, estimator, arrays, splits)
+        assert np.array_equal(outcomes[name]['y_pred'], expected['y_pred'])
+        assert np.array_equal(outcomes[name]['cv_scores'], expected['cv_scores'])
+        assert outcomes[name]['worker']['n_jobs'] == 1
+
+
+def test_classifiers_are_queued_until_a_worker_starts_them():
+    """With one worker the second classifier is reported queued, then training once it starts"""
+    X, y = make_classification(n_samples=200, n_features=6, n_informative=4, random_state=3)
+    arrays = {'X_train': X[:160], 'X_test': X[160:], 'X_train_scaled': X[:160],
+              'X_test_scaled': X[160:], 'y_train': y[:160]}
+    events = []
+
+    train_in_process_pool(
+        fit_classifier, {'RandomForest': RandomForestClassifier(n_estimators=10), 'NaiveBayes': GaussianNB()},
+        arrays, core_budget=1, progress_callback=lambda name, stage: events.append((name, stage)),
+        cv_splits=None, cross_validate=False
+    )
+
+    assert events[:2] == [('RandomForest', 'queued'), ('NaiveBayes', 'queued')]
+    for name in ('RandomForest', 'NaiveBayes'):
+        assert [stage for event, stage in events if event == name] == ['queued', 'training', 'completed']
+
+
+if __name__ == "__main__":
+    test_core_allocation_stays_within_budget()
+    test_nested_jobs_are_not_multiplied()
+    test_pool_training_matches_sequential()
+    test_classifiers_are_queued_until_a_worker_starts_them()
+    print("✅ Process-pool training matches sequential training")